@@ -0,0 +1,3 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
\ No newline at end of file
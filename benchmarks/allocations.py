@@ -0,0 +1,103 @@
+"""
+Counts how many Vec2D, Rect, blit and collision box objects are constructed
+while drawing a frame of moving Sprites inside of nested, scaled Views, with
+dynamic blits reused from the pool and, as a baseline, with the pool turned
+off. Other allocations (such as tuples and floats) aren't counted.
+
+Run from this directory: python allocations.py
+"""
+try:
+    import _path
+except NameError:
+    pass
+import time
+import spyral
+import spyral.util
+
+SIZE = (640, 480)
+FRAMES = 30
+COUNTS = (1000, 5000)
+DEPTH = 3
+POOL_SIZE = spyral.util.MAX_POOLED_BLITS
+
+COUNTED = [spyral.Vec2D, spyral.Rect, spyral.util._Blit]
+if hasattr(spyral.util, "_CollisionBox"):
+    COUNTED.append(spyral.util._CollisionBox)
+
+class Counter(object):
+    """
+    Counts calls to the __init__ of every counted class.
+    """
+    def __init__(self):
+        self.count = 0
+        self._originals = {}
+
+    def install(self):
+        for cls in COUNTED:
+            self._originals[cls] = cls.__dict__["__init__"]
+            cls.__init__ = self._counting(cls.__dict__["__init__"])
+
+    def _counting(self, original):
+        def counting(obj, *args, **kwargs):
+            self.count += 1
+            return original(obj, *args, **kwargs)
+        return counting
+
+    def uninstall(self):
+        for cls, original in self._originals.items():
+            cls.__init__ = original
+        self._originals.clear()
+
+def make_scene(count):
+    scene = spyral.Scene(SIZE)
+    scene.background = spyral.Image(size=SIZE).fill((0, 0, 0))
+    parent = scene
+    for depth in range(DEPTH):
+        view = spyral.View(parent)
+        view.size = SIZE
+        view.output_size = (SIZE[0] * 0.9, SIZE[1] * 0.9)
+        view.pos = (8, 8)
+        parent = view
+    image = spyral.Image(size=(8, 8)).fill((255, 255, 255))
+    sprites = []
+    for index in range(count):
+        sprite = spyral.Sprite(parent)
+        sprite.image = image
+        sprite.pos = ((index * 7) % SIZE[0], (index * 13) % SIZE[1])
+        sprites.append(sprite)
+    def move(delta):
+        for sprite in sprites:
+            sprite.x = (sprite.x + 30 * delta) % SIZE[0]
+    spyral.event.register("director.update", move, scene=scene)
+    return scene
+
+def frame(scene):
+    scene._handle_event("director.update", spyral.Event(delta=1.0 / 30))
+    scene._handle_event("director.render")
+    scene._draw()
+
+def run(count, pooled):
+    spyral.util.MAX_POOLED_BLITS = POOL_SIZE if pooled else 0
+    del spyral.util._blit_pool[:]
+    scene = make_scene(count)
+    # Fill any pools and caches before measuring
+    frame(scene)
+    counter = Counter()
+    counter.install()
+    start = time.time()
+    try:
+        for i in range(FRAMES):
+            frame(scene)
+    finally:
+        counter.uninstall()
+    elapsed = time.time() - start
+    return counter.count / float(FRAMES), elapsed / FRAMES * 1000
+
+if __name__ == "__main__":
+    spyral.director.init(SIZE, headless=True)
+    print "%8s %8s %16s %12s" % ("sprites", "pooled", "objects/frame",
+                                 "frame (ms)")
+    for count in COUNTS:
+        for pooled in (False, True):
+            print "%8d %8s %16.1f %12.2f" % ((count, pooled) +
+                                              run(count, pooled))
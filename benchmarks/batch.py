@@ -0,0 +1,65 @@
+"""
+Measures how long a frame (moving every sprite, then rendering and drawing)
+takes for many moving Sprites, and for the same number of sprites in one
+SpriteBatch.
+
+Run from this directory: python batch.py
+"""
+try:
+    import _path
+except NameError:
+    pass
+import time
+import numpy
+import spyral
+
+SIZE = (640, 480)
+FRAMES = 30
+COUNTS = (1000, 5000, 10000)
+
+def positions(count):
+    index = numpy.arange(count)
+    return numpy.column_stack(((index * 7) % SIZE[0], (index * 13) % SIZE[1]))
+
+def make_scene():
+    scene = spyral.Scene(SIZE)
+    scene.background = spyral.Image(size=SIZE).fill((0, 0, 0))
+    image = spyral.Image(size=(8, 8)).fill((255, 255, 255))
+    return scene, image
+
+def frame(scene):
+    start = time.time()
+    scene._handle_event("director.update", spyral.Event(delta=1.0 / 30))
+    scene._handle_event("director.render")
+    scene._draw()
+    return time.time() - start
+
+def run_sprites(count):
+    scene, image = make_scene()
+    sprites = []
+    for x, y in positions(count).tolist():
+        sprite = spyral.Sprite(scene)
+        sprite.image = image
+        sprite.pos = (x, y)
+        sprites.append(sprite)
+    def move(delta):
+        for sprite in sprites:
+            sprite.x = (sprite.x + 30 * delta) % SIZE[0]
+    spyral.event.register("director.update", move, scene=scene)
+    return sum(frame(scene) for i in range(FRAMES)) / FRAMES * 1000
+
+def run_batch(count):
+    scene, image = make_scene()
+    batch = spyral.SpriteBatch(scene, [image])
+    batch.add_many(positions(count), velocities=(30, 0))
+    def wrap():
+        batch.positions[:, 0] %= SIZE[0]
+    spyral.event.register("director.update", wrap, scene=scene)
+    return sum(frame(scene) for i in range(FRAMES)) / FRAMES * 1000
+
+if __name__ == "__main__":
+    spyral.director.init(SIZE, headless=True)
+    print "%8s %14s %14s" % ("sprites", "Sprite (ms)", "batch (ms)")
+    for count in COUNTS:
+        print "%8d %14.2f %14.2f" % (count, run_sprites(count),
+                                     run_batch(count))
@@ -0,0 +1,55 @@
+"""
+Measures how long Scene._draw takes for many moving sprites, submitting the
+frame's blits one at a time and in a single batched Surface.blits call.
+
+Run from this directory: python blits.py
+"""
+try:
+    import _path
+except NameError:
+    pass
+import time
+import spyral
+import spyral.scene
+
+SIZE = (640, 480)
+FRAMES = 30
+COUNTS = (1000, 5000, 10000)
+
+def make_scene(count):
+    scene = spyral.Scene(SIZE)
+    scene.background = spyral.Image(size=SIZE).fill((0, 0, 0))
+    image = spyral.Image(size=(8, 8)).fill((255, 255, 255))
+    sprites = []
+    for i in range(count):
+        sprite = spyral.Sprite(scene)
+        sprite.image = image
+        sprite.pos = ((i * 7) % SIZE[0], (i * 13) % SIZE[1])
+        sprites.append(sprite)
+    return scene, sprites
+
+def run(count, batched):
+    spyral.scene._BATCHED_BLITS = batched
+    scene, sprites = make_scene(count)
+    elapsed = 0
+    for frame in range(FRAMES):
+        # Keep every sprite moving, so none of them become static
+        for sprite in sprites:
+            sprite.x = (sprite.x + 1) % SIZE[0]
+        scene._handle_event("director.render")
+        start = time.time()
+        scene._draw()
+        elapsed += time.time() - start
+    return elapsed / FRAMES * 1000
+
+if __name__ == "__main__":
+    spyral.director.init(SIZE, headless=True)
+    available = spyral.scene._BATCHED_BLITS
+    print "%8s %14s %14s" % ("sprites", "blit (ms)", "blits (ms)")
+    for count in COUNTS:
+        single = run(count, False)
+        if available:
+            batched = "%14.2f" % run(count, True)
+        else:
+            batched = "%14s" % "unavailable"
+        print "%8d %14.2f %s" % (count, single, batched)
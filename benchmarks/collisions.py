@@ -0,0 +1,85 @@
+"""
+Measures how long it takes to find every collision between a group of bullets
+and a group of enemies in a scene with 5000 collision boxes, by testing each
+pair with collide_sprites and with collision_pairs, along with how long it
+takes to move every box and to cast rays across the scene. Finally, half of
+the boxes are made decorations without a collision category, which the
+queries skip entirely.
+
+Run from this directory: python collisions.py
+"""
+try:
+    import _path
+except NameError:
+    pass
+import gc
+import random
+import time
+import spyral
+
+SIZE = (640, 480)
+BOXES = 5000
+BULLETS = (10, 100, 500)
+# Testing every pair is slow, so it is only timed for the smaller groups
+PAIRWISE_LIMIT = 10
+RAYS = 100
+
+def run():
+    random.seed(0)
+    scene = spyral.Scene(SIZE)
+    image = spyral.Image(size=(8, 8)).fill((255, 255, 255))
+    boxes = []
+    for i in range(BOXES):
+        sprite = spyral.Sprite(scene)
+        sprite.image = image
+        sprite.pos = (random.uniform(0, SIZE[0]), random.uniform(0, SIZE[1]))
+        boxes.append(sprite)
+    results = []
+    for count in BULLETS:
+        bullets, enemies = boxes[:count], boxes[count:]
+        pairwise = None
+        if count <= PAIRWISE_LIMIT:
+            start = time.time()
+            found = [(bullet, enemy) for bullet in bullets for enemy in enemies
+                     if scene.collide_sprites(bullet, enemy)]
+            pairwise = (time.time() - start) * 1000
+        start = time.time()
+        pairs = scene.collision_pairs(bullets, enemies)
+        indexed = (time.time() - start) * 1000
+        if pairwise is not None:
+            assert set(pairs) == set(found)
+        results.append((count, len(enemies), pairwise, indexed))
+    start = time.time()
+    for sprite in boxes:
+        sprite.x += 1
+    moving = (time.time() - start) * 1000
+    start = time.time()
+    for i in range(RAYS):
+        scene.raycast((0, random.uniform(0, SIZE[1])), (1, 0))
+    rays = (time.time() - start) * 1000 / RAYS
+    for sprite in boxes[BOXES // 2:]:
+        sprite.category_bits = 0
+    bullets, enemies = boxes[:BULLETS[-1]], boxes[BULLETS[-1]:]
+    start = time.time()
+    scene.collision_pairs(bullets, enemies)
+    decorated = (time.time() - start) * 1000
+    return results, moving, rays, decorated
+
+if __name__ == "__main__":
+    spyral.director.init(SIZE, headless=True)
+    # Collecting the thousands of sprites would swamp the timings
+    gc.disable()
+    results, moving, rays, decorated = run()
+    gc.enable()
+    print "%8s %8s %16s %20s" % ("bullets", "enemies", "pairwise (ms)",
+                                 "collision_pairs (ms)")
+    for count, enemies, pairwise, indexed in results:
+        if pairwise is None:
+            pairwise = "-"
+        else:
+            pairwise = "%.1f" % pairwise
+        print "%8d %8d %16s %20.1f" % (count, enemies, pairwise, indexed)
+    print "moving %d boxes: %.1f ms" % (BOXES, moving)
+    print "raycast across the scene: %.2f ms" % rays
+    print "collision_pairs (%d bullets, half decorations): %.1f ms" % (
+        BULLETS[-1], decorated)
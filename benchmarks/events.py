@@ -0,0 +1,39 @@
+"""
+Measures how long it takes to dispatch one ``director.update`` event to many
+handlers, each of which takes the `delta` of the event as an argument.
+
+Run from this directory: python events.py
+"""
+try:
+    import _path
+except NameError:
+    pass
+import time
+import spyral
+
+SIZE = (640, 480)
+TICKS = 20
+COUNTS = (1000, 10000)
+
+class Handler(object):
+    def __init__(self, scene):
+        self.elapsed = 0
+        spyral.event.register("director.update", self.update, scene=scene)
+
+    def update(self, delta):
+        self.elapsed += delta
+
+def run(count):
+    scene = spyral.Scene(SIZE)
+    handlers = [Handler(scene) for i in range(count)]
+    event = spyral.Event(delta=1.0 / 30)
+    start = time.time()
+    for i in range(TICKS):
+        scene._handle_event("director.update", event)
+    return (time.time() - start) / TICKS * 1000
+
+if __name__ == "__main__":
+    spyral.director.init(SIZE, headless=True)
+    print "%8s %12s" % ("handlers", "tick (ms)")
+    for count in COUNTS:
+        print "%8d %12.2f" % (count, run(count))
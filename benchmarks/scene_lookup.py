@@ -0,0 +1,47 @@
+"""
+Measures how long it takes to find the executing scene, when events are
+queued and handlers are registered without passing a scene, from inside of a
+scene's event handlers.
+
+Run from this directory: python scene_lookup.py
+"""
+try:
+    import _path
+except NameError:
+    pass
+import time
+import spyral
+
+SIZE = (640, 480)
+CALLS = 1000
+
+class Game(spyral.Scene):
+    def __init__(self):
+        spyral.Scene.__init__(self, SIZE)
+        spyral.event.register("bench.queue", self.queue_events)
+        spyral.event.register("bench.register", self.register_handlers)
+        self.elapsed = {}
+
+    def queue_events(self):
+        start = time.time()
+        for i in range(CALLS):
+            spyral.event.queue("bench.nothing")
+        self.elapsed["queue"] = time.time() - start
+
+    def register_handlers(self):
+        start = time.time()
+        for i in range(CALLS):
+            spyral.event.register("bench.nothing", self.nothing)
+        self.elapsed["register"] = time.time() - start
+
+    def nothing(self):
+        pass
+
+if __name__ == "__main__":
+    spyral.director.init(SIZE, headless=True)
+    scene = Game()
+    scene._handle_event("bench.queue")
+    scene._handle_event("bench.register")
+    print "%10s %14s" % ("call", "per call (us)")
+    for name in ("queue", "register"):
+        print "%10s %14.2f" % (name, scene.elapsed[name] / CALLS * 1e6)
@@ -0,0 +1,47 @@
+"""
+Measures how long it takes to spawn and kill short-lived sprites (each with
+an update handler) in a scene that already has many long-lived ones, over
+several rounds, to show whether the cost grows during a session.
+
+Run from this directory: python spawning.py
+"""
+try:
+    import _path
+except NameError:
+    pass
+import time
+import spyral
+
+SIZE = (640, 480)
+LIVING = 5000
+BULLETS = 1000
+ROUNDS = 5
+
+class Bullet(spyral.Sprite):
+    def __init__(self, scene, image):
+        spyral.Sprite.__init__(self, scene)
+        self.image = image
+        spyral.event.register("director.update", self.update, scene=scene)
+
+    def update(self, delta):
+        self.x += delta
+
+def run():
+    scene = spyral.Scene(SIZE)
+    image = spyral.Image(size=(4, 4)).fill((255, 255, 255))
+    living = [Bullet(scene, image) for i in range(LIVING)]
+    times = []
+    for round in range(ROUNDS):
+        start = time.time()
+        bullets = [Bullet(scene, image) for i in range(BULLETS)]
+        scene._handle_event("director.update", spyral.Event(delta=0.1))
+        for bullet in bullets:
+            bullet.kill()
+        times.append((time.time() - start) / BULLETS * 1e6)
+    return times
+
+if __name__ == "__main__":
+    spyral.director.init(SIZE, headless=True)
+    print "%8s %22s" % ("round", "spawn + kill (us)")
+    for round, elapsed in enumerate(run()):
+        print "%8d %22.1f" % (round + 1, elapsed)
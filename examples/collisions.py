@@ -13,6 +13,7 @@ class Square(spyral.Sprite):
         self.image = spyral.Image(size=(16, 16)).fill(color)
         self.direction = direction
         self.anchor = 'center'
+        self.collision_group = 'squares'
         spyral.event.register("director.update", self.update)
 
     def update(self):
@@ -35,13 +36,13 @@ class Game(spyral.Scene):
         self.right_square.pos = self.rect.midright
 
         spyral.event.register("system.quit", spyral.director.quit)
-        spyral.event.register("director.update", self.update)
+        # The scene tests the squares against each other once per update
+        self.add_collision_group('squares')
+        spyral.event.register("collision.squares.squares.enter", self.bounce)
 
-    def update(self):
-        # Collision test
-        if self.left_square.collide_sprite(self.right_square):
-            self.right_square.flip()
-            self.left_square.flip()
+    def bounce(self, first, second):
+        first.flip()
+        second.flip()
 
 if __name__ == "__main__":
     spyral.director.init(SIZE) # the director is the manager for your scenes
@@ -25,6 +25,10 @@ ALL_BY_MODULE = {
     'spyral.core' : ['_init', '_quit', '_get_executing_scene'],
     'spyral.font' : ['Font'],
     'spyral.clock' : ['GameClock'],
+    'spyral.budget' : ['FrameBudget'],
+    'spyral.atlas' : ['Atlas'],
+    'spyral.batch' : ['SpriteBatch'],
+    'spyral.tilemap' : ['TileMap'],
     'spyral.event' : ['keys', 'mods', 'queue', 'Event',
                       'EventHandler', 'LiveEventHandler'],
     'spyral.form' : ['Form'],
@@ -38,6 +42,7 @@ ALL_BY_MODULE = {
 }
 
 ATTRIBUTE_MODULES = frozenset(['memoize', 'point', 'exceptions', 'easing',
+                               'atlas',
                                'mouse', 'event', '_lib', 'font', 'form',
                                'director', 'sprite', '_style', 'widgets',
                                'util', 'keyboard', 'image'])
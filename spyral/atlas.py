@@ -0,0 +1,354 @@
+"""
+An Atlas packs many small images onto a single large image (a "sheet"), which
+cuts down on the number of surfaces a game has to load and keep around. Each
+packed image can still be used on its own: looking it up returns an
+:class:`Image <spyral.Image>` that shares its pixels with the sheet, without
+copying them.
+
+Important concepts:
+    Packing
+        Images are placed with the MaxRects method: the packer keeps a list of
+        the largest free rectangles left on the sheet, and places each image
+        (tallest first) in the free rectangle closest to the top-left.
+    Padding
+        The number of transparent pixels left between neighbouring images.
+    Extrusion
+        The number of times the outermost pixels of each image are repeated
+        around it. When a packed image is scaled or rotated, the pixels just
+        outside of its region can bleed into its edges; extruding the edges
+        makes that bleed invisible.
+    Index
+        An atlas can be saved to disk as the sheet plus a small JSON index of
+        where each image is, and loaded back with :func:`load
+        <spyral.atlas.load>` without packing it again.
+"""
+
+import os
+import json
+import pygame
+import spyral
+from spyral.image import Image, from_conglomerate
+
+#: The file extensions that are packed when an Atlas is made from a directory.
+IMAGE_EXTENSIONS = ('.png', '.bmp', '.gif', '.jpg', '.jpeg', '.tga')
+
+class _AtlasImage(Image):
+    """
+    An Image whose surface is a subsurface of an atlas's sheet. Drawing on it
+    draws on the sheet.
+
+    Declaring it opaque doesn't drop its alpha channel, since that would copy
+    its pixels out of the sheet. The declaration is still used by the
+    renderer.
+
+    :param surf: The subsurface that will be stored in this _AtlasImage.
+    :type surf: :class:`pygame.Surface`
+    :param str name: The name of this image in its atlas.
+    """
+    def __init__(self, surf, name):
+        self._setup(surf, name)
+
+    def _set_opaque(self, opaque):
+        if opaque is not None:
+            opaque = bool(opaque)
+        if opaque is self._opaque:
+            return
+        self._opaque = opaque
+        self._version += 1
+
+    opaque = property(Image._get_opaque, _set_opaque,
+                      doc=Image.opaque.__doc__)
+
+class _MaxRectsPacker(object):
+    """
+    Places rectangles inside a bin of the given size using the MaxRects
+    method, preferring the free spot closest to the top (then the left).
+
+    :param int width: The width of the bin.
+    :param int height: The height of the bin.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._free = [pygame.Rect(0, 0, width, height)]
+
+    def insert(self, width, height):
+        """
+        Finds room for a new rectangle and reserves it.
+
+        :param int width: The width of the rectangle.
+        :param int height: The height of the rectangle.
+        :returns: The (x, y) position of the rectangle, or ``None`` if it does
+                  not fit.
+        """
+        best = None
+        for free in self._free:
+            if free.w >= width and free.h >= height:
+                score = (free.y + height, free.x)
+                if best is None or score < best[0]:
+                    best = (score, free.x, free.y)
+        if best is None:
+            return None
+        _, x, y = best
+        self._place(pygame.Rect(x, y, width, height))
+        return x, y
+
+    def _place(self, used):
+        """
+        Splits every free rectangle that overlaps `used` into the (up to four)
+        free rectangles around it, then drops the free rectangles that are
+        inside of another.
+        """
+        free_rects = []
+        for free in self._free:
+            if not free.colliderect(used):
+                free_rects.append(free)
+                continue
+            if used.x > free.x:
+                free_rects.append(pygame.Rect(free.x, free.y,
+                                              used.x - free.x, free.h))
+            if used.right < free.right:
+                free_rects.append(pygame.Rect(used.right, free.y,
+                                              free.right - used.right, free.h))
+            if used.y > free.y:
+                free_rects.append(pygame.Rect(free.x, free.y,
+                                              free.w, used.y - free.y))
+            if used.bottom < free.bottom:
+                free_rects.append(pygame.Rect(free.x, used.bottom, free.w,
+                                              free.bottom - used.bottom))
+        pruned = []
+        for index, free in enumerate(free_rects):
+            contained = False
+            for other_index, other in enumerate(free_rects):
+                if (index != other_index and other.contains(free) and
+                        (other != free or other_index < index)):
+                    contained = True
+                    break
+            if not contained:
+                pruned.append(free)
+        self._free = pruned
+
+def _find_images(source):
+    """
+    Returns a list of (name, filename) pairs for the images in `source`, which
+    is either a directory or a list of filenames. Images are named after their
+    filename, without the directory or extension.
+    """
+    if isinstance(source, basestring):
+        filenames = [os.path.join(source, filename)
+                     for filename in sorted(os.listdir(source))
+                     if os.path.splitext(filename)[1].lower()
+                        in IMAGE_EXTENSIONS]
+    else:
+        filenames = list(source)
+    images = []
+    names = set()
+    for filename in filenames:
+        name = os.path.splitext(os.path.basename(filename))[0]
+        if name in names:
+            raise ValueError("Two images in the atlas are named %s." % name)
+        names.add(name)
+        images.append((name, filename))
+    return images
+
+def _extrude(surface, rect, amount):
+    """
+    Repeats the outermost pixels of the `rect` region of `surface` `amount`
+    times outwards.
+    """
+    x, y, width, height = rect
+    for step in xrange(1, amount + 1):
+        top = surface.subsurface((x, y, width, 1)).copy()
+        bottom = surface.subsurface((x, y + height - 1, width, 1)).copy()
+        surface.blit(top, (x, y - step))
+        surface.blit(bottom, (x, y + height - 1 + step))
+    # The columns include the rows that were just extruded, which fills in
+    # the corners
+    for step in xrange(1, amount + 1):
+        left = surface.subsurface((x, y - amount, 1,
+                                   height + 2 * amount)).copy()
+        right = surface.subsurface((x + width - 1, y - amount, 1,
+                                    height + 2 * amount)).copy()
+        surface.blit(left, (x - step, y - amount))
+        surface.blit(right, (x + width - 1 + step, y - amount))
+
+class Atlas(object):
+    """
+    Packs a set of images onto a single sheet. Images in the atlas are looked
+    up by name, which is their filename without the directory or extension::
+
+        atlas = spyral.Atlas("images/enemies")
+        sprite.image = atlas["goblin"]
+
+    The returned images share their pixels with the sheet, so drawing on one of
+    them changes the sheet as well. Looking up the same name twice returns the
+    same Image.
+
+    :param source: The images to pack: either the path of a directory (whose
+                   image files are all packed) or a list of filenames.
+    :type source: str or a list of str
+    :param int padding: The number of transparent pixels between neighbouring
+                        images.
+    :param int extrude: The number of times to repeat the edge pixels of each
+                        image around it.
+    :param int max_size: The largest width and height the sheet is allowed to
+                         have.
+    """
+    def __init__(self, source, padding=1, extrude=0, max_size=2048):
+        self._padding = padding
+        self._extrude = extrude
+        self._images = {}
+        loaded = [(name, Image(filename))
+                  for name, filename in _find_images(source)]
+        self._sheet, self._regions = self._pack(loaded, max_size)
+
+    @classmethod
+    def _from_index(cls, sheet, regions, padding, extrude):
+        """
+        Makes an atlas from a sheet that is already packed, without calling
+        the constructor.
+
+        :param sheet: The packed sheet.
+        :type sheet: :class:`Image <spyral.Image>`
+        :param dict regions: The (x, y, width, height) of each image, by name.
+        :param int padding: The padding that the sheet was packed with.
+        :param int extrude: The extrusion that the sheet was packed with.
+        """
+        atlas = cls.__new__(cls)
+        atlas._padding = padding
+        atlas._extrude = extrude
+        atlas._images = {}
+        atlas._sheet = sheet
+        atlas._regions = regions
+        return atlas
+
+    def _pack(self, images, max_size):
+        """
+        Packs the (name, image) pairs onto a new sheet.
+
+        :returns: A (sheet, regions) pair, where `regions` maps names to
+                  (x, y, width, height) tuples.
+        """
+        if not images:
+            raise ValueError("An atlas needs at least one image.")
+        border = 2 * self._extrude + self._padding
+        images = sorted(images, key=lambda item: (-item[1].height,
+                                                  -item[1].width, item[0]))
+        area = sum((image.width + border) * (image.height + border)
+                   for _, image in images)
+        widest = max(image.width for _, image in images) + border
+        # Start from a roughly square, power-of-two width, and only grow the
+        # width if the images don't fit in the height that is allowed
+        width = 1
+        while width < widest or width * width < area:
+            width *= 2
+        width = min(width, max_size)
+        while True:
+            packer = _MaxRectsPacker(width, max_size + self._padding)
+            placed = []
+            for name, image in images:
+                position = packer.insert(image.width + border,
+                                         image.height + border)
+                if position is None:
+                    break
+                x, y = position
+                placed.append((name, image, (x + self._extrude,
+                                             y + self._extrude)))
+            if len(placed) == len(images):
+                break
+            if width >= max_size:
+                raise ValueError("The images do not fit in a %dx%d atlas." %
+                                 (max_size, max_size))
+            width = min(width * 2, max_size)
+        sheet = from_conglomerate([(image, position)
+                                   for _, image, position in placed])
+        # from_conglomerate only makes the sheet as large as the images, so
+        # there has to be room made for the extrusion on the far edges
+        size = (sheet.width + self._extrude, sheet.height + self._extrude)
+        if self._extrude and size != tuple(sheet.size):
+            grown = Image(size=size)
+            grown.draw_image(sheet)
+            sheet = grown
+        regions = {}
+        for name, image, (x, y) in placed:
+            regions[name] = (x, y, image.width, image.height)
+            if self._extrude:
+                _extrude(sheet._surf, regions[name], self._extrude)
+        return sheet, regions
+
+    def _get_sheet(self):
+        """
+        The :class:`Image <spyral.Image>` that all the images are packed onto.
+        Read-only.
+        """
+        return self._sheet
+
+    def _get_names(self):
+        """
+        A sorted list of the names of the images in this atlas. Read-only.
+        """
+        return sorted(self._regions)
+
+    sheet = property(_get_sheet)
+    names = property(_get_names)
+
+    def get_region(self, name):
+        """
+        Returns where an image is on the sheet.
+
+        :param str name: The name of the image.
+        :rtype: :class:`Rect <spyral.Rect>`
+        """
+        x, y, width, height = self._regions[name]
+        return spyral.Rect(x, y, width, height)
+
+    def __getitem__(self, name):
+        try:
+            return self._images[name]
+        except KeyError:
+            region = self._regions[name]
+            image = _AtlasImage(self._sheet._surf.subsurface(region), name)
+            self._images[name] = image
+            return image
+
+    def __contains__(self, name):
+        return name in self._regions
+
+    def __len__(self):
+        return len(self._regions)
+
+    def __iter__(self):
+        return iter(self._get_names())
+
+    def save(self, filename):
+        """
+        Saves the sheet as an image, and the position of each image on it as
+        a JSON index next to it (with the same name, ending in ``.json``). The
+        atlas can be loaded again with :func:`load <spyral.atlas.load>`.
+
+        :param str filename: Where to save the sheet, e.g. ``"sheet.png"``.
+        """
+        pygame.image.save(self._sheet._surf, filename)
+        index = {'sheet': os.path.basename(filename),
+                 'padding': self._padding,
+                 'extrude': self._extrude,
+                 'regions': self._regions}
+        with open(os.path.splitext(filename)[0] + '.json', 'w') as index_file:
+            json.dump(index, index_file, indent=1, sort_keys=True)
+
+def load(filename):
+    """
+    Loads an atlas that was saved with :func:`Atlas.save
+    <spyral.Atlas.save>`.
+
+    :param str filename: The filename of the JSON index.
+    :rtype: :class:`Atlas <spyral.Atlas>`
+    """
+    with open(filename) as index_file:
+        index = json.load(index_file)
+    directory = os.path.dirname(filename)
+    sheet = Image(os.path.join(directory, index['sheet']))
+    regions = dict((str(name), tuple(region))
+                   for name, region in index['regions'].iteritems())
+    return Atlas._from_index(sheet, regions, index['padding'],
+                             index['extrude'])
@@ -0,0 +1,488 @@
+"""
+A SpriteBatch draws and moves thousands of similar sprites (bullets, particles,
+tiles...) far faster than the same number of :class:`Sprites <spyral.Sprite>`.
+Instead of each sprite being an object with its own properties and event
+handlers, the whole batch keeps its sprites in `NumPy <http://www.numpy.org/>`_
+arrays, which are moved with vectorized operations and drawn in a single pass.
+
+Important concepts:
+    Arrays
+        The sprites in a batch are rows of the :attr:`positions`,
+        :attr:`velocities`, :attr:`layers`, :attr:`visible` and
+        :attr:`image_indices` arrays. These arrays can be changed in place with
+        NumPy operations (e.g. ``batch.positions[:, 1] += 10``), but their
+        length only changes with :func:`add <spyral.SpriteBatch.add>` and
+        :func:`remove <spyral.SpriteBatch.remove>`.
+    Images
+        A batch has a fixed list of images, and each sprite shows one of them,
+        chosen by its image index.
+    Indices
+        A sprite is identified by its row. Removing sprites moves the sprites
+        after them down, so indices are only valid until the next removal.
+
+Batches are never static, and are drawn straight onto the scene: the offset
+and scale of their parent Views are applied, but not their cropping or
+caching.
+"""
+
+import pygame
+import spyral
+from weakref import ref as _wref
+try:
+    import numpy
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    spyral.exceptions.numpy_not_available_warning()
+    _NUMPY_AVAILABLE = False
+
+class _BatchBlit(object):
+    """
+    The blits of a batch's sprites that are on one layer, ready to be drawn by
+    the scene. Scenes draw `draws` in one go, and clear `rects` on the next
+    frame.
+    """
+    static = False
+    opaque = False
+    flags = 0
+    def __init__(self, layer, draws, rects, rect):
+        self.layer = layer
+        self.draws = draws
+        self.rects = rects
+        self.rect = rect
+
+class SpriteBatch(object):
+    """
+    A batch of sprites that share a parent and a list of images, stored in
+    NumPy arrays::
+
+        bullets = spyral.SpriteBatch(self, [bullet_image])
+        bullets.add((10, 10), velocity=(0, -200))
+        ...
+        # Every frame, the batch moves its sprites by their velocities.
+        # Bullets that left the scene are removed all at once:
+        bullets.remove(~bullets.on_screen())
+
+    :param parent: The parent that this batch will belong to.
+    :type parent: :class:`View <spyral.View>` or :class:`Scene <spyral.Scene>`
+    :param images: The images that the sprites can show.
+    :type images: a list of :class:`Images <spyral.Image>`
+    :param int capacity: How many sprites to make room for initially. The
+                         arrays grow as needed.
+    """
+    def __init__(self, parent, images, capacity=64):
+        if not _NUMPY_AVAILABLE:
+            raise ImportError("SpriteBatches require NumPy.")
+        self._parent = _wref(parent)
+        self._scene = _wref(parent.scene)
+        self._images = list(images)
+        self._anchor = 'topleft'
+        self._count = 0
+        capacity = max(1, capacity)
+        self._positions = numpy.zeros((capacity, 2))
+        self._velocities = numpy.zeros((capacity, 2))
+        self._layers = numpy.ones(capacity)
+        self._visible = numpy.ones(capacity, dtype=bool)
+        self._image_indices = numpy.zeros(capacity, dtype=int)
+        self._recalculate_images()
+
+        parent._add_child(self)
+        spyral.event.register('director.update', self.update, ('delta', ),
+                              scene=self._scene())
+        spyral.event.register('director.render', self._draw,
+                              scene=self._scene())
+
+    def _recalculate_images(self):
+        """
+        Recomputes the size and anchor offset of every image.
+        """
+        sizes = [image.size for image in self._images]
+        self._sizes = numpy.array(sizes, dtype=float).reshape(-1, 2)
+        self._offsets = numpy.array([spyral.util._anchor_offset(self._anchor,
+                                                                size[0],
+                                                                size[1])
+                                     for size in sizes],
+                                    dtype=float).reshape(-1, 2)
+
+    def _grow(self, count):
+        """
+        Makes room for at least `count` sprites.
+        """
+        capacity = len(self._positions)
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        for name in ('_positions', '_velocities', '_layers', '_visible',
+                     '_image_indices'):
+            old = getattr(self, name)
+            new = numpy.zeros((capacity, ) + old.shape[1:], dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    # Getters and Setters
+    def _get_positions(self):
+        """
+        The position of each sprite, as an N x 2 ``float`` array. Changes to
+        this array move the sprites.
+        """
+        return self._positions[:self._count]
+
+    def _get_velocities(self):
+        """
+        The velocity of each sprite in pixels per second, as an N x 2
+        ``float`` array. Sprites are moved by their velocities on every
+        ``director.update``.
+        """
+        return self._velocities[:self._count]
+
+    def _get_layers(self):
+        """
+        The depth of each sprite, as an N ``float`` array. These are the
+        computed positions of the layers, rather than their names; use
+        :func:`set_layer <spyral.SpriteBatch.set_layer>` to move sprites to
+        a named layer.
+        """
+        return self._layers[:self._count]
+
+    def _get_visible(self):
+        """
+        Whether each sprite is drawn, as an N ``bool`` array.
+        """
+        return self._visible[:self._count]
+
+    def _get_image_indices(self):
+        """
+        The index in :attr:`images <spyral.SpriteBatch.images>` of the image
+        that each sprite shows, as an N ``int`` array.
+        """
+        return self._image_indices[:self._count]
+
+    def _get_images(self):
+        """
+        The list of images that the sprites can show. Read-only.
+        """
+        return self._images
+
+    def _get_anchor(self):
+        """
+        Defines an :ref:`anchor point <ref.anchors>` where the position of
+        every sprite in the batch is, relative to its image.
+        """
+        return self._anchor
+
+    def _set_anchor(self, anchor):
+        self._anchor = anchor
+        self._recalculate_images()
+
+    def _get_scene(self):
+        """
+        The top-level scene that this batch belongs to. Read-only.
+        """
+        return self._scene()
+
+    def _get_parent(self):
+        """
+        The parent of this batch, either a :class:`View <spyral.View>` or a
+        :class:`Scene <spyral.Scene>`. Read-only.
+        """
+        return self._parent()
+
+    positions = property(_get_positions)
+    velocities = property(_get_velocities)
+    layers = property(_get_layers)
+    visible = property(_get_visible)
+    image_indices = property(_get_image_indices)
+    images = property(_get_images)
+    anchor = property(_get_anchor, _set_anchor)
+    scene = property(_get_scene)
+    parent = property(_get_parent)
+
+    def __len__(self):
+        return self._count
+
+    def add(self, pos, velocity=(0, 0), image=0, layer=None, visible=True):
+        """
+        Adds a new sprite to the end of the batch.
+
+        :param pos: The position of the sprite.
+        :type pos: :class:`Vec2D <spyral.Vec2D>`
+        :param velocity: The velocity of the sprite, in pixels per second.
+        :type velocity: :class:`Vec2D <spyral.Vec2D>`
+        :param int image: The index of the sprite's image.
+        :param str layer: The name of the sprite's layer, or ``None``.
+        :param bool visible: Whether the sprite is drawn.
+        :returns: The index of the new sprite.
+        """
+        index = self._count
+        self._grow(index + 1)
+        self._count += 1
+        self._positions[index] = pos
+        self._velocities[index] = velocity
+        self._image_indices[index] = image
+        self._visible[index] = visible
+        self._layers[index] = self._layer_position(layer)
+        return index
+
+    def add_many(self, positions, velocities=None, images=0, layer=None):
+        """
+        Adds many new sprites to the end of the batch at once.
+
+        :param positions: An N x 2 array of positions.
+        :param velocities: An N x 2 array of velocities, or ``None`` for
+                           sprites that don't move.
+        :param images: The index of the image of each sprite, or one index for
+                       all of them.
+        :param str layer: The name of the layer of the new sprites, or
+                          ``None``.
+        :returns: A ``slice`` of the indices of the new sprites.
+        """
+        positions = numpy.asarray(positions, dtype=float).reshape(-1, 2)
+        start = self._count
+        end = start + len(positions)
+        self._grow(end)
+        self._count = end
+        self._positions[start:end] = positions
+        self._velocities[start:end] = 0 if velocities is None else velocities
+        self._image_indices[start:end] = images
+        self._visible[start:end] = True
+        self._layers[start:end] = self._layer_position(layer)
+        return slice(start, end)
+
+    def remove(self, indices):
+        """
+        Removes sprites from the batch. The remaining sprites keep their order,
+        so the sprites after a removed sprite move down to a lower index.
+
+        :param indices: An index, a list or array of indices, a slice, or an
+                        N ``bool`` array that is ``True`` for the sprites to
+                        remove.
+        """
+        keep = numpy.ones(self._count, dtype=bool)
+        keep[indices] = False
+        count = int(keep.sum())
+        if count == self._count:
+            return
+        for name in ('_positions', '_velocities', '_layers', '_visible',
+                     '_image_indices'):
+            array = getattr(self, name)
+            array[:count] = array[:self._count][keep]
+        self._count = count
+
+    def clear(self):
+        """
+        Removes every sprite from the batch.
+        """
+        self._count = 0
+
+    def _layer_position(self, layer):
+        """
+        Returns the depth of the named layer of this batch's parent.
+        """
+        if layer is None:
+            return 1
+        return self._scene()._get_layer_position(self._parent(), layer)
+
+    def set_layer(self, indices, layer):
+        """
+        Moves sprites to a layer of this batch's parent.
+
+        :param indices: The sprites to move, as anything that can index a
+                        NumPy array.
+        :param str layer: The name of the layer.
+        """
+        self._layers[:self._count][indices] = self._layer_position(layer)
+
+    def update(self, delta):
+        """
+        Moves every sprite by its velocity. This is called on every
+        ``director.update``; it can be overridden to add more behavior
+        (e.g. gravity), as long as the overriding method calls it.
+
+        :param float delta: The time since the last update, in seconds.
+        """
+        if self._count:
+            self._positions[:self._count] += (self._velocities[:self._count] *
+                                              delta)
+
+    def _get_transform(self, drawing):
+        """
+        Returns the (scale, offset) pair that takes positions in this batch's
+        parent to positions in the scene. When `drawing`, the scene's own
+        scaling is included, and ``None`` is returned if a View above the batch
+        is hidden.
+        """
+        scene = self._scene()
+        parent = self._parent()
+        (sx, sy), (ox, oy) = parent._get_transform()
+        if not drawing:
+            return (sx, sy), (ox, oy)
+        while parent is not scene:
+            if not parent.visible:
+                return None
+            parent = parent.parent
+        bx, by = scene._blit_scale
+        return (sx * bx, sy * by), (ox * bx, oy * by)
+
+    def _get_boxes(self, transform):
+        """
+        Returns the top-left corners and sizes of every sprite's image once
+        `transform` is applied, as two N x 2 arrays.
+        """
+        (sx, sy), (ox, oy) = transform
+        count = self._count
+        images = self._image_indices[:count]
+        scale = numpy.array((sx, sy))
+        corners = ((self._positions[:count] - self._offsets[images]) * scale +
+                   (ox, oy))
+        return corners, self._sizes[images] * scale
+
+    def _collides(self, transform, left, top, right, bottom):
+        """
+        Returns an N ``bool`` array of which sprites' boxes, after
+        `transform`, overlap the given edges.
+        """
+        corners, sizes = self._get_boxes(transform)
+        far = corners + sizes
+        return ((corners[:, 0] < right) & (corners[:, 1] < bottom) &
+                (far[:, 0] > left) & (far[:, 1] > top))
+
+    def on_screen(self):
+        """
+        Returns an N ``bool`` array that is ``True`` for the sprites whose
+        images are at least partially inside of the scene. This is what the
+        batch uses to skip drawing sprites, and is handy for removing sprites
+        that have left the scene::
+
+            batch.remove(~batch.on_screen())
+
+        :rtype: ``numpy.ndarray``
+        """
+        width, height = self._scene().size
+        return self._collides(self._get_transform(False), 0, 0, width, height)
+
+    def collide_rect(self, rect):
+        """
+        Returns the indices of the sprites colliding with the rect.
+
+        :param rect: The rect (relative to the window dimensions).
+        :type rect: :class:`Rect <spyral.Rect>`
+        :rtype: ``numpy.ndarray`` of indices
+        """
+        rect = spyral.Rect(rect)
+        hits = self._collides(self._get_transform(False), rect.left, rect.top,
+                              rect.right, rect.bottom)
+        return numpy.flatnonzero(hits)
+
+    def collide_point(self, point):
+        """
+        Returns the indices of the sprites colliding with the point.
+
+        :param point: The point (relative to the window dimensions).
+        :type point: :class:`Vec2D <spyral.Vec2D>`
+        :rtype: ``numpy.ndarray`` of indices
+        """
+        corners, sizes = self._get_boxes(self._get_transform(False))
+        far = corners + sizes
+        x, y = point
+        hits = ((corners[:, 0] <= x) & (corners[:, 1] <= y) &
+                (far[:, 0] > x) & (far[:, 1] > y))
+        return numpy.flatnonzero(hits)
+
+    def collide_sprite(self, sprite):
+        """
+        Returns the indices of the sprites colliding with the sprite (or
+        View).
+
+        :param sprite: The other sprite.
+        :type sprite: :class:`Sprite <spyral.Sprite>` or
+                      :class:`View <spyral.View>`
+        :rtype: ``numpy.ndarray`` of indices
+        """
+        boxes = self._scene()._collision_boxes
+        if sprite not in boxes:
+            return numpy.zeros(0, dtype=int)
+        return self.collide_rect(boxes[sprite])
+
+    def collide_batch(self, other):
+        """
+        Returns every pair of colliding sprites between this batch and the
+        other batch. This compares every sprite with every other sprite, so it
+        is best suited to a small batch against a large one (e.g. enemies
+        against bullets).
+
+        :param other: The other batch.
+        :type other: :class:`SpriteBatch <spyral.SpriteBatch>`
+        :returns: Two arrays of the same length, with the indices in this
+                  batch and the indices in `other` of each colliding pair.
+        """
+        corners, sizes = self._get_boxes(self._get_transform(False))
+        other_corners, other_sizes = other._get_boxes(
+            other._get_transform(False))
+        far = corners + sizes
+        other_far = other_corners + other_sizes
+        hits = ((corners[:, None, 0] < other_far[None, :, 0]) &
+                (corners[:, None, 1] < other_far[None, :, 1]) &
+                (far[:, None, 0] > other_corners[None, :, 0]) &
+                (far[:, None, 1] > other_corners[None, :, 1]))
+        return numpy.nonzero(hits)
+
+    def _draw(self):
+        """
+        Internal method for handing the scene one blit per layer for all the
+        visible sprites that are on screen.
+        """
+        if not self._count:
+            return
+        transform = self._get_transform(True)
+        if transform is None:
+            return
+        scene = self._scene()
+        width, height = scene._surface.get_size()
+        corners, sizes = self._get_boxes(transform)
+        far = corners + sizes
+        shown = numpy.flatnonzero(self._visible[:self._count] &
+                                  (corners[:, 0] < width) &
+                                  (corners[:, 1] < height) &
+                                  (far[:, 0] > 0) & (far[:, 1] > 0))
+        if not len(shown):
+            return
+
+        (sx, sy), _ = transform
+        if (sx, sy) == (1.0, 1.0):
+            surfaces = [image._surf for image in self._images]
+        else:
+            surfaces = [spyral.util.scale_surface(image._surf,
+                                                  (image.width * sx,
+                                                   image.height * sy))
+                        for image in self._images]
+
+        layers = self._layers[shown]
+        shown = shown[numpy.argsort(layers, kind='mergesort')]
+        layers = self._layers[shown]
+        # Rects truncate their positions, just like the blits of sprites
+        xs = corners[shown, 0].astype(int)
+        ys = corners[shown, 1].astype(int)
+        images = self._image_indices[shown]
+        starts = numpy.flatnonzero(numpy.diff(layers)) + 1
+        bounds = [0] + starts.tolist() + [len(shown)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            draws = []
+            rects = []
+            for x, y, image in zip(xs[start:end].tolist(),
+                                   ys[start:end].tolist(),
+                                   images[start:end].tolist()):
+                surface = surfaces[image]
+                rect = surface.get_rect(topleft=(x, y))
+                draws.append((surface, rect, None, 0))
+                rects.append(rect)
+            rect = rects[0].unionall(rects)
+            scene._batch_blit(_BatchBlit(float(layers[start]), draws,
+                                         rects, rect))
+
+    def kill(self):
+        """
+        When you no longer need a SpriteBatch, you can call this method to
+        have it removed from the Scene.
+        """
+        self._scene()._unregister_sprite_events(self)
+        self._parent()._remove_child(self)
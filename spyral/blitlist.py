@@ -0,0 +1,112 @@
+"""
+The StaticBlitList class holds the static blits of a Scene in depth order.
+Static blits rarely change between frames, so instead of sorting every blit
+on every frame, the static blits are kept sorted as they are added and removed,
+and only the (few) dynamic blits have to be sorted and merged in each frame.
+The opaque static blits are also kept track of, since they hide whatever is
+underneath them.
+"""
+
+from bisect import bisect_left
+from operator import attrgetter
+
+_get_layer = attrgetter('layer')
+
+class _StaticBlitList(object):
+    """
+    A mapping of keys (usually sprites) to static blits, which also keeps
+    the blits in order of their layer. Blits on the same layer are kept in the
+    order that they were added.
+    """
+    def __init__(self):
+        self._blits = {}
+        self._order = {}
+        self._sort_keys = []
+        self._sorted = []
+        self._counter = 0
+        self._opaque = {}
+        self._opaque_sorted = None
+
+    def __setitem__(self, key, blit):
+        if key in self._blits:
+            self.pop(key)
+        sort_key = (blit.layer, self._counter)
+        self._counter += 1
+        index = bisect_left(self._sort_keys, sort_key)
+        self._sort_keys.insert(index, sort_key)
+        self._sorted.insert(index, blit)
+        self._blits[key] = blit
+        self._order[key] = sort_key
+        if blit.opaque:
+            self._opaque[key] = blit
+            self._opaque_sorted = None
+
+    def __getitem__(self, key):
+        return self._blits[key]
+
+    def __contains__(self, key):
+        return key in self._blits
+
+    def __len__(self):
+        return len(self._blits)
+
+    def pop(self, key):
+        """
+        Removes the blit for `key` and returns it. Raises a ``KeyError`` if
+        there is no blit for `key`.
+        """
+        blit = self._blits.pop(key)
+        sort_key = self._order.pop(key)
+        index = bisect_left(self._sort_keys, sort_key)
+        del self._sort_keys[index]
+        del self._sorted[index]
+        if key in self._opaque:
+            del self._opaque[key]
+            self._opaque_sorted = None
+        return blit
+
+    def values(self):
+        """
+        Returns a list of the static blits, ordered by layer.
+        """
+        return list(self._sorted)
+
+    def opaque(self):
+        """
+        Returns a list of the opaque static blits, ordered from the highest
+        layer to the lowest.
+        """
+        if self._opaque_sorted is None:
+            self._opaque_sorted = sorted(self._opaque.itervalues(),
+                                         key=_get_layer, reverse=True)
+        return self._opaque_sorted
+
+    def merged(self, dynamic):
+        """
+        Returns a list of all the static blits and the given dynamic blits,
+        ordered by layer. Dynamic blits come before static blits on the same
+        layer.
+
+        :param dynamic: The dynamic blits for this frame, in any order.
+        :type dynamic: a list of :class:`_Blit <spyral.util._Blit>`
+        :returns: A new list of blits.
+        """
+        static = self._sorted
+        if not dynamic:
+            return list(static)
+        dynamic = sorted(dynamic, key=_get_layer)
+        if not static:
+            return dynamic
+        result = []
+        append = result.append
+        static_index = 0
+        static_count = len(static)
+        for blit in dynamic:
+            layer = blit.layer
+            while (static_index < static_count and
+                   static[static_index].layer < layer):
+                append(static[static_index])
+                static_index += 1
+            append(blit)
+        result.extend(static[static_index:])
+        return result
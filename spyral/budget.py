@@ -0,0 +1,207 @@
+"""
+The FrameBudget class lowers the quality of a Scene's rendering when its frames
+take too long, and restores it when they are fast again. It is attached to the
+Scene's :class:`GameClock <spyral.GameClock>`, which reports how long each
+update and frame took.
+
+Important concepts:
+    Target
+        The number of seconds that an update and a frame together should take.
+        If it is ``None`` (the default), the budget only measures, and never
+        changes the quality.
+    Hooks
+        A hook is a named pair of functions: one that lowers some aspect of
+        the quality, and one that restores it. Hooks are applied in the order
+        that they were added when the average frame is over the target, and
+        are restored most recent first once the average frame is back under
+        HEADROOM of the target.
+    Level
+        The number of hooks that are currently applied. Level 0 is full
+        quality.
+
+Every budget starts with four hooks, from the least to the most noticeable:
+
+``"smoothscale"``
+    Scaled images are made with ``pygame.transform.scale`` instead of
+    ``pygame.transform.smoothscale``.
+``"offscreen_updates"``
+    Sprites whose collision boxes are outside the scene only receive every
+    OFFSCREEN_UPDATE_INTERVAL-th ``director.update`` event (with a
+    correspondingly larger ``delta``).
+``"particles"``
+    :attr:`particle_scale <spyral.FrameBudget.particle_scale>` drops to
+    LOW_PARTICLE_SCALE. Spyral has no particle system of its own, so particle
+    emitters should multiply their counts by it.
+``"resolution"``
+    The scene is rendered into an offscreen surface that is LOW_RESOLUTION
+    times the size of the window, which is then scaled up onto the window.
+"""
+
+import spyral
+from weakref import ref as _wref
+
+class FrameBudget(object):
+    """
+    Watches the cost of a Scene's updates and frames, and applies or restores
+    quality hooks to keep it under the `target`. Every Scene has one, available
+    as ``scene.clock.budget``; it does nothing until a `target` is set::
+
+        self.clock.budget.target = 1.0 / 30
+
+    :param scene: The scene whose quality is managed.
+    :type scene: :class:`Scene <spyral.Scene>`
+    :param float target: The number of seconds that an update and a frame
+                         should take together, or ``None``.
+    """
+    #: How much weight each new measurement has in the moving average.
+    SMOOTHING = 0.1
+    #: The fraction of the target that the average has to drop below before
+    #: quality is restored.
+    HEADROOM = 0.7
+    #: How many frames to wait after changing the quality before changing it
+    #: again, so that the average can settle.
+    COOLDOWN = 30
+    #: How often off-screen sprites are updated by the "offscreen_updates"
+    #: hook.
+    OFFSCREEN_UPDATE_INTERVAL = 4
+    #: The particle scale used by the "particles" hook.
+    LOW_PARTICLE_SCALE = 0.5
+    #: The render scale used by the "resolution" hook.
+    LOW_RESOLUTION = 0.5
+    def __init__(self, scene, target=None):
+        self._scene = _wref(scene)
+        self.target = target
+        self.average = 0.0
+        self.particle_scale = 1.0
+        self._hooks = []
+        self._level = 0
+        self._cooldown = 0
+        self.add_hook("smoothscale",
+                      spyral.util._lower_scaling_quality,
+                      spyral.util._restore_scaling_quality)
+        self.add_hook("offscreen_updates",
+                      self._throttle_offscreen_updates,
+                      self._restore_offscreen_updates)
+        self.add_hook("particles",
+                      self._lower_particles,
+                      self._restore_particles)
+        self.add_hook("resolution",
+                      self._lower_resolution,
+                      self._restore_resolution)
+
+    def _get_level(self):
+        """
+        The number of quality hooks that are currently applied. Read-only
+        ``int``.
+        """
+        return self._level
+
+    def _get_hooks(self):
+        """
+        The names of the quality hooks, in the order that they are applied.
+        Read-only list of ``str``.
+        """
+        return [name for name, _, _ in self._hooks]
+
+    level = property(_get_level)
+    hooks = property(_get_hooks)
+
+    def add_hook(self, name, lower, restore):
+        """
+        Adds a new quality hook, which is applied after all the existing ones.
+
+        :param str name: A name for the hook, for use with
+                         :func:`remove_hook <spyral.FrameBudget.remove_hook>`.
+        :param lower: A function, called without arguments, that lowers the
+                      quality.
+        :param restore: A function, called without arguments, that undoes
+                        `lower`.
+        """
+        self._hooks.append((name, lower, restore))
+
+    def remove_hook(self, name):
+        """
+        Removes the quality hook with the given name, restoring it first if it
+        is applied. Hooks that were applied after it stay applied.
+
+        :param str name: The name of the hook.
+        """
+        for index, (hook_name, _, restore) in enumerate(self._hooks):
+            if hook_name == name:
+                if index < self._level:
+                    restore()
+                    self._level -= 1
+                del self._hooks[index]
+                return
+
+    def lower(self):
+        """
+        Applies the next quality hook, if there is one.
+
+        :returns: Whether a hook was applied.
+        """
+        if self._level >= len(self._hooks):
+            return False
+        _, lower, _ = self._hooks[self._level]
+        lower()
+        self._level += 1
+        self._cooldown = self.COOLDOWN
+        return True
+
+    def restore(self):
+        """
+        Undoes the most recently applied quality hook, if there is one.
+
+        :returns: Whether a hook was restored.
+        """
+        if self._level == 0:
+            return False
+        self._level -= 1
+        _, _, restore = self._hooks[self._level]
+        restore()
+        self._cooldown = self.COOLDOWN
+        return True
+
+    def reset(self):
+        """
+        Restores every applied quality hook.
+        """
+        while self.restore():
+            pass
+        self._cooldown = 0
+
+    def sample(self, cost):
+        """
+        Records how long the last update and frame took, and changes the
+        quality if needed. This is called by the clock after every frame.
+
+        :param float cost: The time taken, in seconds.
+        """
+        self.average += (cost - self.average) * self.SMOOTHING
+        if self.target is None:
+            return
+        if self._cooldown > 0:
+            self._cooldown -= 1
+        elif self.average > self.target:
+            self.lower()
+        elif self.average < self.target * self.HEADROOM:
+            self.restore()
+
+    def _throttle_offscreen_updates(self):
+        self._scene()._offscreen_update_interval = \
+            self.OFFSCREEN_UPDATE_INTERVAL
+
+    def _restore_offscreen_updates(self):
+        self._scene()._offscreen_update_interval = 1
+
+    def _lower_particles(self):
+        self.particle_scale = self.LOW_PARTICLE_SCALE
+
+    def _restore_particles(self):
+        self.particle_scale = 1.0
+
+    def _lower_resolution(self):
+        self._scene()._set_render_scale(self.LOW_RESOLUTION)
+
+    def _restore_resolution(self):
+        self._scene()._set_render_scale(1.0)
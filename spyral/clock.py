@@ -146,6 +146,9 @@ class GameClock(object):
                     updates
     frame_callback  The function which should be called for frame
                     rendering
+    budget          An optional object with a sample(cost) method, which
+                    is given the combined cost of the last update and
+                    frame after each frame (see spyral.FrameBudget)
     game_time       Virtual elapsed time in milliseconds
     paused          The game time at which the clock was paused
     =============== ============
@@ -187,6 +190,7 @@ class GameClock(object):
         self.update_callback = update_callback
         self.frame_callback = frame_callback
         self.paused_callback = paused_callback
+        self.budget = None
 
         # Time keeping.
         CURRENT_TIME = self.get_ticks()
@@ -340,6 +344,8 @@ class GameClock(object):
             self.frame_callback(self.interpolate)
             self.cost_of_frame = get_ticks() - ticks
             self._frame_ready = False
+            if self.budget is not None:
+                self.budget.sample(self.cost_of_update + self.cost_of_frame)
 
         # Flip metrics counters every second.
         if real_time >= self._next_second:
@@ -3,9 +3,14 @@
 import sys
 import spyral
 import pygame
-import inspect
 
 _inited = False
+# The scenes whose code is currently running, innermost last. Scenes are put
+# here while Scene.__init__ runs and while they handle events, and the director
+# puts the running scene here around its callbacks. The frame that put each
+# one here is kept alongside it.
+_executing_scenes = []
+_executing_frames = []
 
 def _init():
     """
@@ -30,18 +35,47 @@ def _quit():
     spyral.director._initialized = False
     raise spyral.exceptions.GameEndException("The game has ended correctly.")
 
+def _enter_scene(scene):
+    """
+    Marks `scene` as the executing scene, until the matching call to
+    :func:`_exit_scene`.
+    """
+    _executing_scenes.append(scene)
+    _executing_frames.append(sys._getframe(1))
+
+def _exit_scene():
+    """
+    Undoes the last call to :func:`_enter_scene`.
+    """
+    _executing_scenes.pop()
+    _executing_frames.pop()
+
 def _get_executing_scene():
     """
-    Returns the currently executing scene using Python introspection.
+    Returns the currently executing scene: the innermost scene that is being
+    constructed, is handling an event, or is being run by the director.
+    Only the calls made since the last scene was entered are searched for a
+    scene method (such as the rest of a subclass's ``__init__``, after
+    ``Scene.__init__`` has returned); outside of all scenes, every call is.
+    """
+    if _executing_scenes:
+        scene = _find_executing_scene(_executing_frames[-1])
+        if scene is None:
+            return _executing_scenes[-1]
+        return scene
+    return _find_executing_scene()
 
-    This function should not be used lightly - it requires some dark magic.
+def _find_executing_scene(stop=None):
+    """
+    Returns the scene whose method is the innermost one being called, by
+    walking up the call stack until the `stop` frame, or ``None``.
     """
-    for frame, _, _, _, _, _ in inspect.stack():
-        args, _, _, local_data = inspect.getargvalues(frame)
-        if sys.version_info[0:2]==(2,6):
-            # workaround for Python 2.6, see http://bugs.python.org/issue4092
-            args = inspect.ArgInfo(*args)
-        if len(args) > 0 and args[0] == 'self':
-            obj = local_data['self']
+    frame = sys._getframe(1)
+    while frame is not None and frame is not stop:
+        code = frame.f_code
+        if code.co_argcount > 0 and code.co_varnames[0] == 'self':
+            obj = frame.f_locals.get('self')
             if isinstance(obj, spyral.Scene):
                 return obj
+        frame = frame.f_back
+    return None
@@ -1,5 +1,6 @@
 import spyral
 import pygame
+import os
 
 _initialized = False
 _stack = []
@@ -7,6 +8,9 @@ _screen = None
 _tick = 0
 _max_fps = 30
 _max_ups = 30
+_headless = False
+_frame_pacing = True
+_virtual_time = 0.0
 
 def quit():
     """
@@ -18,7 +22,9 @@ def init(size=(0, 0),
          max_ups=30,
          max_fps=30,
          fullscreen=False,
-         caption="My Spyral Game"):
+         caption="My Spyral Game",
+         headless=False,
+         frame_pacing=True):
     """
     Initializes the director. This should be called at the very beginning of
     your game.
@@ -40,14 +46,37 @@ def init(size=(0, 0),
     :param caption: The caption that will be displayed in the window.
                     Typically the name of your game.
     :type caption: ``str``
+    :param headless: Whether to run without a window, e.g., on a server or
+                     during automated tests. The game is rendered into an
+                     offscreen surface using SDL's dummy video driver, and
+                     sound goes to SDL's dummy audio driver. This sets the
+                     ``SDL_VIDEODRIVER`` and ``SDL_AUDIODRIVER`` environment
+                     variables for the whole process, unless they are already
+                     set. Since there is no screen resolution to fall back
+                     on, a `size` should be given.
+    :type headless: ``bool``
+    :param frame_pacing: Whether updates and frames should be spread out in
+                         real time according to `max_ups` and `max_fps`. If
+                         this is False, the game runs as fast as it can on a
+                         simulated clock: every tick of the clock advances the
+                         game time by exactly one update, and no time is spent
+                         sleeping. This is mostly useful along with
+                         `headless`, for simulations and benchmarks.
+    :type frame_pacing: ``bool``
     """
     global _initialized
     global _screen
     global _max_fps
     global _max_ups
+    global _headless
+    global _frame_pacing
 
     if _initialized:
         print 'Warning: Tried to initialize the director twice. Ignoring.'
+    if headless:
+        # SDL reads the drivers when the display and mixer are initialized
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
     spyral._init()
 
     flags = 0
@@ -59,7 +88,7 @@ def init(size=(0, 0),
         flags |= pygame.RESIZABLE
     if noframe:
         flags |= pygame.NOFRAME
-    if fullscreen:
+    if fullscreen and not headless:
         flags |= pygame.FULLSCREEN
     _screen = pygame.display.set_mode(size, flags)
 
@@ -68,6 +97,27 @@ def init(size=(0, 0),
 
     _max_ups = max_ups
     _max_fps = max_fps
+    _headless = headless
+    _frame_pacing = frame_pacing
+
+def _get_virtual_time():
+    """
+    The time source used by scene clocks when frame pacing is turned off. It
+    only moves forward when the director advances it, one update at a time.
+
+    :rtype: float
+    :returns: The simulated time, in seconds.
+    """
+    return _virtual_time
+
+def is_headless():
+    """
+    Returns whether the director was initialized in headless mode, i.e.,
+    without a window.
+
+    :rtype: bool
+    """
+    return _headless
 
 def get_scene():
     """
@@ -93,6 +143,15 @@ def get_tick():
     """
     return _tick
 
+def _exit_scene(scene):
+    """
+    Tells the scene on top of the stack that it is no longer running. Its
+    frame budget gives back any quality that it lowered, since some of its
+    hooks (such as smooth scaling) apply to every scene.
+    """
+    spyral.event.handle('director.scene.exit', scene=scene)
+    scene.clock.budget.reset()
+
 def replace(scene):
     """
     Replace the currently running scene on the stack with *scene*.
@@ -107,7 +166,7 @@ def replace(scene):
     :type scene: :class:`Scene <spyral.Scene>`
     """
     if _stack:
-        spyral.event.handle('director.scene.exit', scene=_stack[-1])
+        _exit_scene(_stack[-1])
         old = _stack.pop()
         spyral.sprite._switch_scene()
     _stack.append(scene)
@@ -126,7 +185,7 @@ def pop():
     """
     if len(_stack) < 1:
         return
-    spyral.event.handle('director.scene.exit', scene=_stack[-1])
+    _exit_scene(_stack[-1])
     scene = _stack.pop()
     spyral.sprite._switch_scene()
     if _stack:
@@ -145,7 +204,7 @@ def push(scene):
     :type scene: :class:`Scene <spyral.Scene>`
     """
     if _stack:
-        spyral.event.handle('director.scene.exit', scene=_stack[-1])
+        _exit_scene(_stack[-1])
         old = _stack[-1]
         spyral.sprite._switch_scene()
     _stack.append(scene)
@@ -168,6 +227,7 @@ def run(sugar=False, profiling=False, scene=None):
     :param scene: The first scene.
     :type scene: :class:`Scene <spyral.Scene>`
     """
+    global _virtual_time
     if scene is not None:
         push(scene)
     if sugar:
@@ -192,10 +252,14 @@ def run(sugar=False, profiling=False, scene=None):
                     A closure for handling drawing, which includes forcing the
                     rendering-related events to be fired.
                     """
-                    scene._handle_event("director.pre_render")
-                    scene._handle_event("director.render")
-                    scene._draw()
-                    scene._handle_event("director.post_render")
+                    spyral.core._enter_scene(scene)
+                    try:
+                        scene._handle_event("director.pre_render")
+                        scene._handle_event("director.render")
+                        scene._draw()
+                        scene._handle_event("director.post_render")
+                    finally:
+                        spyral.core._exit_scene()
 
                 def update_callback(delta):
                     """
@@ -203,24 +267,32 @@ def run(sugar=False, profiling=False, scene=None):
                     related events (e.g., pre_update, update, and post_update).
                     """
                     global _tick
-                    if sugar:
-                        while gtk.events_pending():
-                            gtk.main_iteration()
-                    if len(pygame.event.get([pygame.VIDEOEXPOSE])) > 0:
-                        scene.redraw()
-                        scene._handle_event("director.redraw")
-
-                    scene._event_source.tick()
-                    events = scene._event_source.get()
-                    for event in events:
-                        scene._queue_event(*spyral.event._pygame_to_spyral(event))
-                    scene._handle_event("director.pre_update")
-                    scene._handle_event("director.update",
-                                        spyral.Event(delta=delta))
-                    _tick += 1
-                    scene._handle_event("director.post_update")
+                    spyral.core._enter_scene(scene)
+                    try:
+                        if sugar:
+                            while gtk.events_pending():
+                                gtk.main_iteration()
+                        if len(pygame.event.get([pygame.VIDEOEXPOSE])) > 0:
+                            scene.redraw()
+                            scene._handle_event("director.redraw")
+
+                        scene._event_source.tick()
+                        events = scene._event_source.get()
+                        for event in events:
+                            scene._queue_event(*spyral.event._pygame_to_spyral(event))
+                        scene._handle_event("director.pre_update")
+                        scene._handle_event("director.update",
+                                            spyral.Event(delta=delta))
+                        _tick += 1
+                        scene._handle_event("director.post_update")
+                    finally:
+                        spyral.core._exit_scene()
                 clock.frame_callback = frame_callback
                 clock.update_callback = update_callback
             clock.tick()
+            if not _frame_pacing:
+                # Step the simulated clock so that the next tick is exactly
+                # one update later
+                _virtual_time += 1.0 / clock.max_ups
     except spyral.exceptions.GameEndException:
         pass
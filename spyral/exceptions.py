@@ -22,6 +22,8 @@ class UnusedStyleWarning(Warning):
     pass
 class ActorsNotAvailableWarning(Warning):
     pass
+class NumPyNotAvailableWarning(Warning):
+    pass
 
 
 # Convenience Wrappers
@@ -30,4 +32,6 @@ def unused_style_warning(obj, properties):
                   (obj, ','.join(properties)),
                   UnusedStyleWarning)
 def actors_not_available_warning():
-    warnings.warn("You do not have Greenlets installed, so you cannot use Actors.", ActorsNotAvailableWarning)
\ No newline at end of file
+    warnings.warn("You do not have Greenlets installed, so you cannot use Actors.", ActorsNotAvailableWarning)
+def numpy_not_available_warning():
+    warnings.warn("You do not have NumPy installed, so you cannot use SpriteBatches.", NumPyNotAvailableWarning)
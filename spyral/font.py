@@ -14,9 +14,7 @@ class _FontImage(Image):
     :type surf: :class:`pygame.Surface`
     """
     def __init__(self, surf):
-        self._surf = surf
-        self._name = None
-        self._version = 1
+        self._setup(surf, None)
 
 class Font(object):
     """
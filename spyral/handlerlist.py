@@ -0,0 +1,108 @@
+"""
+The HandlerList class holds the handlers registered for one event namespace
+of a Scene, in the order that they should be called. Like the static blits of
+a Scene (see :class:`_StaticBlitList <spyral.blitlist._StaticBlitList>`), the
+handlers are kept sorted as they are added and removed, instead of being
+sorted again on every registration.
+
+Important concepts:
+    Sort keys
+        Every handler gets a (priority, order) sort key when it is added,
+        where the order is counted across all lists, so a sort key is never
+        reused. The key is all that is needed to find the handler again, so
+        whoever added a handler can remove it with a binary search.
+"""
+
+from bisect import bisect_left
+from itertools import count
+
+# Shared by every list, so that sort keys are unique
+_order = count()
+
+class _HandlerList(object):
+    """
+    The handlers of a namespace, ordered by priority, and by the order they
+    were added within a priority.
+    """
+    def __init__(self):
+        self._sort_keys = []
+        self._handlers = []
+
+    def add(self, handler_info, priority):
+        """
+        Adds the handler and returns its sort key.
+
+        :param tuple handler_info: The handler and its registration details.
+        :param int priority: The priority of the handler.
+        :returns: The sort key of the handler.
+        """
+        sort_key = (priority, next(_order))
+        # Sort keys only grow, so a handler usually goes at the end
+        if not self._sort_keys or self._sort_keys[-1] < sort_key:
+            self._sort_keys.append(sort_key)
+            self._handlers.append(handler_info)
+        else:
+            index = bisect_left(self._sort_keys, sort_key)
+            self._sort_keys.insert(index, sort_key)
+            self._handlers.insert(index, handler_info)
+        return sort_key
+
+    def remove(self, sort_key):
+        """
+        Removes the handler with the sort key, if it is still in this list.
+
+        :returns: Whether it was removed.
+        """
+        index = bisect_left(self._sort_keys, sort_key)
+        if index == len(self._sort_keys) or self._sort_keys[index] != sort_key:
+            return False
+        del self._sort_keys[index]
+        del self._handlers[index]
+        return True
+
+    def remove_keys(self, sort_keys):
+        """
+        Removes every handler whose sort key is in `sort_keys`. A few
+        handlers are each found with a binary search, so the time taken
+        depends on how many go rather than on the length of the list; when
+        many go at once, the list is filtered in one pass instead.
+
+        :param set sort_keys: The sort keys of the handlers to remove.
+        """
+        if len(sort_keys) * 4 < len(self._sort_keys):
+            for sort_key in sort_keys:
+                self.remove(sort_key)
+            return
+        kept_keys = []
+        kept = []
+        for sort_key, handler_info in zip(self._sort_keys, self._handlers):
+            if sort_key not in sort_keys:
+                kept_keys.append(sort_key)
+                kept.append(handler_info)
+        self._sort_keys = kept_keys
+        self._handlers = kept
+
+    def remove_if(self, predicate):
+        """
+        Removes every handler for which `predicate(handler_info)` is true.
+
+        :returns: A list of the (sort key, handler_info) pairs removed.
+        """
+        kept_keys = []
+        kept = []
+        removed = []
+        for sort_key, handler_info in zip(self._sort_keys, self._handlers):
+            if predicate(handler_info):
+                removed.append((sort_key, handler_info))
+            else:
+                kept_keys.append(sort_key)
+                kept.append(handler_info)
+        self._sort_keys = kept_keys
+        self._handlers = kept
+        return removed
+
+    def __iter__(self):
+        return iter(self._handlers)
+
+    def __len__(self):
+        return len(self._handlers)
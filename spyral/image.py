@@ -14,6 +14,27 @@ def _new_spyral_surface(size):
                            int(size[1])),
                           pygame.SRCALPHA, 32).convert_alpha()
 
+def _new_matching_surface(surface, size):
+    """
+    Internal method for creating a new surface with the same pixel format as
+    `surface`, so that opaque surfaces stay without an alpha channel.
+    """
+    if surface.get_flags() & pygame.SRCALPHA:
+        return _new_spyral_surface(size)
+    return pygame.Surface((int(size[0]), int(size[1])), 0, surface)
+
+def _is_opaque(surface):
+    """
+    Internal method that returns whether every pixel of the surface is fully
+    opaque.
+    """
+    width, height = surface.get_size()
+    if not width or not height or surface.get_colorkey() is not None:
+        return False
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return surface.get_alpha() in (None, 255)
+    return pygame.mask.from_surface(surface, 254).count() == width * height
+
 def from_sequence(images, orientation="right", padding=0):
     """
     A function that returns a new Image from a list of images by
@@ -179,12 +200,25 @@ class Image(object):
             raise ValueError("Must specify exactly one of size and filename. See http://platipy.org/en/latest/spyral_docs.html#spyral.image.Image")
 
         if size is not None:
-            self._surf = _new_spyral_surface(size)
-            self._name = None
+            self._setup(_new_spyral_surface(size), None)
         else:
-            self._surf = pygame.image.load(filename).convert_alpha()
-            self._name = filename
+            self._setup(pygame.image.load(filename).convert_alpha(), filename)
+
+    def _setup(self, surf, name):
+        """
+        Sets up this image to hold the given surface. Subclasses that make
+        their own surfaces call this instead of ``Image.__init__``.
+
+        :param surf: The surface that this image wraps.
+        :type surf: :class:`pygame.Surface`
+        :param name: The filename the surface came from, or ``None``.
+        """
+        self._surf = surf
+        self._name = name
         self._version = 1
+        self._opaque = None
+        self._opaque_version = None
+        self._detected_opaque = False
 
     def _get_width(self):
         return self._surf.get_width()
@@ -205,6 +239,51 @@ class Image(object):
     #: Read-only.
     size = property(_get_size)
 
+    def _get_opaque(self):
+        """
+        Whether every pixel of this image is fully opaque (``bool``). Unless
+        it has been set, this is found by looking at the image's pixels
+        whenever the image changes. Setting it to ``True`` declares that the
+        image will stay opaque, and keeps it in a faster format without an
+        alpha channel; anything translucent drawn onto it afterwards becomes
+        opaque. Setting it to ``False`` brings the alpha channel back, and
+        setting it to ``None`` goes back to looking at the pixels.
+
+        The renderer uses this to skip drawing anything that is entirely
+        covered by an opaque image.
+        """
+        if self._opaque is not None:
+            return self._opaque
+        if self._opaque_version != self._version:
+            self._opaque_version = self._version
+            self._detected_opaque = _is_opaque(self._surf)
+        return self._detected_opaque
+
+    def _set_opaque(self, opaque):
+        if opaque is not None:
+            opaque = bool(opaque)
+        if opaque is self._opaque:
+            return
+        self._opaque = opaque
+        has_alpha = self._surf.get_flags() & pygame.SRCALPHA
+        if opaque and has_alpha:
+            spyral.util.scale_surface.clear(self._surf)
+            self._surf = self._surf.convert()
+        elif opaque is False and not has_alpha:
+            spyral.util.scale_surface.clear(self._surf)
+            self._surf = self._surf.convert_alpha()
+        self._version += 1
+
+    opaque = property(_get_opaque, _set_opaque)
+
+    def _keep_format(self):
+        """
+        Converts a newly made surface back to the format without an alpha
+        channel, if this image was declared to be opaque.
+        """
+        if self._opaque:
+            self._surf = self._surf.convert()
+
     def fill(self, color):
         """
         Fills the entire image with the specified color.
@@ -414,7 +493,17 @@ class Image(object):
         :param float angle: The number of degrees to rotate.
         :returns: This image.
         """
-        self._surf = pygame.transform.rotate(self._surf, angle).convert_alpha()
+        if angle % 90 == 0:
+            # Quarter turns only move pixels around, so the image keeps its
+            # format and stays as opaque as it was
+            self._surf = pygame.transform.rotate(self._surf, angle)
+        else:
+            # Other angles add transparent corners, so an image declared
+            # opaque goes back to having its pixels looked at
+            if self._opaque:
+                self._opaque = None
+            self._surf = pygame.transform.rotate(self._surf.convert_alpha(),
+                                                 angle).convert_alpha()
         self._version += 1
         return self
 
@@ -428,6 +517,7 @@ class Image(object):
         """
         self._surf = pygame.transform.smoothscale(self._surf,
                                                   size).convert_alpha()
+        self._keep_format()
         self._version += 1
         return self
 
@@ -442,6 +532,7 @@ class Image(object):
         self._version += 1
         self._surf = pygame.transform.flip(self._surf,
                                            flip_x, flip_y).convert_alpha()
+        self._keep_format()
         return self
 
     def copy(self):
@@ -476,6 +567,7 @@ class Image(object):
         new = _new_spyral_surface(size)
         new.blit(self._surf, (0, 0), (rect.pos, rect.size))
         self._surf = new
+        self._keep_format()
         self._version += 1
         return self
 
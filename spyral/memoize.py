@@ -1,6 +1,11 @@
 """This module contains classes to handle memoization, a time-saving method that
 caches previously seen results from function calls."""
 
+import math
+import pygame
+import spyral
+from collections import OrderedDict
+
 class Memoize(object):
     """
     This is a decorator to allow memoization of function calls. It is a
@@ -74,17 +79,297 @@ class SmartMemoize(object):
                    "Reconsider using this decorator")
             return self.func(*args)
 
-class _ImageMemoize(SmartMemoize):
+class _LRUCache(object):
     """
-    A subclass of SmartMemoise that is built explicitly for image related calls.
-    It allows images to be cleared from its cache when they are updated.
+    A cache that holds at most `max_bytes` worth of values. When it is full,
+    the least recently used values are evicted first. Getting, putting and
+    popping values all take constant time.
+
+    The number of `hits`, `misses` and `evictions` are counted, which is
+    useful for choosing a good `max_bytes`.
+
+    :param int max_bytes: The most bytes the cache may hold.
+    :param sizeof: A function that returns the size of a value, in bytes.
     """
-    def clear(self, clear_image):
+    def __init__(self, max_bytes, sizeof):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get_bytes(self):
+        """
+        The number of bytes currently held by the cache. Read-only.
+        """
+        return self._bytes
+
+    bytes = property(_get_bytes)
+
+    def get(self, key, default=None):
+        """
+        Returns the value for `key`, marking it as the most recently used, or
+        `default` if it is not in the cache.
+        """
+        try:
+            value, size = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries[key] = (value, size)
+        return value
+
+    def put(self, key, value, size=None):
+        """
+        Adds a value to the cache, evicting the least recently used values
+        until it fits. Values larger than the whole cache are not kept.
+
+        :param int size: The size of the value in bytes, if it should not be
+                         measured with `sizeof`.
+        """
+        self.pop(key)
+        if size is None:
+            size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """
+        Removes the least recently used value.
         """
-        Removes the given image from the cache.
-        :param clear_image: The image to remove.
-        :type clear_image: :class:`Image <spyral.Image>`
+        key, (value, size) = self._entries.popitem(last=False)
+        self._bytes -= size
+        self.evictions += 1
+        return key
+
+    def pop(self, key, default=None):
+        """
+        Removes the value for `key` from the cache and returns it, or returns
+        `default` if it is not in the cache.
+        """
+        try:
+            value, size = self._entries.pop(key)
+        except KeyError:
+            return default
+        self._bytes -= size
+        return value
+
+    def clear(self):
+        """
+        Removes every value from the cache.
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+def _surface_bytes(surface):
+    """
+    Returns the number of bytes used by the pixels of a pygame surface.
+    """
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def _mask_bytes(mask):
+    """
+    Returns the number of bytes used by the bits of a pygame mask.
+    """
+    width, height = mask.get_size()
+    return width * height // 8
+
+class _ImageMemoize(_LRUCache):
+    """
+    A decorator for functions that take a pygame surface and a size, and
+    return a new surface (e.g. scaling). Results are kept in a least recently
+    used cache of at most `max_bytes`, keyed by the surface and the size.
+
+    Every surface also has an index of its own entries, so that when a
+    surface is drawn on, :func:`clear <spyral.memoize._ImageMemoize.clear>`
+    only has to look at the results made from it.
+
+    :param func: The function to memoize.
+    :param int max_bytes: The most bytes the cache may hold. Defaults to
+                          MAX_BYTES.
+    :param mode: A function returning anything else that the results depend
+                 on (e.g., a quality setting), which is added to the keys.
+    """
+    #: The default size of the cache, in bytes.
+    MAX_BYTES = 64 * 1024 * 1024
+    def __init__(self, func, max_bytes=None, mode=None):
+        _LRUCache.__init__(self,
+                           self.MAX_BYTES if max_bytes is None else max_bytes,
+                           _surface_bytes)
+        self.func = func
+        self.mode = mode
+        self._by_surface = {}
+
+    def __call__(self, surface, size):
+        """
+        Returns the cached result for this surface and size, calling the
+        function if there isn't one.
+        """
+        key = (surface, (size[0], size[1]))
+        if self.mode is not None:
+            key += (self.mode(),)
+        result = self.get(key)
+        if result is None:
+            result = self.func(surface, size)
+            # A result that is the surface itself costs nothing to keep
+            self.put(key, result, 0 if result is surface else None)
+            if key in self._entries:
+                self._by_surface.setdefault(surface, set()).add(key)
+        return result
+
+    def _forget(self, key):
+        """
+        Removes `key` from its surface's index.
+        """
+        keys = self._by_surface.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_surface[key[0]]
+
+    def _evict(self):
+        key = _LRUCache._evict(self)
+        self._forget(key)
+        return key
+
+    def pop(self, key, default=None):
+        value = _LRUCache.pop(self, key, self)
+        if value is self:
+            return default
+        self._forget(key)
+        return value
+
+    def clear(self, surface=None):
+        """
+        Removes the results made from the given surface from the cache, or
+        every result if no surface is given.
+
+        :param surface: The surface that changed.
+        :type surface: :class:`pygame.Surface`
+        """
+        if surface is None:
+            _LRUCache.clear(self)
+            self._by_surface.clear()
+            return
+        for key in self._by_surface.pop(surface, ()):
+            _LRUCache.pop(self, key)
+
+class _TransformCache(_LRUCache):
+    """
+    A cache of flipped, scaled and rotated images, shared by every Sprite, so
+    that sprites showing the same image in the same pose share one surface.
+    Entries are keyed by the image's surface and version, the flips, the scale
+    and the angle. By default the exact angle is used; setting `angle_step`
+    rounds angles to the nearest multiple of that many degrees, so that sprites
+    at nearly equal angles share a surface, at the cost of drawing them at a
+    slightly different angle.
+
+    The bitmasks used for pixel-perfect collisions are kept alongside, in
+    `masks`, under the same keys as the surfaces that they were made from.
+
+    :param int max_bytes: The most bytes the cache may hold. Defaults to
+                          MAX_BYTES.
+    :param float angle_step: The angle quantization, in degrees. Defaults to
+                             ANGLE_STEP; 0 (the default) disables
+                             quantization.
+    """
+    #: The default size of the cache, in bytes.
+    MAX_BYTES = 32 * 1024 * 1024
+    #: The default angle quantization, in degrees. Angles are exact by default.
+    ANGLE_STEP = 0
+    #: The size of the cache of bitmasks, in bytes.
+    MAX_MASK_BYTES = 8 * 1024 * 1024
+    def __init__(self, max_bytes=None, angle_step=None):
+        _LRUCache.__init__(self,
+                           self.MAX_BYTES if max_bytes is None else max_bytes,
+                           lambda result: _surface_bytes(result[0]))
+        self.angle_step = self.ANGLE_STEP if angle_step is None else angle_step
+        self.masks = _LRUCache(self.MAX_MASK_BYTES, _mask_bytes)
+
+    def _key(self, image, flip_x, flip_y, scale, angle):
+        """
+        Returns the key for an image in a pose, along with the pose's scale
+        and (possibly quantized) angle in degrees.
+        """
+        degrees = 180.0 / math.pi * angle % 360
+        if self.angle_step:
+            degrees = round(degrees / self.angle_step) * self.angle_step % 360
+        scale = (scale[0], scale[1])
+        key = (image._surf, image._version, flip_x, flip_y, scale, degrees)
+        return key, scale, degrees
+
+    def transform(self, image, flip_x, flip_y, scale, angle):
+        """
+        Returns the transformed surface for an image, along with the offset of
+        its center caused by rotating it.
+
+        :param image: The image to transform.
+        :type image: :class:`Image <spyral.Image>`
+        :param bool flip_x: Whether to flip horizontally.
+        :param bool flip_y: Whether to flip vertically.
+        :param scale: The horizontal and vertical scale.
+        :type scale: :class:`Vec2D <spyral.Vec2D>`
+        :param float angle: The angle in radians.
+        :returns: A (pygame surface, :class:`Vec2D <spyral.Vec2D>`) pair.
+        """
+        key, scale, degrees = self._key(image, flip_x, flip_y, scale, angle)
+        source = image._surf
+        if not flip_x and not flip_y and scale == (1.0, 1.0) and not degrees:
+            return source, spyral.Vec2D(0, 0)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        # flip
+        if flip_x or flip_y:
+            source = pygame.transform.flip(source, flip_x, flip_y)
+
+        # scale
+        if scale != (1.0, 1.0):
+            new_size = (int(scale[0] * image.width),
+                        int(scale[1] * image.height))
+            new_surf = spyral.image._new_matching_surface(source, new_size)
+            source = pygame.transform.smoothscale(source, new_size, new_surf)
+
+        # rotate
+        offset = spyral.Vec2D(0, 0)
+        if degrees:
+            old = spyral.Vec2D(source.get_rect().center)
+            # Convert opaque images first, so that the corners are transparent
+            source = pygame.transform.rotate(source.convert_alpha(),
+                                             degrees).convert_alpha()
+            new = source.get_rect().center
+            offset = old - new
+
+        result = (source, offset)
+        self.put(key, result)
+        return result
+
+    def mask(self, image, flip_x, flip_y, scale, angle):
+        """
+        Returns a bitmask of the pixels of the transformed surface for an
+        image that are not fully transparent. The arguments are the same as
+        for :func:`transform`.
+
+        :returns: A :class:`pygame.mask.Mask`.
         """
-        self.cache = dict(((image, scale) for (image, scale)
-                                          in self.cache.iteritems()
-                                          if image is clear_image))
+        key = self._key(image, flip_x, flip_y, scale, angle)[0]
+        mask = self.masks.get(key)
+        if mask is None:
+            surface = self.transform(image, flip_x, flip_y, scale, angle)[0]
+            mask = pygame.mask.from_surface(surface, 0)
+            self.masks.put(key, mask)
+        return mask
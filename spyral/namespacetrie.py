@@ -0,0 +1,178 @@
+"""
+The NamespaceTrie class holds the event namespaces that a Scene has handlers
+registered for, so that the namespaces an event should be sent to can be found
+without looking at every registered namespace.
+
+Important concepts:
+    Characters
+        Namespaces are stored one character at a time, so ``"input.key"`` and
+        ``"input.keyboard"`` share the path of their first nine characters.
+        The empty namespace ``""`` is the root itself.
+    Parents
+        The parent of a namespace is everything before its last dot, like
+        ``"input.keyboard"`` for ``"input.keyboard.down"``. A namespace without
+        a dot is its own parent.
+    Matching
+        An event is sent to its own namespace, to the namespaces that its
+        parent starts with, and to the namespaces whose parents start with
+        the event's name. This is the same as comparing the names as strings:
+        a handler for ``"input.key"`` hears ``"input.keyboard.down"``.
+        Matching takes as many steps as the event has characters, plus the
+        number of characters stored below it.
+"""
+
+class _Node(object):
+    """
+    A character of a namespace. `name` is the full namespace, if it has been
+    added, or ``None``, and `children` are the namespaces whose parent ends
+    here.
+    """
+    __slots__ = ['next', 'name', 'children']
+    def __init__(self):
+        self.next = {}
+        self.name = None
+        self.children = set()
+
+def _parent(namespace):
+    return namespace.rsplit(".", 1)[0]
+
+def _collect(node, attribute):
+    """
+    Returns the namespaces held by the node and every node below it, either
+    their ``"name"`` or their ``"children"``.
+    """
+    names = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if attribute == "name":
+            if node.name is not None:
+                names.append(node.name)
+        else:
+            names.extend(node.children)
+        stack.extend(node.next.itervalues())
+    return names
+
+class _NamespaceTrie(object):
+    """
+    A set of dotted namespaces that can be searched by their prefixes.
+
+    :param namespaces: Any namespaces to start with.
+    :type namespaces: an iterable of ``str``
+    """
+    def __init__(self, namespaces=()):
+        self._root = _Node()
+        self._count = 0
+        for namespace in namespaces:
+            self.add(namespace)
+
+    def _find(self, prefix, create=False):
+        """
+        Returns the path of nodes from the root to the end of `prefix`, or
+        ``None`` if it isn't stored (and `create` is false).
+        """
+        path = [self._root]
+        for character in prefix:
+            node = path[-1].next.get(character)
+            if node is None:
+                if not create:
+                    return None
+                node = path[-1].next[character] = _Node()
+            path.append(node)
+        return path
+
+    def _prune(self, prefix, path):
+        """
+        Removes the nodes at the end of the path that no longer hold anything.
+        """
+        while len(path) > 1:
+            node = path.pop()
+            if node.name is not None or node.children or node.next:
+                break
+            del path[-1].next[prefix[len(path) - 1]]
+
+    def add(self, namespace):
+        """
+        Adds the namespace, if it isn't already in the trie.
+
+        :returns: Whether it was added.
+        """
+        node = self._find(namespace, True)[-1]
+        if node.name is not None:
+            return False
+        node.name = namespace
+        self._find(_parent(namespace), True)[-1].children.add(namespace)
+        self._count += 1
+        return True
+
+    def discard(self, namespace):
+        """
+        Removes the namespace, if it is in the trie, along with any nodes
+        that are no longer needed.
+
+        :returns: Whether it was removed.
+        """
+        path = self._find(namespace)
+        if path is None or path[-1].name is None:
+            return False
+        path[-1].name = None
+        self._prune(namespace, path)
+        parent = _parent(namespace)
+        path = self._find(parent)
+        path[-1].children.discard(namespace)
+        self._prune(parent, path)
+        self._count -= 1
+        return True
+
+    def __contains__(self, namespace):
+        path = self._find(namespace)
+        return path is not None and path[-1].name is not None
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter(self.descendants(""))
+
+    def descendants(self, namespace):
+        """
+        Returns the namespaces that start with `namespace`.
+
+        :returns: A list of ``str``.
+        """
+        path = self._find(namespace)
+        if path is None:
+            return []
+        return _collect(path[-1], "name")
+
+    def matches(self, namespace):
+        """
+        Returns the namespaces that an event named `namespace` should be sent
+        to: the namespaces that its parent starts with, from the shortest,
+        then the namespace itself and the namespaces whose parents start with
+        it.
+
+        :returns: A list of ``str``.
+        """
+        parent = _parent(namespace)
+        names = []
+        node = self._root
+        for character in parent:
+            if node.name is not None:
+                names.append(node.name)
+            node = node.next.get(character)
+            if node is None:
+                return names
+        if node.name is not None:
+            names.append(node.name)
+        # A namespace without a dot is its own parent, and was found above
+        for character in namespace[len(parent):]:
+            node = node.next.get(character)
+            if node is None:
+                return names
+        if len(namespace) > len(parent) and node.name is not None:
+            names.append(node.name)
+        seen = set(names)
+        names.extend(name for name in _collect(node, "children")
+                          if name not in seen)
+        return names
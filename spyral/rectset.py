@@ -0,0 +1,202 @@
+"""
+The RectSet class collects the dirty regions of the screen for a Scene. Every
+frame, the Scene has to clear the places where sprites used to be and then tell
+the display which regions changed; with many moving sprites, those regions
+overlap heavily, so drawing (or pushing) each of them separately touches the
+same pixels many times.
+
+Important concepts:
+    Waste
+        When two rects are merged into their union, the part of the union
+        covered by neither rect is wasted: it will be redrawn even though
+        nothing changed there. Two rects are only merged when the waste is a
+        small enough fraction of the union.
+    Coverage
+        Once the rects cover a large enough fraction of the bounds, it is
+        cheaper to redraw the whole bounds than to handle every rect, so the
+        set collapses into a single rect covering the bounds. Rects that
+        overlap without being merged only count once towards the coverage.
+    Reach
+        Rects are kept in a spatial hash, so when a rect is added, only the
+        rects within REACH pixels of it are considered for merging, and
+        collision tests only look at the rects in the same cells.
+"""
+
+import pygame
+from spatialhash import _SpatialHash
+
+def _union_area(rects):
+    """
+    Returns the number of pixels covered by at least one of the `rects`.
+
+    :param rects: The rects to measure.
+    :type rects: a list of pygame.Rect
+    :returns: An ``int``
+    """
+    edges = sorted(set([r.left for r in rects] + [r.right for r in rects]))
+    area = 0
+    for left, right in zip(edges, edges[1:]):
+        spans = sorted((r.top, r.bottom) for r in rects
+                       if r.left <= left and right <= r.right)
+        covered = 0
+        top = bottom = None
+        for start, end in spans:
+            if bottom is None or start > bottom:
+                if bottom is not None:
+                    covered += bottom - top
+                top, bottom = start, end
+            elif end > bottom:
+                bottom = end
+        if bottom is not None:
+            covered += bottom - top
+        area += covered * (right - left)
+    return area
+
+class _RectSet(object):
+    """
+    A collection of pygame Rects that coalesces overlapping and nearly adjacent
+    rects as they are added. All rects are clipped to the `bounds`.
+
+    :param bounds: The region that all rects are clipped to (usually the
+                   screen).
+    :type bounds: pygame.Rect
+    :param float waste: The fraction of a merged rect that is allowed to be
+                        covered by neither of the original rects. Defaults to
+                        WASTE.
+    :param float coverage: The fraction of the bounds that, once covered,
+                           causes the set to collapse to the bounds. Defaults
+                           to COVERAGE.
+    :param int cell_size: The cell size of the spatial hash that indexes the
+                          rects. Defaults to the spatial hash's default.
+    """
+    #: The default fraction of a merged rect that may be wasted.
+    WASTE = 0.25
+    #: The default fraction of the bounds after which the whole bounds are used.
+    COVERAGE = 0.75
+    #: How far apart (in pixels) two rects can be and still be merged.
+    REACH = 8
+    def __init__(self, bounds, waste=None, coverage=None, cell_size=None):
+        self.bounds = pygame.Rect(bounds)
+        self.waste = self.WASTE if waste is None else waste
+        self.coverage = self.COVERAGE if coverage is None else coverage
+        self._rects = {}
+        self._index = _SpatialHash(cell_size)
+        self._next_key = 0
+        self._area = 0
+        self._full = False
+
+    def _get_full(self):
+        """
+        Whether this set has collapsed into a single rect covering the bounds.
+        Read-only ``bool``.
+        """
+        return self._full
+
+    full = property(_get_full)
+
+    def _should_merge(self, first, second):
+        """
+        Decides whether the two rects should be replaced by their union.
+
+        :param first: A rect
+        :type first: pygame.Rect
+        :param second: Another rect
+        :type second: pygame.Rect
+        :returns: A ``bool``
+        """
+        union = first.union(second)
+        overlap = first.clip(second)
+        covered = (first.w * first.h + second.w * second.h -
+                   overlap.w * overlap.h)
+        union_area = union.w * union.h
+        return union_area - covered <= self.waste * union_area
+
+    def add(self, rect, merge=True):
+        """
+        Adds a new rect to this set, merging it with any rects that it overlaps
+        or nearly touches.
+
+        :param rect: The rect to add.
+        :type rect: pygame.Rect
+        :param bool merge: Whether the rect may be merged. If not, it is kept
+                           exactly as it is, and it never makes the set
+                           collapse into the bounds, so that the set covers
+                           nothing beyond the rects given to it.
+        """
+        if self._full:
+            return
+        rect = self.bounds.clip(rect)
+        if rect.w <= 0 or rect.h <= 0:
+            return
+        rects = self._rects
+        index = self._index
+        reach = self.REACH
+        # The rects that the new rect swallows are inside of it, so only they
+        # and the rects that overlap it need to be measured to find out how
+        # much of it was already covered
+        swallowed = []
+        merged = merge
+        while merged:
+            merged = False
+            near = rect.inflate(2 * reach, 2 * reach)
+            for key in index.candidates(near):
+                other = rects[key]
+                # Rects in the same cells can still be out of reach
+                if near.colliderect(other) and self._should_merge(rect, other):
+                    del rects[key]
+                    index.remove(key)
+                    swallowed.append(other)
+                    rect = rect.union(other)
+                    merged = True
+                    break
+        covered = [rects[key].clip(rect) for key in index.query(rect)]
+        covered.extend(swallowed)
+        key = self._next_key
+        self._next_key += 1
+        rects[key] = rect
+        index.insert(key, rect)
+        self._area += rect.w * rect.h - _union_area(covered)
+        bounds = self.bounds
+        if merge and self._area >= self.coverage * bounds.w * bounds.h:
+            self._full = True
+            index.clear()
+            self._rects = {key: pygame.Rect(bounds)}
+            index.insert(key, bounds)
+            self._area = bounds.w * bounds.h
+
+    def extend(self, rects):
+        """
+        Adds every rect from the iterable `rects` to this set.
+
+        :param rects: The rects to add.
+        :type rects: an iterable of pygame.Rect
+        """
+        for rect in rects:
+            self.add(rect)
+
+    def collides(self, rect):
+        """
+        Returns whether the given rect collides with any rect in this set.
+
+        :param rect: The rect to test.
+        :type rect: pygame.Rect
+        :returns: A ``bool``
+        """
+        if self._full:
+            return self.bounds.colliderect(rect)
+        return self._index.collides(rect)
+
+    def clear(self):
+        """
+        Removes all the rects from this set.
+        """
+        self._rects = {}
+        self._index.clear()
+        self._area = 0
+        self._full = False
+
+    def __iter__(self):
+        return self._rects.itervalues()
+
+    def __len__(self):
+        return len(self._rects)
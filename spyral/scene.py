@@ -2,6 +2,7 @@ from __future__ import division
 import spyral
 import pygame
 import time
+import math
 import operator
 import inspect
 import sys
@@ -13,10 +14,20 @@ except ImportError:
     spyral.exceptions.actors_not_available_warning()
     _GREENLETS_AVAILABLE = False
     
+# Surface.blits submits a whole list of blits in one call (Pygame 1.9.4+)
+_BATCHED_BLITS = hasattr(pygame.Surface, 'blits')
+
 from itertools import chain
 from layertree import _LayerTree
+from rectset import _RectSet
+from blitlist import _StaticBlitList
+from namespacetrie import _NamespaceTrie
+from handlerlist import _HandlerList
+from spatialhash import _SpatialHash
 from collections import defaultdict
+from fractions import gcd
 from weakref import ref as _wref
+from functools import partial
 from weakmethod import WeakMethodBound
 
 def _has_value(obj, collect):
@@ -29,6 +40,161 @@ def _has_value(obj, collect):
             return True
     return False
 
+# The default of a handler argument that must come from the event
+_REQUIRED = object()
+
+def _compile_binder(handler, args, kwargs):
+    """
+    Works out which attributes of an event a handler needs, so that it can be
+    called without inspecting it again. A binder is a pair of tuples of
+    (name, default) pairs, for the positional and keyword arguments. A name
+    of ``None`` stands for the event itself, and a default of `_REQUIRED`
+    means that the event must have that attribute.
+    """
+    def _pair(arg, default=_REQUIRED):
+        if arg == 'event':
+            return (None, default)
+        return (arg, default)
+    if handler is sys.exit and args is None and kwargs is None:
+        # Dirty hack to deal with python builtins
+        return ((), ())
+    if args is None and kwargs is None:
+        # Autodetect the arguments
+        funct = getattr(handler, 'func', handler)
+        try:
+            h_argspec = inspect.getargspec(funct)
+        except Exception, e:
+            raise Exception(("Unfortunate Python Problem! "
+                             "%s isn't supported by Python's "
+                             "inspect module! Oops.") % str(handler))
+        h_args = list(h_argspec.args)
+        h_defaults = h_argspec.defaults or tuple()
+        if len(h_args) > 0 and 'self' == h_args[0]:
+            h_args.pop(0)
+        d = len(h_args) - len(h_defaults)
+        if d > 0:
+            h_defaults = [_REQUIRED] * d + list(h_defaults)
+        return (tuple(_pair(arg, default) for arg, default
+                                          in zip(h_args, h_defaults)), ())
+    if args is None:
+        return ((), tuple(_pair(arg) for arg in kwargs))
+    return (tuple(_pair(arg) for arg in args), ())
+
+def _bind(pairs, event, type):
+    """
+    Returns the values for a binder's (name, default) pairs from the event.
+    """
+    values = []
+    append = values.append
+    for name, default in pairs:
+        if name is None:
+            append(event)
+            continue
+        value = getattr(event, name, default)
+        if value is _REQUIRED:
+            raise TypeError("Handler expects an argument named "
+                            "%s, %s does not have that." %
+                            (name, str(type)))
+        append(value)
+    return values
+
+def _sweep_owner(scene_ref, key, owner_ref):
+    """
+    Called when the owner of some bound method handlers is garbage collected,
+    to remove its handlers from the scene.
+    """
+    scene = scene_ref()
+    if scene is not None:
+        scene._drop_owned_handlers(key)
+
+def _covered(rect, opaque_rects):
+    """
+    Returns whether any of the opaque rects contains the whole rect.
+    """
+    # Only the opaque rects that overlap the rect can contain it, and pygame
+    # finds those without a Python loop over all of them
+    for index in rect.collidelistall(opaque_rects):
+        if opaque_rects[index].contains(rect):
+            return True
+    return False
+
+def _occluded(blit, occluders, occluder_rects):
+    """
+    Returns whether the blit is hidden under one of the opaque static blits
+    on a higher layer. `occluder_rects` holds the rects of the occluders, in
+    the same order.
+    """
+    layer = blit.layer
+    rect = blit.rect
+    # Like _covered, only the occluders that overlap the blit are looked at
+    for index in rect.collidelistall(occluder_rects):
+        if (occluders[index].layer > layer and
+                occluder_rects[index].contains(rect)):
+            return True
+    return False
+
+#: The (category bits, mask bits) of sprites and views that haven't set them
+_DEFAULT_FILTER = (1, ~0)
+
+def _sweep_axis(start, length, other_start, other_length, velocity):
+    """
+    Returns the (entry, exit) times at which an interval moving at `velocity`
+    starts and stops overlapping a still interval, or ``None`` if it never
+    does. Intervals that only touch do not overlap.
+    """
+    if velocity == 0:
+        if start < other_start + other_length and other_start < start + length:
+            return float('-inf'), float('inf')
+        return None
+    if velocity > 0:
+        return ((other_start - start - length) / velocity,
+                (other_start + other_length - start) / velocity)
+    return ((other_start + other_length - start) / velocity,
+            (other_start - start - length) / velocity)
+
+def _sweep_boxes(left, top, width, height, dx, dy, box):
+    """
+    Returns the (entry, exit) fractions of a move of (dx, dy) during which
+    the area (left, top, width, height) overlaps the box, or ``None``.
+    """
+    x = _sweep_axis(left, width, box.x, box.w, dx)
+    if x is None:
+        return None
+    y = _sweep_axis(top, height, box.y, box.h, dy)
+    if y is None:
+        return None
+    entry = max(x[0], y[0])
+    exit = min(x[1], y[1])
+    if entry >= exit or entry >= 1 or exit <= 0:
+        return None
+    return entry, exit
+
+def _sweep(first_from, first_to, second_from, second_to):
+    """
+    Returns the fraction of their moves, from 0 to 1, at which two boxes
+    moving in straight lines first collide, or ``None`` if they don't. The
+    boxes are assumed to have their final sizes for the whole move.
+    """
+    dx = (first_to.x - first_from.x) - (second_to.x - second_from.x)
+    dy = (first_to.y - first_from.y) - (second_to.y - second_from.y)
+    box = spyral.Rect(second_from.x, second_from.y, second_to.w, second_to.h)
+    times = _sweep_boxes(first_from.x, first_from.y, first_to.w, first_to.h,
+                         dx, dy, box)
+    if times is None:
+        return None
+    return max(times[0], 0)
+
+def _swept_area(start, end):
+    """
+    Returns the area covered by a box moving in a straight line from the
+    `start` box to the `end` box.
+    """
+    left = min(start.x, end.x)
+    top = min(start.y, end.y)
+    right = max(start.x + end.w, end.x + end.w)
+    bottom = max(start.y + end.h, end.y + end.h)
+    return pygame.Rect(left, top, right - left, bottom - top)
+
 class Scene(object):
     """
     Creates a new Scene. When a scene is not active, no events will be processed
@@ -48,15 +214,34 @@ class Scene(object):
                         `max_fps` is pulled from the director.
     """
     def __init__(self, size = None, max_ups=None, max_fps=None):
-        time_source = time.time
+        # Handlers registered without a scene while the scene is being built
+        # go to it
+        spyral.core._enter_scene(self)
+        try:
+            self._setup_scene(size, max_ups, max_fps)
+        finally:
+            spyral.core._exit_scene()
+
+    def _setup_scene(self, size, max_ups, max_fps):
+        """
+        Sets up the new scene; see :class:`Scene <spyral.Scene>`.
+        """
+        if spyral.director._frame_pacing:
+            time_source = time.time
+        else:
+            time_source = spyral.director._get_virtual_time
         self.clock = spyral.GameClock(
             time_source=time_source,
             max_fps=max_fps or spyral.director._max_fps,
             max_ups=max_ups or spyral.director._max_ups)
-        self.clock.use_wait = True
-
-        self._handlers = defaultdict(lambda: [])
-        self._namespaces = set()
+        self.clock.use_wait = spyral.director._frame_pacing
+        self.clock.budget = spyral.FrameBudget(self)
+
+        self._handlers = {}
+        self._owned_handlers = {}
+        self._doomed_handlers = {}
+        self._dynamic_binders = {}
+        self._namespaces = ()
         self._event_source = spyral.event.LiveEventHandler()
         self._handling_events = False
         self._events = []
@@ -72,7 +257,15 @@ class Scene(object):
 
         self._size = None
         self._scale = spyral.Vec2D(1.0, 1.0) #None
-        self._surface = pygame.display.get_surface()
+        # Blits are drawn onto _surface, which is usually the display, but
+        # can be an offscreen surface at a different resolution (see
+        # _resize_surface)
+        self._display = pygame.display.get_surface()
+        self._surface = self._display
+        self._render_scale = 1.0
+        self._framebuffer = False
+        self._blit_scale = self._scale
+        self._offscreen_update_interval = 1
         if size is not None:
             self._set_size(size)
         display_size = self._surface.get_size()
@@ -81,24 +274,39 @@ class Scene(object):
         self._background_version = 0
         self._surface.blit(self._background, (0, 0))
         self._blits = []
-        self._dirty_rects = []
-        self._clear_this_frame = []
-        self._clear_next_frame = []
-        self._soft_clear = []
-        self._static_blits = {}
+        self._culled = 0
+        self._last_culled = 0
+        self._last_occluded = 0
+        self._rect = self._surface.get_rect()
+        self._clear_this_frame = _RectSet(self._rect)
+        self._clear_next_frame = _RectSet(self._rect)
+        self._soft_clear = _RectSet(self._rect)
+        self._static_blits = _StaticBlitList()
         self._invalidating_views = {}
         self._collision_boxes = {}
-        self._rect = self._surface.get_rect()
+        self._collision_indexes = {}
+        self._collision_filters = {}
+        self._pixel_colliders = set()
+        self._collision_groups = {}
+        self._group_pairs = []
+        self._contacts = {}
+        self._swept_groups = set()
+        self._previous_boxes = {}
+        self._max_move = (0, 0)
 
         self._layers = []
         self._child_views = []
+        self._cached_views = []
         self._layer_tree = _LayerTree(self)
         self._sprites = set()
+        self._drawables = set()
 
         spyral.event.register('director.scene.enter', self.redraw,
                               scene=self)
         spyral.event.register('director.update', self._handle_events,
                               scene=self)
+        spyral.event.register('director.pre_update',
+                              self._forget_previous_boxes, scene=self)
         if _GREENLETS_AVAILABLE:
             spyral.event.register('director.update', self._run_actors, 
                                   ('delta',), scene=self)
@@ -110,6 +318,7 @@ class Scene(object):
 
         # View interface
         self._scene = _wref(self)
+        self._chain = (self._scene, 1.0, 1.0, 0.0, 0.0, None, None, True)
         self._views = []
 
         # Loading default styles
@@ -170,6 +379,90 @@ class Scene(object):
         else:
             self._events.append((type, event))
 
+    def _get_namespace_trie(self):
+        """
+        The namespaces that have handlers registered, as a
+        :class:`_NamespaceTrie <spyral.namespacetrie._NamespaceTrie>`.
+        Setting it to a sequence of namespaces builds a new trie.
+        """
+        self._remove_doomed_handlers()
+        return self._namespace_trie
+
+    def _set_namespace_trie(self, namespaces):
+        self._namespace_trie = _NamespaceTrie(namespaces)
+        self._resolved_namespaces = {}
+
+    _namespaces = property(_get_namespace_trie, _set_namespace_trie)
+
+    def _forget_resolved(self, namespace):
+        """
+        Drops the cached namespaces of every event type that is sent to the
+        namespace, so that they are looked up again when it next happens.
+        This is needed whenever the namespace is added or removed.
+        """
+        resolved = self._resolved_namespaces
+        parent = namespace.rsplit(".", 1)[0]
+        for type in resolved.keys():
+            if (type == namespace or parent.startswith(type) or
+                    type.rsplit(".", 1)[0].startswith(namespace)):
+                del resolved[type]
+
+    def _forget_namespace(self, namespace):
+        """
+        Removes the handlers of the namespace, if they are all gone.
+        """
+        if not self._handlers.get(namespace):
+            self._handlers.pop(namespace, None)
+            if self._namespace_trie.discard(namespace):
+                self._forget_resolved(namespace)
+
+    def _add_owned_handler(self, owner, namespace, sort_key):
+        """
+        Records that the handler with the sort key, in the namespace, is a
+        method of `owner`, so that it can be removed along with the owner's
+        other handlers. Handlers are removed automatically once their owner
+        is garbage collected.
+        """
+        key = id(owner)
+        record = self._owned_handlers.get(key)
+        if record is None:
+            owner_ref = _wref(owner, partial(_sweep_owner, _wref(self), key))
+            record = self._owned_handlers[key] = (owner_ref, [])
+        record[1].append((namespace, sort_key))
+
+    def _drop_owned_handlers(self, key):
+        """
+        Removes every handler whose owner has the id `key`. The handlers are
+        only taken out of their lists before the next event is handled, so
+        that when many owners go at once (e.g., many sprites are killed), each
+        list is filtered once instead of once per owner.
+        """
+        record = self._owned_handlers.pop(key, None)
+        if record is None:
+            return
+        doomed = self._doomed_handlers
+        for namespace, sort_key in record[1]:
+            sort_keys = doomed.get(namespace)
+            if sort_keys is None:
+                doomed[namespace] = set([sort_key])
+            else:
+                sort_keys.add(sort_key)
+
+    def _remove_doomed_handlers(self):
+        """
+        Removes the handlers dropped by `_drop_owned_handlers` from their
+        lists.
+        """
+        doomed = self._doomed_handlers
+        if not doomed:
+            return
+        self._doomed_handlers = {}
+        for namespace, sort_keys in doomed.iteritems():
+            handlers = self._handlers.get(namespace)
+            if handlers is not None:
+                handlers.remove_keys(sort_keys)
+                self._forget_namespace(namespace)
+
     def _reg_internal(self, namespace, handlers, args,
                       kwargs, priority, dynamic):
         """
@@ -178,38 +471,36 @@ class Scene(object):
         """
         if namespace.endswith(".*"):
             namespace = namespace[:-2]
-        self._namespaces.add(namespace)
+        if self._namespace_trie.add(namespace):
+            self._forget_resolved(namespace)
+        handler_list = self._handlers.get(namespace)
+        if handler_list is None:
+            handler_list = self._handlers[namespace] = _HandlerList()
         for handler in handlers:
-            self._handlers[namespace].append((handler, args, kwargs,
-                                              priority, dynamic))
-        self._handlers[namespace].sort(key=operator.itemgetter(3))
+            # The arguments of a handler are worked out once, here, instead
+            # of every time it is called
+            if dynamic:
+                binder = None
+            else:
+                binder = _compile_binder(handler, args, kwargs)
+            sort_key = handler_list.add((handler, args, kwargs,
+                                         priority, dynamic, binder), priority)
+            if isinstance(handler, WeakMethodBound):
+                self._add_owned_handler(handler.weak_object_ref(),
+                                        namespace, sort_key)
 
     def _get_namespaces(self, namespace):
         """
         Internal method for returning all the registered namespaces that are in
-        the given namespace.
+        the given namespace, or that it is in.
         """
-        return [n for n in self._namespaces if (namespace == n or
-                                        n.rsplit(".",1)[0].startswith(namespace) or
-                                        namespace.rsplit(".",1)[0].startswith(n))]
+        return self._namespace_trie.matches(namespace)
 
     def _send_event_to_handler(self, event, type, handler, args,
-                               kwargs, priority, dynamic):
+                               kwargs, priority, dynamic, binder=None):
         """
         Internal method to dispatch events to their handlers.
         """
-        fillval = "__spyral_itertools_fillvalue__"
-        def _get_arg_val(arg, default = fillval):
-            if arg == 'event':
-                return event
-            elif hasattr(event, arg):
-                return getattr(event, arg)
-            else:
-                if default != fillval:
-                    return default
-                raise TypeError("Handler expects an argument named "
-                                "%s, %s does not have that." %
-                                (arg, str(type)))
         if dynamic is True:
             h = handler
             handler = self
@@ -217,51 +508,87 @@ class Scene(object):
                 handler = getattr(handler, piece, None)
                 if handler is None:
                     return
-        if handler is sys.exit and args is None and kwargs is None:
-            # Dirty hack to deal with python builtins
-            args = []
-            kwargs = {}
-        elif args is None and kwargs is None:
-            # Autodetect the arguments
-            try:
-                funct = handler.func
-            except AttributeError, e:
-                funct = handler
-            try:
-                h_argspec = inspect.getargspec(funct)
-            except Exception, e:
-                raise Exception(("Unfortunate Python Problem! "
-                                 "%s isn't supported by Python's "
-                                 "inspect module! Oops.") % str(handler))
-            h_args = h_argspec.args
-            h_defaults = h_argspec.defaults or tuple()
-            if len(h_args) > 0 and 'self' == h_args[0]:
-                h_args.pop(0)
-            d = len(h_args) - len(h_defaults)
-            if d > 0:
-                h_defaults = [fillval] * d + list(*h_defaults)
-            args = [_get_arg_val(arg, default) for arg, default
-                                               in zip(h_args, h_defaults)]
-            kwargs = {}
-        elif args is None:
-            args = []
-            kwargs = dict([(arg, _get_arg_val(arg)) for arg in kwargs])
-        else:
-            args = [_get_arg_val(arg) for arg in args]
-            kwargs = {}
-        if handler is not None:
+            binder = self._get_dynamic_binder(handler, args, kwargs)
+        elif binder is None:
+            binder = _compile_binder(handler, args, kwargs)
+        positional, keywords = binder
+        args = _bind(positional, event, type)
+        if keywords:
+            kwargs = dict(zip([name or 'event' for name, _ in keywords],
+                              _bind(keywords, event, type)))
             handler(*args, **kwargs)
+        else:
+            handler(*args)
+
+    def _get_dynamic_binder(self, handler, args, kwargs):
+        """
+        Returns the binder for the function that a dynamic handler currently
+        refers to. Dynamic handlers can change, so their binders are cached by
+        function instead of when they are registered.
+        """
+        if args is not None or kwargs is not None:
+            return _compile_binder(handler, args, kwargs)
+        function = getattr(handler, 'im_func', handler)
+        binder = self._dynamic_binders.get(function)
+        if binder is None:
+            binder = _compile_binder(handler, args, kwargs)
+            self._dynamic_binders[function] = binder
+        return binder
 
     def _handle_event(self, type, event = None):
         """
         For a given event, send the event information to all registered handlers
         """
-        handlers = chain.from_iterable(self._handlers[namespace]
-                                            for namespace
-                                            in self._get_namespaces(type))
+        # The namespaces for each type of event are kept until a namespace
+        # that the event is sent to is added or removed. Their handlers are
+        # looked up as they are reached, so that handlers registered while
+        # the event is being handled may still receive it.
+        self._remove_doomed_handlers()
+        namespaces = self._resolved_namespaces.get(type)
+        if namespaces is None:
+            namespaces = self._get_namespaces(type)
+            self._resolved_namespaces[type] = namespaces
+        handlers = chain.from_iterable(self._handlers.get(namespace, ())
+                                       for namespace in namespaces)
+        if (self._offscreen_update_interval > 1 and
+                type == "director.update"):
+            handlers = self._throttle_offscreen(handlers, event)
+        else:
+            handlers = ((event, handler_info) for handler_info in handlers)
+        spyral.core._enter_scene(self)
+        try:
+            for event, handler_info in handlers:
+                if self._send_event_to_handler(event, type, *handler_info):
+                    break
+        finally:
+            spyral.core._exit_scene()
+
+    def _throttle_offscreen(self, handlers, event):
+        """
+        Filters the handlers of a ``director.update`` event so that sprites
+        outside the scene are only updated on every
+        `_offscreen_update_interval`-th tick, with a `delta` that covers the
+        ticks that they missed.
+
+        :returns: An iterator of (event, handler_info) pairs.
+        """
+        interval = self._offscreen_update_interval
+        tick = spyral.director.get_tick()
+        area = self._get_rect()
+        boxes = self._collision_boxes
+        slow_event = spyral.Event(delta=event.delta * interval)
         for handler_info in handlers:
-            if self._send_event_to_handler(event, type, *handler_info):
-                break
+            handler = handler_info[0]
+            if isinstance(handler, WeakMethodBound):
+                owner = handler.weak_object_ref()
+                box = boxes.get(owner)
+                if box is not None and not box.collide_rect(area):
+                    # Spread the updates of off-screen sprites across ticks
+                    if (tick + id(owner) // 16) % interval:
+                        continue
+                    yield slow_event, handler_info
+                    continue
+            yield event, handler_info
 
     def _handle_events(self):
         """
@@ -277,12 +604,10 @@ class Scene(object):
             self._pending = []
     
     def _unregister_sprite_events(self, sprite):
-        for name, handlers in self._handlers.items():
-            self._handlers[name] = [h for h in handlers
-                                        if (not isinstance(h[0], WeakMethodBound)
-                                            or h[0].weak_object_ref() is not sprite)]
-            if not self._handlers[name]:
-                del self._handlers[name]
+        """
+        Removes every handler that is a method of the sprite.
+        """
+        self._drop_owned_handlers(id(sprite))
 
     def _unregister(self, event_namespace, handler):
         """
@@ -296,14 +621,21 @@ class Scene(object):
         """
         if event_namespace.endswith(".*"):
             event_namespace = event_namespace[:-2]
-        self._handlers[event_namespace] = [h for h
-                                             in self._handlers[event_namespace]
-                                             if ((not isinstance(h[0], WeakMethodBound) and handler != h[0])
-                                             or (isinstance(h[0], WeakMethodBound)
-                                                and ((h[0].func is not handler.im_func) 
-                                                or (h[0].weak_object_ref() is not handler.im_self))))]
-        if not self._handlers[event_namespace]:
-            del self._handlers[event_namespace]
+        handler_list = self._handlers.get(event_namespace)
+        if handler_list is None:
+            return
+        def _matches(h):
+            if isinstance(h[0], WeakMethodBound):
+                return (h[0].func is getattr(handler, 'im_func', None) and
+                        h[0].weak_object_ref() is handler.im_self)
+            return handler == h[0]
+        removed = handler_list.remove_if(_matches)
+        for sort_key, h in removed:
+            if isinstance(h[0], WeakMethodBound):
+                record = self._owned_handlers.get(id(h[0].weak_object_ref()))
+                if record is not None:
+                    record[1].remove((event_namespace, sort_key))
+        self._forget_namespace(event_namespace)
 
     def _clear_namespace(self, namespace):
         """
@@ -314,9 +646,11 @@ class Scene(object):
         """
         if namespace.endswith(".*"):
             namespace = namespace[:-2]
-        ns = [n for n in self._namespaces if n.startswith(namespace)]
-        for namespace in ns:
-            del self._handlers[namespace]
+        self._remove_doomed_handlers()
+        for namespace in self._namespace_trie.descendants(namespace):
+            self._handlers.pop(namespace, None)
+            if self._namespace_trie.discard(namespace):
+                self._forget_resolved(namespace)
 
     def _clear_all_events(self):
         """
@@ -324,6 +658,9 @@ class Scene(object):
         dangerous function, and should almost never be used.
         """
         self._handlers.clear()
+        self._owned_handlers.clear()
+        self._doomed_handlers = {}
+        self._namespaces = ()
 
     def _get_event_source(self):
         """
@@ -361,6 +698,8 @@ class Scene(object):
         if 'layers' in properties:
             layers = properties.pop('layers')
             self._set_layers(layers)
+        if 'framebuffer' in properties:
+            self._set_framebuffer(properties.pop('framebuffer'))
         if len(properties) > 0:
             spyral.exceptions.unused_style_warning(self, properties.iterkeys())
 
@@ -440,10 +779,17 @@ class Scene(object):
 
     def _set_size(self, size):
         # This can only be called once.
-        rsize = self._surface.get_size()
+        rsize = self._display.get_size()
         self._size = size
         self._scale = (rsize[0] / size[0],
                        rsize[1] / size[1])
+        if self._framebuffer:
+            # The framebuffer is as big as the scene, so it has to be remade
+            self._resize_surface()
+            return
+        ssize = self._surface.get_size()
+        self._blit_scale = (ssize[0] / size[0],
+                            ssize[1] / size[1])
 
     def _get_width(self):
         """
@@ -464,6 +810,21 @@ class Scene(object):
         """
         return spyral.Rect((0,0), self.size)
 
+    def _get_culled(self):
+        """
+        The number of sprites that were skipped during the last frame because
+        they were off screen or inside of a hidden View. Read-only ``int``.
+        """
+        return self._last_culled
+
+    def _get_occluded(self):
+        """
+        The number of blits that were skipped during the last frame because
+        they were entirely hidden under an opaque, static blit on a higher
+        layer. Read-only ``int``.
+        """
+        return self._last_occluded
+
     def _get_scene(self):
         """
         Returns this scene. Read-only.
@@ -483,18 +844,19 @@ class Scene(object):
     scene = property(_get_scene)
     parent = property(_get_parent)
     rect = property(_get_rect)
+    culled = property(_get_culled)
+    occluded = property(_get_occluded)
 
     def _set_background(self, image):
         self._background_image = image
         self._background_version = image._version
         surface = image._surf
-        scene = spyral._get_executing_scene()
         if surface.get_size() != self.size:
             raise spyral.BackgroundSizeError("Background size must match "
                                              "the scene's size.")
         size = self._surface.get_size()
         self._background = pygame.transform.smoothscale(surface, size)
-        self._clear_this_frame.append(self._background.get_rect())
+        self._clear_this_frame.add(self._background.get_rect())
 
     def _get_background(self):
         """
@@ -507,6 +869,30 @@ class Scene(object):
 
     background = property(_get_background, _set_background)
 
+    def _get_framebuffer(self):
+        """
+        Whether this scene is drawn at its own (virtual) size, onto an
+        offscreen surface, instead of straight onto the window. When the
+        scene's size differs from the window's, every blit is normally
+        scaled to the window's resolution on its own; with a framebuffer,
+        blits are drawn unscaled and only the regions of the framebuffer that
+        changed are scaled onto the window, once per frame. This is faster
+        for scenes with many small sprites, and avoids seams between
+        neighbouring sprites, but scales with less smoothing. Defaults to
+        ``False``; can also be set in a style file.
+        """
+        return self._framebuffer
+
+    def _set_framebuffer(self, framebuffer):
+        framebuffer = bool(framebuffer)
+        if framebuffer == self._framebuffer:
+            return
+        self._framebuffer = framebuffer
+        if self._size is not None:
+            self._resize_surface()
+
+    framebuffer = property(_get_framebuffer, _set_framebuffer)
+
     def _register_sprite(self, sprite):
         """
         Internal method to add this sprite to the scene
@@ -528,38 +914,105 @@ class Scene(object):
             self._sprites.remove(sprite)
         if sprite in self._collision_boxes:
             del self._collision_boxes[sprite]
+            self._unindex(sprite)
+        self._collision_filters.pop(sprite, None)
+        self._pixel_colliders.discard(sprite)
+        self._previous_boxes.pop(sprite, None)
+        self._set_collision_group(sprite, None)
         for view in self._invalidating_views.keys():
             self._invalidating_views[view].discard(sprite)
         self._unregister_sprite_events(sprite)
 
+    def _register_drawable(self, drawable, view):
+        """
+        Internal method to add something other than a sprite that hands
+        static blits to this scene (e.g., a TileMap). Like a sprite's, its
+        `_expire_static` is called whenever `view` or a View above it changes,
+        and whenever the scene is rendered at a new scale.
+        """
+        self._drawables.add(drawable)
+        while view is not self:
+            self._invalidating_views.setdefault(view, set()).add(drawable)
+            view = view.parent
+
+    def _unregister_drawable(self, drawable):
+        """
+        Internal method to remove a drawable added with
+        `_register_drawable`, along with its event handlers.
+        """
+        self._drawables.discard(drawable)
+        for view in self._invalidating_views.keys():
+            self._invalidating_views[view].discard(drawable)
+        self._unregister_sprite_events(drawable)
+
     def _kill_view(self, view):
         """
         Remove all references to the view from within this Scene.
         """
+        self._remove_cached_view(view)
         if view in self._invalidating_views:
             del self._invalidating_views[view]
         if view in self._collision_boxes:
             del self._collision_boxes[view]
+            self._unindex(view)
+        self._collision_filters.pop(view, None)
+        self._set_collision_group(view, None)
+        self._previous_boxes.pop(view, None)
         self._layer_tree.remove_view(view)
 
+    def _add_cached_view(self, view):
+        """
+        Starts rendering the cached image of the view before every frame.
+        Deeper views are rendered first, so that their images are ready when
+        any cached view above them is rendered.
+        """
+        depth = 0
+        parent = view.parent
+        while parent is not self:
+            depth += 1
+            parent = parent.parent
+        self._cached_views.append((depth, view))
+        self._cached_views.sort(key=operator.itemgetter(0), reverse=True)
+
+    def _remove_cached_view(self, view):
+        """
+        Stops rendering the cached image of the view.
+        """
+        self._cached_views = [(depth, v) for depth, v in self._cached_views
+                                         if v is not view]
+
     def _blit(self, blit):
         """
         Apply any scaling associated with the Scene to the Blit, then finalize
         it. Note that Scene's don't apply cropping.
         """
-        blit.apply_scale(self._scale)
+        scale_x, scale_y = self._blit_scale
+        blit.transform(scale_x, scale_y, 0, 0)
         blit.finalize()
         self._blits.append(blit)
 
+    def _batch_blit(self, blit):
+        """
+        Adds the blits of a :class:`SpriteBatch <spyral.SpriteBatch>` to this
+        frame. They are already scaled and positioned by the batch.
+        """
+        self._blits.append(blit)
+
     def _static_blit(self, key, blit):
         """
         Identifies that this sprite will be statically blit from now, and
         applies scaling and finalization to the blit.
         """
-        blit.apply_scale(self._scale)
+        scale_x, scale_y = self._blit_scale
+        blit.transform(scale_x, scale_y, 0, 0)
         blit.finalize()
         self._static_blits[key] = blit
-        self._clear_this_frame.append(blit.rect)
+        self._clear_this_frame.add(blit.rect)
+
+    # Views hand their blits straight to the Scene once they have applied
+    # every transform above them
+    _add_blit = _blit
+    _add_static_blit = _static_blit
 
     def _invalidate_views(self, view):
         """
@@ -575,7 +1028,7 @@ class Scene(object):
         """
         try:
             x = self._static_blits.pop(key)
-            self._clear_this_frame.append(x.rect)
+            self._clear_this_frame.add(x.rect)
         except:
             pass
 
@@ -590,40 +1043,62 @@ class Scene(object):
         # For that reason, some . lookups are optimized away
         screen = self._surface
         
+        # Cached views redraw their images (and update their static blits)
+        # before anything is cleared
+        for _, view in self._cached_views:
+            view._render_cache()
+
         # First we test if the background has been updated
         if self._background_version != self._background_image._version:
             self._set_background(self._background_image)
 
+        # Everything to draw this frame is collected into a flat list of
+        # (surface, position, area, flags) and submitted at once at the end
+        draws = []
+        draw = draws.append
+
+        # Opaque blits hide whatever is underneath them. Blits that are
+        # entirely under an opaque static blit on a higher layer are skipped,
+        # and so is clearing the background under any opaque blit.
+        screen_rect = screen.get_rect()
+        occluders = [blit for blit in self._static_blits.opaque()
+                          if screen_rect.colliderect(blit.rect)]
+        occluder_rects = [blit.rect for blit in occluders]
+        opaque_rects = occluder_rects[:]
+        opaque_rects.extend([blit.rect for blit in self._blits
+                                       if blit.opaque])
+
         # Let's finish up any rendering from the previous frame
-        # First, we put the background over all blits
-        x = self._background.get_rect()
-        for i in self._clear_this_frame + self._soft_clear:
-            i = x.clip(i)
-            b = self._background.subsurface(i)
-            screen.blit(b, i)
+        # First, we put the background over all blits. The rect sets have
+        # already merged overlapping regions, so each pixel is cleared once.
+        background = self._background
+        for i in chain(self._clear_this_frame, self._soft_clear):
+            if not opaque_rects or not _covered(i, opaque_rects):
+                draw((background, i, i, 0))
 
         # Now, we need to blit layers, while simultaneously re-blitting
         # any static blits which were obscured
         static_blits = len(self._static_blits)
         dynamic_blits = len(self._blits)
-        blits = self._blits + list(self._static_blits.values())
-        blits.sort(key=operator.attrgetter('layer'))
+        # Static blits are already kept in layer order, so only the dynamic
+        # blits need sorting before they are merged in
+        blits = self._static_blits.merged(self._blits)
 
-        # Clear this is a list of things which need to be cleared
+        # Clear this is a set of things which need to be cleared
         # on this frame and marked dirty on the next
         clear_this = self._clear_this_frame
-        # Clear next is a list which will become clear_this on the next
+        # Clear next is a set which will become clear_this on the next
         # draw cycle. We use this for non-static blits to say to clear
         # That spot on the next frame
         clear_next = self._clear_next_frame
-        # Soft clear is a list of things which need to be cleared on
+        # Soft clear is a set of things which need to be cleared on
         # this frame, but unlike clear_this, they won't be cleared
         # on future frames. We use soft_clear to make things static
         # as they are drawn and then no longer cleared
         soft_clear = self._soft_clear
-        self._soft_clear = []
-        screen_rect = screen.get_rect()
+        self._soft_clear = _RectSet(self._rect)
         drawn_static = 0
+        occluded = 0
 
         blit_flags_available = pygame.version.vernum < (1, 8)
 
@@ -631,48 +1106,164 @@ class Scene(object):
             blit_rect = blit.rect
             blit_flags = blit.flags if blit_flags_available else 0
             # If a blit is entirely off screen, we can ignore it altogether
-            if not screen_rect.contains(blit_rect) and not screen_rect.colliderect(blit_rect):
+            if not screen_rect.colliderect(blit_rect):
                 continue
             if blit.static:
-                skip_soft_clear = False
-                for rect in clear_this:
-                    if blit_rect.colliderect(rect):
-                        screen.blit(blit.surface, blit_rect, None, blit_flags)
-                        skip_soft_clear = True
-                        clear_this.append(blit_rect)
-                        self._soft_clear.append(blit_rect)
-                        drawn_static += 1
-                        break
-                if skip_soft_clear:
+                # The background has already been drawn over clear_this and
+                # soft_clear, so the rects of static blits are added to them
+                # unmerged; a merged rect would make static blits in its
+                # wasted area look changed, and translucent ones would be
+                # drawn over themselves
+                if clear_this.collides(blit_rect):
+                    clear_this.add(blit_rect, False)
+                    self._soft_clear.add(blit_rect)
+                elif soft_clear.collides(blit_rect):
+                    soft_clear.add(blit_rect, False)
+                else:
                     continue
-                for rect in soft_clear:
-                    if blit_rect.colliderect(rect):
-                        screen.blit(blit.surface, blit_rect, None, blit_flags)
-                        soft_clear.append(blit.rect)
-                        drawn_static += 1
-                        break
+                drawn_static += 1
+            elif blit.draws is None:
+                clear_next.add(blit_rect)
+            else:
+                # A SpriteBatch's sprites on one layer
+                clear_next.extend(blit.rects)
+            # Blits hidden under an opaque static blit on a higher layer
+            # aren't drawn, but their areas are still marked as changed, so
+            # that whatever hides them is drawn over them again
+            if occluders and _occluded(blit, occluders, occluder_rects):
+                occluded += 1
+            elif blit.draws is None:
+                draw((blit.surface, blit_rect, None, blit_flags))
             else:
-                if screen_rect.contains(blit_rect):
-                    r = screen.blit(blit.surface, blit_rect, None, blit_flags)
-                    clear_next.append(r)
-                elif screen_rect.colliderect(blit_rect):
-                    # Todo: See if this is ever called. Shouldn't be.
-                    x = blit.rect.clip(screen_rect)
-                    y = x.move(-blit_rect.left, -blit_rect.top)
-                    b = blit.surface.subsurface(y)
-                    r = screen.blit(blit.surface, blit_rect, None, blit_flags)
-                    clear_next.append(r)
+                draws.extend(blit.draws)
+
+        if _BATCHED_BLITS:
+            screen.blits(draws, False)
+        else:
+            blit = screen.blit
+            for surface, position, area, flags in draws:
+                blit(surface, position, area, flags)
 
         #pygame.display.set_caption("%d / %d static, %d dynamic. %d ups, %d fps" %
         #                           (drawn_static, static_blits,
         #                            dynamic_blits, self.clock.ups,
         #                            self.clock.fps))
-        # Do the display update
-        pygame.display.update(self._clear_next_frame + self._clear_this_frame)
+        # Do the display update, pushing each changed region only once
+        updated = _RectSet(self._rect)
+        updated.extend(clear_next)
+        updated.extend(clear_this)
+        if updated.full:
+            updated = None
+        else:
+            updated = list(updated)
+        if screen is not self._display:
+            updated = self._present(updated)
+        if updated is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(updated)
         # Get ready for the next call
-        self._clear_this_frame = self._clear_next_frame
-        self._clear_next_frame = []
+        self._clear_this_frame = clear_next
+        self._clear_next_frame = _RectSet(self._rect)
+        spyral.util._release_blits(self._blits)
         self._blits = []
+        self._last_culled = self._culled
+        self._culled = 0
+        self._last_occluded = occluded
+
+    def _present(self, rects):
+        """
+        Scales the given regions of the offscreen surface up onto the display.
+
+        :param rects: The regions of the offscreen surface that changed, or
+                      ``None`` if all of it did.
+        :type rects: a list of pygame.Rect
+        :returns: The regions of the display that changed, or ``None``.
+        """
+        surface = self._surface
+        display = self._display
+        if rects is None:
+            pygame.transform.scale(surface, display.get_size(), display)
+            return None
+        width, height = display.get_size()
+        source_width, source_height = surface.get_size()
+        # Scaling without smoothing samples the same pattern of source pixels
+        # over and over, every step_x source pixels (span_x display pixels).
+        # Regions that start and end on that grid are sampled exactly like
+        # they would be by scaling the whole surface.
+        common_x = gcd(source_width, width)
+        common_y = gcd(source_height, height)
+        step_x, span_x = source_width // common_x, width // common_x
+        step_y, span_y = source_height // common_y, height // common_y
+        scale = pygame.transform.scale
+        presented = []
+        for rect in rects:
+            left = rect.x // step_x
+            top = rect.y // step_y
+            right = -(-rect.right // step_x)
+            bottom = -(-rect.bottom // step_y)
+            source = pygame.Rect(left * step_x, top * step_y,
+                                 (right - left) * step_x,
+                                 (bottom - top) * step_y)
+            target = pygame.Rect(left * span_x, top * span_y,
+                                 (right - left) * span_x,
+                                 (bottom - top) * span_y)
+            scale(surface.subsurface(source), target.size,
+                  display.subsurface(target))
+            presented.append(target)
+        return presented
+
+    def _set_render_scale(self, factor):
+        """
+        Changes the resolution that this scene is rendered at. With a `factor`
+        of 1, blits are drawn straight onto the display (or onto the
+        framebuffer); otherwise, they are drawn onto an offscreen surface
+        `factor` times the size of the display (or of the framebuffer), whose
+        changed regions are then scaled up onto the display.
+
+        :param float factor: The render scale.
+        """
+        if factor == self._render_scale:
+            return
+        self._render_scale = factor
+        self._resize_surface()
+
+    def _resize_surface(self):
+        """
+        Remakes the surface that blits are drawn onto, for the current render
+        scale and framebuffer mode, and redraws everything onto it.
+        """
+        display = self._display
+        factor = self._render_scale
+        if self._framebuffer and self._size is not None:
+            width, height = self._size
+        else:
+            width, height = display.get_size()
+        size = (max(1, int(width * factor)), max(1, int(height * factor)))
+        if size == display.get_size():
+            self._surface = display
+        else:
+            self._surface = pygame.Surface(size, 0, display)
+        self._rect = self._surface.get_rect()
+        if self._size is not None:
+            self._blit_scale = (size[0] / self._size[0],
+                                size[1] / self._size[1])
+        self._clear_this_frame = _RectSet(self._rect)
+        self._clear_next_frame = _RectSet(self._rect)
+        self._soft_clear = _RectSet(self._rect)
+        background = getattr(self, '_background_image', None)
+        if background is not None:
+            self._set_background(background)
+        else:
+            self._background = spyral.image._new_spyral_surface(
+                                                    self._surface.get_size())
+            self._background.fill((255, 255, 255))
+        # Everything that was drawn at the old scale has to be drawn again
+        for drawable in chain(self._sprites, self._drawables):
+            drawable._expire_static()
+        for _, view in self._cached_views:
+            view._cache_dirty = True
+        self.redraw()
 
     def redraw(self):
         """
@@ -681,7 +1272,7 @@ class Scene(object):
         This is particularly useful for Sugar, which loves to put artifacts over
         our window.
         """
-        self._clear_this_frame.append(pygame.Rect(self._rect))
+        self._clear_this_frame.add(self._rect)
 
     def _get_layer_position(self, view, layer):
         """
@@ -746,6 +1337,22 @@ class Scene(object):
         """
         pass
 
+    def _get_transform(self):
+        """
+        Returns the ((scale_x, scale_y), (offset_x, offset_y)) pair that takes
+        positions in this Scene to positions in the scene; that is, no change.
+        """
+        return (1.0, 1.0), (0.0, 0.0)
+
+    def _get_chain(self):
+        """
+        Returns the chain of transforms from this Scene to itself, which
+        changes nothing; Views compose their own chains onto it.
+        """
+        return self._chain
+
+    _get_blit_chain = _get_chain
+
     def _warp_collision_box(self, box):
         """
         Finalize the collision box. Don't apply scaling, because that's only
@@ -757,9 +1364,236 @@ class Scene(object):
     def _set_collision_box(self, entity, box):
         """
         Registers the given entity (a View or Sprite) with the given
-        CollisionBox.
-        """
+        CollisionBox. The box that the entity had at the start of the update
+        is remembered for swept collisions.
+        """
+        start = self._previous_boxes.get(entity)
+        if start is None:
+            start = self._collision_boxes.get(entity, box)
+            self._previous_boxes[entity] = start
+        # The farthest any entity has moved this update bounds how far away
+        # a swept collision can be found
+        max_x, max_y = self._max_move
+        self._max_move = (max(max_x, abs(box.x - start.x)),
+                          max(max_y, abs(box.y - start.y)))
         self._collision_boxes[entity] = box
+        self._index(entity, box)
+
+    def _index(self, entity, box):
+        """
+        Puts the entity's box into the collision index for its category.
+        Entities without a category never collide, so they aren't indexed.
+        """
+        category = self._collision_filters.get(entity, _DEFAULT_FILTER)[0]
+        if not category:
+            return
+        index = self._collision_indexes.get(category)
+        if index is None:
+            index = self._collision_indexes[category] = _SpatialHash()
+        index.insert(entity, box)
+
+    def _unindex(self, entity):
+        """
+        Removes the entity from the collision index for its category.
+        """
+        category = self._collision_filters.get(entity, _DEFAULT_FILTER)[0]
+        index = self._collision_indexes.get(category)
+        if index is not None:
+            index.remove(entity)
+            if not index:
+                del self._collision_indexes[category]
+
+    def _indexes(self, mask):
+        """
+        Returns the collision indexes of the categories in the `mask`.
+        """
+        return [index for category, index
+                in self._collision_indexes.iteritems() if category & mask]
+
+    def _set_collision_filter(self, entity, category, mask):
+        """
+        Sets the category bits and mask bits of an entity (a View or Sprite).
+        Two entities can only collide if each one's category is in the
+        other's mask.
+        """
+        box = self._collision_boxes.get(entity)
+        if box is not None:
+            self._unindex(entity)
+        if (category, mask) == _DEFAULT_FILTER:
+            self._collision_filters.pop(entity, None)
+        else:
+            self._collision_filters[entity] = (category, mask)
+        if box is not None:
+            self._index(entity, box)
+
+    def _can_collide(self, first, second):
+        """
+        Returns whether the categories and masks of two entities allow them
+        to collide.
+        """
+        filters = self._collision_filters
+        first_category, first_mask = filters.get(first, _DEFAULT_FILTER)
+        second_category, second_mask = filters.get(second, _DEFAULT_FILTER)
+        return bool(first_category & second_mask and
+                    second_category & first_mask)
+
+    def _forget_previous_boxes(self):
+        """
+        Starts a new update, in which entities move from their current boxes.
+        """
+        self._previous_boxes.clear()
+        self._max_move = (0, 0)
+
+    def _set_pixel_collision(self, entity, pixel):
+        """
+        Sets whether collisions with the entity (a Sprite) are pixel-perfect,
+        in which case its boxes only collide where its bitmask has pixels.
+        """
+        if pixel:
+            self._pixel_colliders.add(entity)
+        else:
+            self._pixel_colliders.discard(entity)
+
+    def _set_collision_group(self, entity, group):
+        """
+        Moves the entity (a View or Sprite) into the named collision group,
+        or out of every group if `group` is ``None``.
+        """
+        for members in self._collision_groups.itervalues():
+            members.discard(entity)
+        if group is not None:
+            self._collision_groups.setdefault(group, set()).add(entity)
+
+    def add_collision_group(self, group_a, group_b=None, swept=False):
+        """
+        Starts detecting collisions between the sprites and views of two
+        collision groups (see the ``collision_group`` of a
+        :class:`Sprite <spyral.Sprite>` or :class:`View <spyral.View>`), or
+        within a single group if `group_b` is not given. Once every update,
+        after ``director.update``, the contacts between the groups are found
+        all at once, and the following events are sent with the pair as
+        `first` and `second`:
+
+        * ``collision.<group_a>.<group_b>.enter`` when they start colliding,
+        * ``collision.<group_a>.<group_b>.stay`` while they keep colliding,
+        * ``collision.<group_a>.<group_b>.exit`` when they stop colliding (or
+          one of them is killed).
+
+        The `first` of each pair is from `group_a`.
+
+        :param str group_a: The name of a collision group.
+        :param str group_b: The name of another collision group.
+        :param bool swept: Whether to also find the pairs that collided
+                           partway through their moves during the update;
+                           see :func:`collision_pairs`.
+        """
+        if group_b is None:
+            group_b = group_a
+        if swept:
+            self._swept_groups.add((group_a, group_b))
+        else:
+            self._swept_groups.discard((group_a, group_b))
+        if (group_a, group_b) in self._group_pairs:
+            return
+        if not self._group_pairs:
+            spyral.event.register('director.post_update',
+                                  self._update_contacts, scene=self)
+        self._group_pairs.append((group_a, group_b))
+        self._contacts[(group_a, group_b)] = set()
+
+    def remove_collision_group(self, group_a, group_b=None):
+        """
+        Stops detecting collisions between two collision groups, which were
+        added with :func:`add_collision_group`. No more events are sent for
+        their contacts, not even ``exit`` events.
+
+        :param str group_a: The name of a collision group.
+        :param str group_b: The name of another collision group.
+        """
+        if group_b is None:
+            group_b = group_a
+        if (group_a, group_b) not in self._group_pairs:
+            return
+        self._group_pairs.remove((group_a, group_b))
+        self._swept_groups.discard((group_a, group_b))
+        del self._contacts[(group_a, group_b)]
+        if not self._group_pairs:
+            self._unregister('director.post_update', self._update_contacts)
+
+    def _update_contacts(self):
+        """
+        Finds the contacts between every pair of collision groups, and sends
+        the events for the ones that started, continued or ended.
+        """
+        groups = self._collision_groups
+        for pair in list(self._group_pairs):
+            if pair not in self._contacts:
+                continue
+            group_a, group_b = pair
+            members = groups.get(group_a, ())
+            swept = pair in self._swept_groups
+            if group_a == group_b:
+                # The order of a pair within a group is arbitrary, so it is
+                # fixed to recognize the pair on later updates
+                contacts = set((a, b) if id(a) < id(b) else (b, a)
+                               for a, b in self.collision_pairs(members,
+                                                                swept=swept))
+            else:
+                contacts = set(self.collision_pairs(members,
+                                                    groups.get(group_b, ()),
+                                                    swept))
+            previous = self._contacts[pair]
+            self._contacts[pair] = contacts
+            namespace = "collision.%s.%s." % pair
+            for suffix, found in (("exit", previous - contacts),
+                                  ("enter", contacts - previous),
+                                  ("stay", contacts & previous)):
+                for first, second in found:
+                    self._handle_event(namespace + suffix,
+                                       spyral.Event(first=first,
+                                                    second=second))
+
+    def _touches_pixels(self, entity, box, rect):
+        """
+        Returns whether any of the pixels of a pixel-perfect entity, whose
+        collision box is `box`, are inside of the `rect`. The box and the rect
+        must already collide.
+        """
+        left = max(box.x, rect.x)
+        top = max(box.y, rect.y)
+        width = min(box.x + box.w, rect.x + rect.w) - left
+        height = min(box.y + box.h, rect.y + rect.h) - top
+        bitmask = entity._get_bitmask((box.w, box.h))
+        solid = pygame.mask.Mask((width, height))
+        solid.fill()
+        return bitmask.overlap(solid, (left - box.x, top - box.y)) is not None
+
+    def _collide_pixels(self, first, first_box, second, second_box):
+        """
+        Returns whether two entities whose collision boxes collide are really
+        colliding, once any pixel-perfect entities are accounted for.
+        """
+        pixels = self._pixel_colliders
+        if first in pixels:
+            if second not in pixels:
+                return self._touches_pixels(first, first_box, second_box)
+            first_mask = first._get_bitmask((first_box.w, first_box.h))
+            second_mask = second._get_bitmask((second_box.w, second_box.h))
+            offset = (second_box.x - first_box.x, second_box.y - first_box.y)
+            return first_mask.overlap(second_mask, offset) is not None
+        if second in pixels:
+            return self._touches_pixels(second, second_box, first_box)
+        return True
+
+    def _contains_pixel(self, entity, box, x, y):
+        """
+        Returns whether the point, which must be inside of the entity's
+        collision box, is on one of its pixels.
+        """
+        if entity not in self._pixel_colliders:
+            return True
+        bitmask = entity._get_bitmask((box.w, box.h))
+        return bool(bitmask.get_at((int(x - box.x), int(y - box.y))))
 
     def collide_sprites(self, first, second):
         """
@@ -775,9 +1609,12 @@ class Scene(object):
         """
         if first not in self._collision_boxes or second not in self._collision_boxes:
             return False
+        if not self._can_collide(first, second):
+            return False
         first_box = self._collision_boxes[first]
         second_box = self._collision_boxes[second]
-        return first_box.collide_rect(second_box)
+        return (first_box.collide_rect(second_box) and
+                self._collide_pixels(first, first_box, second, second_box))
 
     def collide_point(self, sprite, point):
         """
@@ -792,7 +1629,8 @@ class Scene(object):
         if sprite not in self._collision_boxes:
             return False
         sprite_box = self._collision_boxes[sprite]
-        return sprite_box.collide_point(point)
+        return (sprite_box.collide_point(point) and
+                self._contains_pixel(sprite, sprite_box, point[0], point[1]))
 
     def collide_rect(self, sprite, rect):
         """
@@ -807,4 +1645,291 @@ class Scene(object):
         if sprite not in self._collision_boxes:
             return False
         sprite_box = self._collision_boxes[sprite]
-        return sprite_box.collide_rect(rect)
+        if not sprite_box.collide_rect(rect):
+            return False
+        if sprite in self._pixel_colliders:
+            return self._touches_pixels(sprite, sprite_box, spyral.Rect(rect))
+        return True
+
+    def sprites_in_rect(self, rect, mask=None):
+        """
+        Returns every sprite (or view) whose collision box overlaps the rect.
+        Boxes that only share an edge with the rect do not overlap it.
+
+        :param rect: A rect
+        :type rect: :class:`Rect <spyral.Rect>`
+        :param int mask: The categories to look in (see the ``mask_bits`` of
+                         a :class:`Sprite <spyral.Sprite>`). Defaults to every
+                         category.
+        :returns: A ``list`` of sprites and views, in no particular order.
+        """
+        rect = spyral.Rect(rect)
+        found = set()
+        for index in self._indexes(_DEFAULT_FILTER[1] if mask is None
+                                   else mask):
+            found.update(index.query(rect))
+        pixels = self._pixel_colliders
+        boxes = self._collision_boxes
+        return [entity for entity in found
+                if entity not in pixels or
+                   self._touches_pixels(entity, boxes[entity], rect)]
+
+    def sprites_at(self, point, mask=None):
+        """
+        Returns every sprite (or view) that is colliding with the point, in
+        the same way as :func:`collide_point`.
+
+        :param point: A point
+        :type point: :class:`Vec2D <spyral.Vec2D>`
+        :param int mask: The categories to look in. Defaults to every
+                         category.
+        :returns: A ``list`` of sprites and views, in no particular order.
+        """
+        x, y = point[0], point[1]
+        # The pixel that the point is in, rounding down even for negative
+        # points (a spyral.Rect would round those towards 0 instead)
+        area = pygame.Rect(int(math.floor(x)), int(math.floor(y)), 1, 1)
+        boxes = self._collision_boxes
+        found = []
+        for index in self._indexes(_DEFAULT_FILTER[1] if mask is None
+                                   else mask):
+            for entity in index.candidates(area):
+                box = boxes[entity]
+                if (box.collide_point((x, y)) and
+                        self._contains_pixel(entity, box, x, y)):
+                    found.append(entity)
+        return found
+
+    def collision_pairs(self, group_a, group_b=None, swept=False):
+        """
+        Returns every pair of a sprite from `group_a` and a sprite from
+        `group_b` that are colliding, in the same way as
+        :func:`collide_sprites`. This is much faster than testing each pair,
+        because only sprites that are near each other are compared. If
+        `group_b` is not given, the sprites of `group_a` are tested against
+        each other, and each pair is only returned once. Sprites are only
+        compared with the categories in their ``mask_bits``, so pairs whose
+        categories don't collide are skipped without looking at them.
+
+        Sprites that move quickly can pass through each other between
+        updates. If `swept` is ``True``, pairs whose boxes collided at any
+        point while moving in a straight line from where they were at the
+        start of the update are also returned (see :func:`sweep_sprites`).
+        Swept pairs only use the collision boxes, so pixel-perfect sprites
+        are found by their boxes alone.
+
+        :param group_a: Some sprites or views
+        :type group_a: an iterable of :class:`Sprite <spyral.Sprite>` or
+                       :class:`View <spyral.View>`
+        :param group_b: Some other sprites or views
+        :type group_b: an iterable of :class:`Sprite <spyral.Sprite>` or
+                       :class:`View <spyral.View>`
+        :param bool swept: Whether to test the moves of the sprites, instead
+                           of only where they are now.
+        :returns: A ``list`` of (`a`, `b`) tuples.
+        """
+        if swept:
+            return self._swept_pairs(group_a, group_b)
+        boxes = self._collision_boxes
+        filters = self._collision_filters
+        pixels = self._pixel_colliders
+        if group_b is None:
+            group_a = list(group_a)
+            members = set(group_a)
+        else:
+            members = set(group_b)
+        tested = set()
+        pairs = []
+        for a in group_a:
+            box = boxes.get(a)
+            if box is None:
+                continue
+            category, mask = filters.get(a, _DEFAULT_FILTER)
+            if not category:
+                continue
+            indexes = self._indexes(mask)
+            if len(indexes) == 1:
+                found = indexes[0].query(box)
+            else:
+                found = set()
+                for index in indexes:
+                    found.update(index.query(box))
+            for b in found:
+                if b is a or b not in members or b in tested:
+                    continue
+                if not filters.get(b, _DEFAULT_FILTER)[1] & category:
+                    continue
+                if ((a in pixels or b in pixels) and
+                        not self._collide_pixels(a, box, b, boxes[b])):
+                    continue
+                pairs.append((a, b))
+            if group_b is None:
+                tested.add(a)
+        return pairs
+
+    def _swept_pairs(self, group_a, group_b):
+        """
+        Finds the pairs for :func:`collision_pairs` when `swept` is ``True``.
+        No sprite has moved farther than `_max_move` this update, so every
+        sprite that a sprite of `group_a` could have met is in the collision
+        indexes, within that distance of the area that it moved through.
+        """
+        boxes = self._collision_boxes
+        filters = self._collision_filters
+        previous = self._previous_boxes
+        if group_b is None:
+            group_a = list(group_a)
+            members = set(group_a)
+        else:
+            members = set(group_b)
+        reach_x, reach_y = self._max_move
+        tested = set()
+        pairs = []
+        for a in group_a:
+            box = boxes.get(a)
+            if box is None:
+                continue
+            category, mask = filters.get(a, _DEFAULT_FILTER)
+            if not category:
+                continue
+            start = previous.get(a, box)
+            area = _swept_area(start, box).inflate(2 * reach_x, 2 * reach_y)
+            found = set()
+            for index in self._indexes(mask):
+                found.update(index.query(area))
+            for b in found:
+                if b is a or b not in members or b in tested:
+                    continue
+                if not filters.get(b, _DEFAULT_FILTER)[1] & category:
+                    continue
+                b_box = boxes[b]
+                if _sweep(start, box, previous.get(b, b_box), b_box) is None:
+                    continue
+                pairs.append((a, b))
+            if group_b is None:
+                tested.add(a)
+        return pairs
+
+    def sweep_sprites(self, first, second):
+        """
+        Returns whether the first sprite collided with the second at any
+        point during the current update, assuming that each moved in a
+        straight line from where it was at the start of the update. Unlike
+        :func:`collide_sprites`, this also catches sprites that moved so fast
+        that they passed through each other. Only the collision boxes are
+        used, even for pixel-perfect sprites.
+
+        :param first: A sprite or view
+        :type first: :class:`Sprite <spyral.Sprite>` or a
+                     :class:`View <spyral.View>`
+        :param second: Another sprite or view
+        :type second: :class:`Sprite <spyral.Sprite>` or a
+                      :class:`View <spyral.View>`
+        :returns: The fraction of the move, from 0 to 1, at which they first
+                  collided, or ``None`` if they didn't.
+        """
+        boxes = self._collision_boxes
+        if first not in boxes or second not in boxes:
+            return None
+        if not self._can_collide(first, second):
+            return None
+        previous = self._previous_boxes
+        first_box = boxes[first]
+        second_box = boxes[second]
+        return _sweep(previous.get(first, first_box), first_box,
+                      previous.get(second, second_box), second_box)
+
+    def _first_pixel(self, entity, box, x, y, dx, dy, entry, exit):
+        """
+        Walks along the part of a segment that is inside of a pixel-perfect
+        entity's box, and returns how far along the segment the first of the
+        entity's pixels is, or ``None``.
+        """
+        bitmask = entity._get_bitmask((box.w, box.h))
+        entry = max(entry, 0)
+        exit = min(exit, 1)
+        steps = int(math.ceil((exit - entry) * math.hypot(dx, dy))) + 1
+        for step in xrange(steps + 1):
+            t = entry + (exit - entry) * step / steps
+            px = int(x + dx * t - box.x)
+            py = int(y + dy * t - box.y)
+            if (0 <= px < box.w and 0 <= py < box.h and
+                    bitmask.get_at((px, py))):
+                return t
+        return None
+
+    def segment_query(self, start, end, mask=None):
+        """
+        Returns every sprite (or view) that the line segment from `start` to
+        `end` passes through, nearest first. Only the cells of the collision
+        index that the segment crosses are searched.
+
+        :param start: Where the segment starts.
+        :type start: :class:`Vec2D <spyral.Vec2D>`
+        :param end: Where the segment ends.
+        :type end: :class:`Vec2D <spyral.Vec2D>`
+        :param int mask: The categories to look in. Defaults to every
+                         category.
+        :returns: A ``list`` of (`entity`, `distance`, `point`) tuples, where
+                  `point` (a :class:`Vec2D <spyral.Vec2D>`) is where the
+                  segment first touches the `entity`, `distance` away from
+                  `start`.
+        """
+        x, y = start[0], start[1]
+        dx, dy = end[0] - x, end[1] - y
+        length = math.hypot(dx, dy)
+        boxes = self._collision_boxes
+        pixels = self._pixel_colliders
+        found = set()
+        for index in self._indexes(_DEFAULT_FILTER[1] if mask is None
+                                   else mask):
+            found.update(index.along(x, y, end[0], end[1]))
+        hits = []
+        for entity in found:
+            box = boxes[entity]
+            times = _sweep_boxes(x, y, 0, 0, dx, dy, box)
+            if times is None:
+                continue
+            entry, exit = times
+            if entity in pixels:
+                t = self._first_pixel(entity, box, x, y, dx, dy, entry, exit)
+                if t is None:
+                    continue
+            else:
+                t = max(entry, 0)
+            hits.append((t * length, entity,
+                         spyral.Vec2D(x + dx * t, y + dy * t)))
+        hits.sort(key=operator.itemgetter(0))
+        return [(entity, distance, point) for distance, entity, point in hits]
+
+    def raycast(self, origin, direction, max_dist=None, mask=None):
+        """
+        Returns every sprite (or view) that a ray from `origin` passes
+        through, nearest first, like :func:`segment_query`. Like the other
+        collision queries, this uses the collision boxes, so scaled and
+        rotated sprites are hit anywhere in the box around their transformed
+        image. Pixel-perfect sprites are only hit where they have pixels;
+        unlike rays, swept collisions (see :func:`sweep_sprites`) only use
+        the boxes.
+
+        :param origin: Where the ray starts.
+        :type origin: :class:`Vec2D <spyral.Vec2D>`
+        :param direction: The direction of the ray; it does not need to be
+                          normalized.
+        :type direction: :class:`Vec2D <spyral.Vec2D>`
+        :param float max_dist: How far the ray goes. Defaults to the length
+                               of the scene's diagonal, which crosses the
+                               whole scene from anywhere inside of it.
+        :param int mask: The categories to look in. Defaults to every
+                         category.
+        :returns: A ``list`` of (`entity`, `distance`, `point`) tuples.
+        """
+        length = math.hypot(direction[0], direction[1])
+        if length == 0:
+            raise ValueError("A ray needs a direction")
+        if max_dist is None:
+            max_dist = math.hypot(self._size[0], self._size[1])
+        scale = max_dist / length
+        end = (origin[0] + direction[0] * scale,
+               origin[1] + direction[1] * scale)
+        return self.segment_query(origin, end, mask)
@@ -0,0 +1,202 @@
+"""
+The SpatialHash class is a uniform grid for answering "what is near this
+rect?" quickly. Every rect is stored in each cell of the grid that it touches,
+so a query only has to look at the few rects that share a cell with it instead
+of at every rect.
+
+Rects can be anything with ``x``, ``y``, ``w`` and ``h`` attributes (e.g., a
+pygame.Rect or a :class:`Rect <spyral.Rect>`); they are copied when they are
+inserted, so changing them afterwards has no effect until they are updated.
+"""
+
+from collections import defaultdict
+
+class _SpatialHash(object):
+    """
+    A uniform grid that maps keys to rects.
+
+    :param int cell_size: The width and height of each cell of the grid.
+                          Defaults to CELL_SIZE.
+    """
+    #: The default width and height of a cell, in pixels.
+    CELL_SIZE = 64
+    def __init__(self, cell_size=None):
+        self.cell_size = self.CELL_SIZE if cell_size is None else cell_size
+        self._cells = defaultdict(set)
+        self._rects = {}
+
+    def _span(self, x, y, w, h):
+        """
+        Returns the (left, top, right, bottom) columns and rows of the cells
+        touched by the given area.
+        """
+        size = self.cell_size
+        return (int(x // size), int(y // size),
+                int((x + max(w, 1) - 1) // size),
+                int((y + max(h, 1) - 1) // size))
+
+    def _cells_for(self, x, y, w, h):
+        """
+        Returns a list of the (column, row) cells touched by the given area.
+        """
+        left, top, right, bottom = self._span(x, y, w, h)
+        return [(column, row) for column in xrange(left, right + 1)
+                              for row in xrange(top, bottom + 1)]
+
+    def insert(self, key, rect):
+        """
+        Starts keeping track of `key` at the given `rect`. If the key is
+        already in the grid, it is moved.
+
+        :param key: Any hashable object.
+        :param rect: The area that the key covers.
+        :type rect: pygame.Rect or :class:`Rect <spyral.Rect>`
+        """
+        area = (rect.x, rect.y, rect.w, rect.h)
+        old = self._rects.get(key)
+        if old is not None:
+            # Small moves usually stay within the same cells
+            if self._span(*old) == self._span(*area):
+                self._rects[key] = area
+                return
+            self.remove(key)
+        self._rects[key] = area
+        cells = self._cells
+        for cell in self._cells_for(*area):
+            cells[cell].add(key)
+
+    def remove(self, key):
+        """
+        Stops keeping track of `key`, if it is in the grid.
+
+        :param key: A key that was previously inserted.
+        """
+        area = self._rects.pop(key, None)
+        if area is None:
+            return
+        cells = self._cells
+        for cell in self._cells_for(*area):
+            bucket = cells[cell]
+            bucket.discard(key)
+            if not bucket:
+                del cells[cell]
+
+    def clear(self):
+        """
+        Removes every key from the grid.
+        """
+        self._cells.clear()
+        self._rects.clear()
+
+    def get(self, key):
+        """
+        Returns the (x, y, w, h) area stored for `key`, or ``None``.
+        """
+        return self._rects.get(key)
+
+    def candidates(self, rect):
+        """
+        Returns a set of the keys that share a cell with `rect`. These may not
+        actually overlap the `rect`.
+
+        :param rect: The area to look around.
+        :type rect: pygame.Rect or :class:`Rect <spyral.Rect>`
+        """
+        cells = self._cells
+        found = set()
+        for cell in self._cells_for(rect.x, rect.y, rect.w, rect.h):
+            if cell in cells:
+                found.update(cells[cell])
+        return found
+
+    def query(self, rect):
+        """
+        Returns a set of the keys whose rects overlap `rect`. Rects that only
+        share an edge do not overlap.
+
+        :param rect: The area to test.
+        :type rect: pygame.Rect or :class:`Rect <spyral.Rect>`
+        """
+        x, y = rect.x, rect.y
+        right, bottom = x + rect.w, y + rect.h
+        rects = self._rects
+        found = set()
+        for key in self.candidates(rect):
+            ox, oy, ow, oh = rects[key]
+            if ox < right and x < ox + ow and oy < bottom and y < oy + oh:
+                found.add(key)
+        return found
+
+    def collides(self, rect):
+        """
+        Returns whether any key's rect overlaps `rect`. This is faster than
+        checking whether :func:`query` is empty.
+
+        :param rect: The area to test.
+        :type rect: pygame.Rect or :class:`Rect <spyral.Rect>`
+        :returns: A ``bool``
+        """
+        x, y = rect.x, rect.y
+        right, bottom = x + rect.w, y + rect.h
+        if right <= x or bottom <= y:
+            return False
+        cells = self._cells
+        rects = self._rects
+        for cell in self._cells_for(x, y, rect.w, rect.h):
+            if cell not in cells:
+                continue
+            for key in cells[cell]:
+                ox, oy, ow, oh = rects[key]
+                if ox < right and x < ox + ow and oy < bottom and y < oy + oh:
+                    return True
+        return False
+
+    def along(self, x0, y0, x1, y1):
+        """
+        Returns a set of the keys that share a cell with the line segment
+        from (x0, y0) to (x1, y1). The cells are visited in order along the
+        segment, so a long segment only looks at the cells that it crosses.
+
+        :returns: A ``set`` of keys.
+        """
+        size = float(self.cell_size)
+        column, row = int(x0 // size), int(y0 // size)
+        last_column, last_row = int(x1 // size), int(y1 // size)
+        dx, dy = x1 - x0, y1 - y0
+        step_column = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        # How far along the segment the next column and row are, and how far
+        # it is between columns and between rows
+        if dx:
+            next_column = ((column + (dx > 0)) * size - x0) / dx
+            column_gap = size / abs(dx)
+        else:
+            next_column = column_gap = float('inf')
+        if dy:
+            next_row = ((row + (dy > 0)) * size - y0) / dy
+            row_gap = size / abs(dy)
+        else:
+            next_row = row_gap = float('inf')
+        cells = self._cells
+        found = set()
+        while True:
+            if (column, row) in cells:
+                found.update(cells[(column, row)])
+            if ((column == last_column and row == last_row) or
+                    min(next_column, next_row) > 1):
+                return found
+            if next_column < next_row:
+                column += step_column
+                next_column += column_gap
+            else:
+                row += step_row
+                next_row += row_gap
+
+    def __contains__(self, key):
+        return key in self._rects
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __iter__(self):
+        return iter(self._rects)
@@ -6,6 +6,12 @@ import math
 
 _all_sprites = []
 
+#: The cache of flipped, scaled and rotated images that is shared by all
+#: sprites. Its ``max_bytes`` (the memory budget, in bytes) and ``angle_step``
+#: (the angle quantization, in degrees; 0, the default, for exact angles) can
+#: be changed at any time.
+transform_cache = spyral.memoize._TransformCache()
+
 def _switch_scene():
     """
     Ensure that dead sprites are removed from the list and that sprites are
@@ -40,7 +46,8 @@ class Sprite(object):
             setattr(self, 'image', image)
         simple = ['pos', 'x', 'y', 'position', 'anchor', 'layer', 'visible',
                   'scale', 'scale_x', 'scale_y', 'flip_x', 'flip_y', 'angle',
-                  'mask']
+                  'mask', 'collision', 'collision_group', 'category_bits',
+                  'mask_bits']
         for property in simple:
             if property in properties:
                 value = properties.pop(property)
@@ -70,11 +77,18 @@ class Sprite(object):
         self._crop = None
         self._transform_image = None
         self._transform_offset = spyral.Vec2D(0, 0)
+        self._opaque = False
         self._flip_x = False
         self._flip_y = False
         self._animations = []
         self._progress = {}
         self._mask = None
+        self._collision = 'box'
+        self._collision_group = None
+        self._category_bits = 1
+        self._mask_bits = ~0
+        self._bitmask = None
+        self._scaled_bitmask = None
 
         parent._add_child(self)
 
@@ -100,7 +114,7 @@ class Sprite(object):
         # Expire static is part of the private API which must
         # be implemented by Sprites that wish to be static.
         if self._static:
-            self._scene()._remove_static_blit(self)
+            self._parent()._remove_static_blit(self)
         self._static = False
         self._age = 0
         self._set_collision_box()
@@ -119,38 +133,37 @@ class Sprite(object):
 
         self._offset = spyral.Vec2D(offset) - self._transform_offset
 
+    def _is_collapsed(self):
+        """
+        Returns whether this sprite is scaled down to nothing, in which case
+        its image is replaced by a single transparent pixel.
+        """
+        if self._scale == (1.0, 1.0):
+            return False
+        new_size = self._scale * self._image.size
+        return 0 in (int(new_size[0]), int(new_size[1]))
+
     def _recalculate_transforms(self):
         """
         Calculates the transforms that need to be applied to this sprite's
-        image. In order: flipping, scaling, and rotation.
-        """
-        source = self._image._surf
-
-        # flip
-        if self._flip_x or self._flip_y:
-            source = pygame.transform.flip(source, self._flip_x, self._flip_y)
-
-        # scale
-        if self._scale != (1.0, 1.0):
-            new_size = self._scale * self._image.size
-            new_size = (int(new_size[0]), int(new_size[1]))
-            if 0 in new_size:
-                self._transform_image = spyral.image._new_spyral_surface((1,1))
-                self._recalculate_offset()
-                self._expire_static()
-                return
-            new_surf = spyral.image._new_spyral_surface(new_size)
-            source = pygame.transform.smoothscale(source, new_size, new_surf)
-
-        # rotate
-        if self._angle != 0:
-            angle = 180.0 / math.pi * self._angle % 360
-            old = spyral.Vec2D(source.get_rect().center)
-            source = pygame.transform.rotate(source, angle).convert_alpha()
-            new = source.get_rect().center
-            self._transform_offset = old - new
-
-        self._transform_image = source
+        image. In order: flipping, scaling, and rotation. The results are
+        shared with other sprites through the :data:`transform_cache`.
+        """
+        self._bitmask = self._scaled_bitmask = None
+        if self._is_collapsed():
+            self._transform_image = spyral.image._new_spyral_surface((1,1))
+            self._opaque = False
+            self._recalculate_offset()
+            self._expire_static()
+            return
+
+        surface, offset = transform_cache.transform(self._image,
+                                                    self._flip_x, self._flip_y,
+                                                    self._scale, self._angle)
+        self._transform_image = surface
+        self._transform_offset = offset
+        # Rotating leaves transparent corners, but flipping and scaling don't
+        self._opaque = not self._angle and self._image.opaque
         self._recalculate_offset()
         self._expire_static()
 
@@ -438,8 +451,66 @@ class Sprite(object):
 
     def _set_mask(self, mask):
         self._mask = mask
+        self._bitmask = self._scaled_bitmask = None
         self._set_collision_box()
 
+    def _get_collision(self):
+        """
+        How collisions with this sprite are detected. With ``'box'`` (the
+        default), the sprite collides wherever its collision box (its image's
+        rect, or its `mask`) does. With ``'pixel'``, it only collides where
+        its image is not fully transparent, within that box. Pixel-perfect
+        collisions are slower, but they are only checked once the boxes
+        collide.
+        """
+        return self._collision
+
+    def _set_collision(self, collision):
+        if collision not in ('box', 'pixel'):
+            raise ValueError("Sprite collision must be 'box' or 'pixel', "
+                             "not %r" % (collision,))
+        self._collision = collision
+        self._scene()._set_pixel_collision(self, collision == 'pixel')
+
+    def _get_collision_group(self):
+        """
+        The name of this sprite's collision group (a ``str``), or ``None``.
+        The scene sends events when members of collision groups start and
+        stop colliding; see
+        :func:`add_collision_group <spyral.Scene.add_collision_group>`.
+        """
+        return self._collision_group
+
+    def _set_collision_group(self, group):
+        self._collision_group = group
+        self._scene()._set_collision_group(self, group)
+
+    def _get_category_bits(self):
+        """
+        The collision categories that this sprite belongs to, as bits of an
+        ``int`` (1 by default). Two sprites or views only collide when each
+        one's category is in the other's ``mask_bits``, and one with no
+        category (0) never collides, which makes it free for the collision
+        queries of the scene.
+        """
+        return self._category_bits
+
+    def _set_category_bits(self, bits):
+        self._category_bits = bits
+        self._scene()._set_collision_filter(self, bits, self._mask_bits)
+
+    def _get_mask_bits(self):
+        """
+        The collision categories that this sprite collides with, as bits of
+        an ``int`` (``~0``, every category, by default). See
+        ``category_bits``.
+        """
+        return self._mask_bits
+
+    def _set_mask_bits(self, bits):
+        self._mask_bits = bits
+        self._scene()._set_collision_filter(self, self._category_bits, bits)
+
     pos = property(_get_pos, _set_pos)
     layer = property(_get_layer, _set_layer)
     image = property(_get_image, _set_image)
@@ -460,6 +531,10 @@ class Sprite(object):
     scene = property(_get_scene)
     parent = property(_get_parent)
     mask = property(_get_mask, _set_mask)
+    collision = property(_get_collision, _set_collision)
+    collision_group = property(_get_collision_group, _set_collision_group)
+    category_bits = property(_get_category_bits, _set_category_bits)
+    mask_bits = property(_get_mask_bits, _set_mask_bits)
 
     def _draw(self):
         """
@@ -479,21 +554,37 @@ class Sprite(object):
         if self._static:
             return
 
-        area = spyral.Rect(self._transform_image.get_rect())
-        b = spyral.util._Blit(self._transform_image,
-                              self._pos - self._offset,
-                              area,
-                              self._computed_layer,
-                              self._blend_flags,
-                              False)
+        # Skip sprites that can't be seen before doing any work for their
+        # blit. The bounds are padded by a pixel to allow for rounding.
+        parent = self._parent()
+        scene = self._scene()
+        surface = self._transform_image
+        _, sx, sy, ox, oy, _, _, shown = parent._get_chain()
+        if not shown:
+            scene._culled += 1
+            return
+        x = self._pos[0] - self._offset[0]
+        y = self._pos[1] - self._offset[1]
+        left = x * sx + ox
+        top = y * sy + oy
+        scene_width, scene_height = scene._size
+        if (left + surface.get_width() * sx < -1 or
+                top + surface.get_height() * sy < -1 or
+                left > scene_width + 1 or top > scene_height + 1):
+            scene._culled += 1
+            return
+
+        b = spyral.util._new_blit(surface, x, y, self._computed_layer,
+                                  self._blend_flags, False)
+        b.opaque = self._opaque and not self._blend_flags
 
         if self._make_static or self._age > 4:
             b.static = True
             self._make_static = False
             self._static = True
-            self._parent()._static_blit(self, b)
+            parent._static_blit(self, b)
             return
-        self._parent()._blit(b)
+        parent._blit(b)
         self._age += 1
 
     def _set_collision_box(self):
@@ -502,14 +593,52 @@ class Sprite(object):
         """
         if self.image is None:
             return
+        x = self._pos[0] - self._offset[0]
+        y = self._pos[1] - self._offset[1]
         if self._mask is None:
-            area = spyral.Rect(self._transform_image.get_rect())
+            width, height = self._transform_image.get_size()
+            c = spyral.util._new_collision_box(x, y, 0, 0, width, height)
         else:
-            area = self._mask
-        c = spyral.util._CollisionBox(self._pos - self._offset, area)
+            mask = self._mask
+            c = spyral.util._new_collision_box(x, y, mask.left, mask.top,
+                                               mask.width, mask.height)
         warped_box = self._parent()._warp_collision_box(c)
         self._scene()._set_collision_box(self, warped_box.rect)
 
+    def _get_bitmask(self, size):
+        """
+        Returns the bitmask of this sprite's collision box, for pixel-perfect
+        collisions, scaled to the size of the box within the scene. Masks of
+        the whole image are shared with other sprites through the
+        :data:`transform_cache`.
+
+        :param size: The size of the collision box.
+        :type size: a 2-tuple of ``int``
+        :rtype: :class:`pygame.mask.Mask`
+        """
+        bitmask = self._bitmask
+        if bitmask is None:
+            if self._is_collapsed():
+                bitmask = pygame.mask.Mask((1, 1))
+            else:
+                bitmask = transform_cache.mask(self._image,
+                                               self._flip_x, self._flip_y,
+                                               self._scale, self._angle)
+            if self._mask is not None:
+                mask = self._mask
+                cropped = pygame.mask.Mask((int(mask.width),
+                                            int(mask.height)))
+                cropped.draw(bitmask, (-int(mask.left), -int(mask.top)))
+                bitmask = cropped
+            self._bitmask = bitmask
+        if bitmask.get_size() == size:
+            return bitmask
+        # Views can scale the box
+        scaled = self._scaled_bitmask
+        if scaled is None or scaled.get_size() != size:
+            scaled = self._scaled_bitmask = bitmask.scale(size)
+        return scaled
+
     def kill(self):
         """
         When you no longer need a Sprite, you can call this method to have it
@@ -518,7 +647,7 @@ class Sprite(object):
         remember to ``del`` the reference to it.
         """
         self._scene()._unregister_sprite(self)
-        self._scene()._remove_static_blit(self)
+        self._parent()._remove_static_blit(self)
         self._parent()._remove_child(self)
 
     def animate(self, animation):
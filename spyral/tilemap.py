@@ -0,0 +1,342 @@
+"""
+A TileMap draws a grid of tiles (e.g. the walls and floors of a level) as a
+single View, instead of as one Sprite per tile. The grid is split into chunks
+of tiles, and each chunk is drawn once onto its own image, which is only
+redrawn when one of its tiles changes.
+
+Important concepts:
+    Tiles
+        Each cell of the grid holds the index of its tile in the tileset, or
+        EMPTY (``-1``) if nothing is drawn there. Cells are addressed by
+        (column, row).
+    Tileset
+        The images of the tiles: either a list of
+        :class:`Images <spyral.Image>`, or an :class:`Atlas <spyral.Atlas>`,
+        whose images are numbered in the (sorted) order of its names.
+    Chunks
+        Square groups of tiles, CHUNK_SIZE tiles wide by default. Each chunk
+        becomes one static blit, and only the chunks that can be seen (inside
+        of the scene and the TileMap's crop) are handed to the scene. Chunks
+        with no gaps in them are opaque, so anything underneath them is not
+        drawn at all.
+    Solid tiles
+        The tiles that the collision queries (such as :func:`collide_rect
+        <spyral.TileMap.collide_rect>`) treat as solid. By default, every tile
+        that isn't EMPTY is solid. The queries look at the grid directly, so
+        tiles have no collision boxes of their own.
+"""
+
+import math
+import pygame
+import spyral
+from spyral.view import View
+
+class TileMap(View):
+    """
+    A View that draws a grid of tiles::
+
+        level = spyral.TileMap(self, [[0, 0, 0, 0],
+                                      [0, -1, -1, 0],
+                                      [0, 0, 0, 0]],
+                               spyral.Atlas("images/tiles"))
+        level[1, 1] = 3
+        if level.collide_sprite(player):
+            ...
+
+    The size of the TileMap is the size of the grid in pixels; like any View,
+    it can be moved, scaled, cropped and layered.
+
+    :param parent: The view or scene that this TileMap belongs in.
+    :type parent: :func:`View <spyral.View>` or :func:`Scene <spyral.Scene>`
+    :param tiles: The tile index of every cell, as a list of rows.
+    :type tiles: a list of lists of ``int``
+    :param tileset: The images of the tiles.
+    :type tileset: a list of :class:`Images <spyral.Image>` or an
+                   :class:`Atlas <spyral.Atlas>`
+    :param tile_size: The size of a cell in pixels. Defaults to the size of
+                      the first tile image.
+    :type tile_size: :class:`Vec2D <spyral.Vec2D>`
+    :param int chunk_size: The width and height of a chunk, in tiles.
+                           Defaults to CHUNK_SIZE.
+    """
+    #: The index of an empty cell.
+    EMPTY = -1
+    #: The default width and height of a chunk, in tiles.
+    CHUNK_SIZE = 16
+    def __init__(self, parent, tiles, tileset, tile_size=None,
+                 chunk_size=None):
+        View.__init__(self, parent)
+        if isinstance(tileset, spyral.Atlas):
+            tileset = [tileset[name] for name in tileset.names]
+        self._tileset = list(tileset)
+        self._tiles = [[self.EMPTY if tile is None else tile for tile in row]
+                       for row in tiles]
+        self._rows = len(self._tiles)
+        self._columns = max([len(row) for row in self._tiles] or [0])
+        for row in self._tiles:
+            row.extend([self.EMPTY] * (self._columns - len(row)))
+        if tile_size is None:
+            tile_size = self._tileset[0].size
+        self._tile_size = spyral.Vec2D(tile_size)
+        self._chunk_size = chunk_size or self.CHUNK_SIZE
+        self.solid = None
+        self._chunks = {}
+        self._opaque_chunks = set()
+        self._dirty_chunks = set()
+        self._shown_chunks = set()
+
+        size = (self._columns * self._tile_size[0],
+                self._rows * self._tile_size[1])
+        self.size = size
+        self.output_size = size
+        scene = self._scene()
+        # Like a Sprite, the TileMap is told when a View above it changes, so
+        # that its chunks can be placed again; and so is its own View
+        scene._register_drawable(self, self)
+        spyral.event.register('director.render', self._draw, scene=scene)
+
+    # Getters and Setters
+    def _get_columns(self):
+        """
+        The number of columns of tiles. Read-only ``int``.
+        """
+        return self._columns
+
+    def _get_rows(self):
+        """
+        The number of rows of tiles. Read-only ``int``.
+        """
+        return self._rows
+
+    def _get_tile_size(self):
+        """
+        The size of a cell in pixels (:class:`Vec2D <spyral.Vec2D>`).
+        Read-only.
+        """
+        return self._tile_size
+
+    def _get_tileset(self):
+        """
+        The list of tile images. Read-only.
+        """
+        return self._tileset
+
+    columns = property(_get_columns)
+    rows = property(_get_rows)
+    tile_size = property(_get_tile_size)
+    tileset = property(_get_tileset)
+
+    def __getitem__(self, cell):
+        column, row = cell
+        return self._tiles[row][column]
+
+    def __setitem__(self, cell, tile):
+        column, row = cell
+        if tile is None:
+            tile = self.EMPTY
+        if self._tiles[row][column] == tile:
+            return
+        self._tiles[row][column] = tile
+        self._dirty_chunks.add((column // self._chunk_size,
+                                row // self._chunk_size))
+
+    def _render_chunk(self, chunk):
+        """
+        Draws the tiles of a chunk onto its image, reusing the old image if
+        there is one.
+        """
+        size = self._chunk_size
+        tile_width, tile_height = self._tile_size
+        first_column, first_row = chunk[0] * size, chunk[1] * size
+        last_column = min(first_column + size, self._columns)
+        last_row = min(first_row + size, self._rows)
+        surface_size = (int((last_column - first_column) * tile_width),
+                        int((last_row - first_row) * tile_height))
+        surface = self._chunks.get(chunk)
+        if surface is None or surface.get_size() != surface_size:
+            surface = spyral.image._new_spyral_surface(surface_size)
+            self._chunks[chunk] = surface
+        else:
+            surface.fill((0, 0, 0, 0))
+            spyral.util.scale_surface.clear(surface)
+        tileset = self._tileset
+        for row in xrange(first_row, last_row):
+            tiles = self._tiles[row]
+            y = (row - first_row) * tile_height
+            for column in xrange(first_column, last_column):
+                tile = tiles[column]
+                if tile != self.EMPTY:
+                    surface.blit(tileset[tile]._surf,
+                                 ((column - first_column) * tile_width, y))
+        if spyral.image._is_opaque(surface):
+            self._opaque_chunks.add(chunk)
+        else:
+            self._opaque_chunks.discard(chunk)
+        return surface
+
+    def _visible_chunks(self):
+        """
+        Returns the range of chunk columns and rows that can be seen within
+        the scene. Like sprites, chunks are culled against the scene's bounds,
+        padded by a pixel, and not against any crop: a crop only trims the
+        area of each blit, so it never removes whole chunks.
+        """
+        (sx, sy), (ox, oy) = self._get_transform()
+        width, height = self._scene().size
+        left, top = (-1 - ox) / sx, (-1 - oy) / sy
+        right, bottom = (width + 1 - ox) / sx, (height + 1 - oy) / sy
+        chunk_width = self._chunk_size * self._tile_size[0]
+        chunk_height = self._chunk_size * self._tile_size[1]
+        columns = int(math.ceil(self._columns / float(self._chunk_size)))
+        rows = int(math.ceil(self._rows / float(self._chunk_size)))
+        return (xrange(max(0, int(left // chunk_width)),
+                       min(columns, int(math.ceil(right / chunk_width)))),
+                xrange(max(0, int(top // chunk_height)),
+                       min(rows, int(math.ceil(bottom / chunk_height)))))
+
+    def _draw(self):
+        """
+        Internal method for handing the scene a static blit for every chunk
+        that can be seen, drawing any chunks that have changed first.
+        """
+        if not self.visible:
+            return
+        columns, rows = self._visible_chunks()
+        visible = set((column, row) for column in columns for row in rows)
+        for chunk in self._shown_chunks - visible:
+            self._remove_static_blit((self, chunk))
+        self._shown_chunks &= visible
+        for chunk in self._dirty_chunks & visible:
+            self._render_chunk(chunk)
+            self._shown_chunks.discard(chunk)
+        self._dirty_chunks -= visible
+        # The layer of the TileMap itself, within its parent
+        layer = self._scene()._get_layer_position(self, '')
+        chunk_width = self._chunk_size * self._tile_size[0]
+        chunk_height = self._chunk_size * self._tile_size[1]
+        for chunk in visible - self._shown_chunks:
+            surface = self._chunks.get(chunk)
+            if surface is None:
+                surface = self._render_chunk(chunk)
+            b = spyral.util._Blit(surface,
+                                  spyral.Vec2D(chunk[0] * chunk_width,
+                                               chunk[1] * chunk_height),
+                                  spyral.Rect(surface.get_rect()),
+                                  layer, 0, True)
+            b.opaque = chunk in self._opaque_chunks
+            self._static_blit((self, chunk), b)
+            self._shown_chunks.add(chunk)
+
+    def _expire_static(self):
+        """
+        Takes back the static blits of every chunk, so that they are placed
+        again on the next frame.
+        """
+        for chunk in self._shown_chunks:
+            self._remove_static_blit((self, chunk))
+        self._shown_chunks.clear()
+        return True
+
+    def _to_local(self, rect):
+        """
+        Converts a rect relative to the window into this TileMap's
+        coordinates, as (left, top, right, bottom).
+        """
+        (sx, sy), (ox, oy) = self._get_transform()
+        rect = spyral.Rect(rect)
+        return ((rect.left - ox) / sx, (rect.top - oy) / sy,
+                (rect.right - ox) / sx, (rect.bottom - oy) / sy)
+
+    def _cells(self, left, top, right, bottom):
+        """
+        Yields the (column, row) of every cell that overlaps the area.
+        """
+        tile_width, tile_height = self._tile_size
+        first_column = max(0, int(math.floor(left / tile_width)))
+        first_row = max(0, int(math.floor(top / tile_height)))
+        last_column = min(self._columns, int(math.ceil(right / tile_width)))
+        last_row = min(self._rows, int(math.ceil(bottom / tile_height)))
+        for row in xrange(first_row, last_row):
+            for column in xrange(first_column, last_column):
+                yield column, row
+
+    def _is_solid(self, tile):
+        if self.solid is None:
+            return tile != self.EMPTY
+        return tile in self.solid
+
+    def tile_at(self, point):
+        """
+        Returns the cell under the point.
+
+        :param point: The point (relative to the window dimensions).
+        :type point: :class:`Vec2D <spyral.Vec2D>`
+        :returns: The (column, row) of the cell, or ``None`` if the point is
+                  outside of the grid.
+        """
+        (sx, sy), (ox, oy) = self._get_transform()
+        column = int(math.floor((point[0] - ox) / sx / self._tile_size[0]))
+        row = int(math.floor((point[1] - oy) / sy / self._tile_size[1]))
+        if 0 <= column < self._columns and 0 <= row < self._rows:
+            return column, row
+        return None
+
+    def tiles_in_rect(self, rect):
+        """
+        Returns the cells that overlap the rect, and aren't empty.
+
+        :param rect: The rect (relative to the window dimensions).
+        :type rect: :class:`Rect <spyral.Rect>`
+        :returns: A list of (column, row) pairs.
+        """
+        tiles = self._tiles
+        return [(column, row)
+                for column, row in self._cells(*self._to_local(rect))
+                if tiles[row][column] != self.EMPTY]
+
+    def collide_point(self, point):
+        """
+        Returns whether the point is on a solid tile.
+
+        :param point: The point (relative to the window dimensions).
+        :type point: :class:`Vec2D <spyral.Vec2D>`
+        :returns: A ``bool``
+        """
+        cell = self.tile_at(point)
+        return cell is not None and self._is_solid(self[cell])
+
+    def collide_rect(self, rect):
+        """
+        Returns whether the rect overlaps any solid tile.
+
+        :param rect: The rect (relative to the window dimensions).
+        :type rect: :class:`Rect <spyral.Rect>`
+        :returns: A ``bool``
+        """
+        tiles = self._tiles
+        for column, row in self._cells(*self._to_local(rect)):
+            if self._is_solid(tiles[row][column]):
+                return True
+        return False
+
+    def collide_sprite(self, sprite):
+        """
+        Returns whether the sprite (or View) overlaps any solid tile.
+
+        :param sprite: The sprite
+        :type sprite: :class:`Sprite <spyral.Sprite>` or
+                      :class:`View <spyral.View>`
+        :returns: A ``bool``
+        """
+        boxes = self._scene()._collision_boxes
+        if sprite not in boxes:
+            return False
+        return self.collide_rect(boxes[sprite])
+
+    def kill(self):
+        """
+        Removes this TileMap, and its chunks, from the Scene.
+        """
+        self._expire_static()
+        self._scene()._unregister_drawable(self)
+        View.kill(self)
@@ -55,11 +55,37 @@ def _anchor_offset(anchor, width, height):
         offset = a * spyral.Vec2D(-1, -1)
     return spyral.Vec2D(offset)
 
-@spyral.memoize._ImageMemoize
-def scale_surface(s, target_size):
+# How many frame budgets currently want fast (unfiltered) scaling
+_fast_scaling = 0
+
+def _lower_scaling_quality():
+    """
+    Makes :func:`scale_surface` use ``pygame.transform.scale`` instead of
+    ``pygame.transform.smoothscale``, until a matching call to
+    :func:`_restore_scaling_quality`.
+    """
+    global _fast_scaling
+    _fast_scaling += 1
+
+def _restore_scaling_quality():
+    """
+    Undoes one call to :func:`_lower_scaling_quality`.
+    """
+    global _fast_scaling
+    _fast_scaling = max(0, _fast_scaling - 1)
+
+def _use_fast_scaling():
+    """
+    Returns whether :func:`scale_surface` is currently using the fast scaler,
+    so that its results are cached separately for each quality.
+    """
+    return _fast_scaling > 0
+
+def _scale_surface(s, target_size):
     """
     Internal method to scale a surface `s` by a float `factor`. Uses memoization
-    to improve performance.
+    to improve performance; results made while the scaling quality is lowered
+    are cached apart from the full quality ones.
 
     :param target_size: The end size of the surface
     :type target_size: :class:`Vec2D <spyral.Vec2D>`
@@ -69,27 +95,54 @@ def scale_surface(s, target_size):
                 int(math.ceil(target_size[1])))
     if new_size == s.get_size():
         return s
-    t = pygame.transform.smoothscale(s, new_size,
-                                     spyral.image._new_spyral_surface(new_size))
+    if _fast_scaling:
+        transform = pygame.transform.scale
+    else:
+        transform = pygame.transform.smoothscale
+    t = transform(s, new_size,
+                  spyral.image._new_matching_surface(s, new_size))
     return t
 
+scale_surface = spyral.memoize._ImageMemoize(_scale_surface,
+                                             mode=_use_fast_scaling)
+
+def _clip(left, top, width, height, crop_width, crop_height):
+    """
+    Clips the area (left, top, width, height) to the area (0, 0, crop_width,
+    crop_height) the same way that :func:`Rect.clip <spyral.Rect.clip>` does,
+    returning a new (left, top, width, height).
+    """
+    right = min(left + width, crop_width)
+    bottom = min(top + height, crop_height)
+    new_left = max(left, 0)
+    new_top = max(top, 0)
+    if right <= new_left or bottom <= new_top:
+        return left, top, 0, 0
+    return new_left, new_top, right - new_left, bottom - new_top
+
 class _Blit(object):
     """
     An internal class to represent a drawable `surface` with additional data
     (e.g. `rect` representing its location on screen, whether it's `static`).
+    Blits only hold plain numbers, which are changed in place as the blit is
+    passed up the View chain, and dynamic blits are reused from frame to frame
+    (see :func:`_new_blit` and :func:`_release_blits`).
 
     .. attribute::surface
 
         The internal Pygame source surface use to render this blit.
 
-    .. attribute::position
+    .. attribute::x, y
 
-        The current position of this Blit (:class:`Vec2D <spyral.Vec2D>`).
+        The current position of this Blit.
 
-    .. attribute::area
+    .. attribute::width, height
 
-        The portion of the surface to be drawn to the screen
-        (:class:`Rect <spyral.Rect>`).
+        The final size of the surface, set seperately to defer scaling.
+
+    .. attribute::area_x, area_y, area_width, area_height
+
+        The portion of the (scaled) surface to be drawn to the screen.
 
     .. attribute::layer
 
@@ -103,30 +156,65 @@ class _Blit(object):
 
         Whether this Blit is static.
 
-    .. attribute::final_size
+    .. attribute::opaque
 
-        The final size, set seperately to defer scaling.
+        Whether every pixel that this Blit draws is fully opaque, so that
+        nothing underneath it can be seen.
 
     .. attribute::rect
 
         A rect representing the final position and size of this blit
-        (:class:`Rect <spyral.Rect>`).
+        (:class:`pygame.Rect`).
 
     """
-    __slots__ = ['surface', 'position', 'rect', 'area', 'layer',
-                 'flags', 'static', 'clipping', 'final_size']
+    __slots__ = ['surface', 'x', 'y', 'width', 'height', 'area_x', 'area_y',
+                 'area_width', 'area_height', 'layer', 'flags', 'static',
+                 'opaque', 'rect']
+    # Batches of blits (from a SpriteBatch) have a list of draws instead
+    draws = None
     def __init__(self, surface, position, area, layer, flags, static):
-        self.surface = surface   # pygame surface
-        self.position = position # coordinates to draw at
-        self.area = area         # portion of the surface to be drawn to screen
-        self.layer = layer       # layer in scene
-        self.flags = flags       # any drawing flags (currently unusued)
-        self.static = static     # static blits haven't changed
-
-        # Final size of the surface, the scaling will happen late
-        self.final_size = spyral.Vec2D(surface.get_size())
-        # Rect is only for finalized sprites
         self.rect = None
+        self.reset(surface, position[0], position[1], layer, flags, static)
+        self.area_x, self.area_y = area.left, area.top
+        self.area_width, self.area_height = area.width, area.height
+
+    def reset(self, surface, x, y, layer, flags, static):
+        """
+        Sets up this blit to draw all of `surface` at (x, y).
+        """
+        self.surface = surface
+        self.x = x
+        self.y = y
+        self.width = self.area_width = surface.get_width()
+        self.height = self.area_height = surface.get_height()
+        self.area_x = self.area_y = 0
+        self.layer = layer
+        self.flags = flags
+        self.static = static
+        self.opaque = False
+
+    def transform(self, scale_x, scale_y, offset_x, offset_y,
+                  crop_width=None, crop_height=None):
+        """
+        Scales and then offsets this blit, and crops its area to the given
+        size, in place. This applies a whole chain of Views at once.
+        """
+        self.x = self.x * scale_x + offset_x
+        self.y = self.y * scale_y + offset_y
+        self.width *= scale_x
+        self.height *= scale_y
+        self.area_x *= scale_x
+        self.area_y *= scale_y
+        self.area_width *= scale_x
+        self.area_height *= scale_y
+        if crop_width is not None:
+            (self.area_x, self.area_y,
+             self.area_width, self.area_height) = _clip(self.area_x,
+                                                        self.area_y,
+                                                        self.area_width,
+                                                        self.area_height,
+                                                        crop_width,
+                                                        crop_height)
 
     def apply_scale(self, scale):
         """
@@ -135,44 +223,78 @@ class _Blit(object):
         :param scale: The scaling factor
         :type scale: :class:`Vec2D <spyral.Vec2D>`
         """
-        self.position = self.position * scale
-        self.final_size = self.final_size * scale
-        self.area = spyral.Rect(self.area.topleft * scale,
-                                self.area.size * scale)
+        self.transform(scale[0], scale[1], 0, 0)
 
     def clip(self, rect):
         """
         Applies any necessary cropping to this blit
 
-        :param rect: The new maximal size of the blit.
+        :param rect: The new maximal size of the blit, at (0, 0).
         :type rect: :class:`Rect <spyral.Rect>`
         """
-        self.area = self.area.clip(spyral.Rect(rect))
+        rect = spyral.Rect(rect)
+        self.transform(1, 1, 0, 0, rect.width, rect.height)
 
     def finalize(self):
         """
         Performs all the final calculations for this blit and calculates the
         rect.
         """
-        self.surface = scale_surface(self.surface, self.final_size)
-        self.surface = self.surface.subsurface(self.area._to_pygame())
-        self.rect = pygame.Rect((self.position[0], self.position[1]),
-                                self.surface.get_size())
+        surface = scale_surface(self.surface, (self.width, self.height))
+        # Only take a subsurface if part of the surface is cut off
+        left, top = int(self.area_x), int(self.area_y)
+        width, height = int(self.area_width), int(self.area_height)
+        if (left or top or width != surface.get_width() or
+                height != surface.get_height()):
+            surface = surface.subsurface((left, top, width, height))
+        self.surface = surface
+        rect = self.rect
+        if rect is None:
+            self.rect = pygame.Rect(self.x, self.y, width, height)
+        else:
+            rect.x = self.x
+            rect.y = self.y
+            rect.w = width
+            rect.h = height
+
+# Dynamic blits that can be reused
+_blit_pool = []
+#: The most blits that are kept around for reuse.
+MAX_POOLED_BLITS = 20000
+
+def _new_blit(surface, x, y, layer, flags, static):
+    """
+    Returns a blit that draws all of `surface` at (x, y), reusing a released
+    blit if there is one.
+    """
+    if _blit_pool:
+        blit = _blit_pool.pop()
+        blit.reset(surface, x, y, layer, flags, static)
+        return blit
+    return _Blit(surface, (x, y), spyral.Rect(surface.get_rect()),
+                 layer, flags, static)
+
+def _release_blits(blits):
+    """
+    Allows dynamic blits to be reused once a frame has been drawn. Blits of a
+    :class:`SpriteBatch <spyral.SpriteBatch>` are ignored.
+    """
+    if len(_blit_pool) < MAX_POOLED_BLITS:
+        _blit_pool.extend(blit for blit in blits if blit.draws is None)
 
 class _CollisionBox(object):
     """
     An internal class for managing the collidable area for a sprite or view.
-    In many ways, this is a reduced form of a _Blit.
+    In many ways, this is a reduced form of a _Blit, and like a _Blit it only
+    holds plain numbers.
 
-    .. attribute::position
+    .. attribute::x, y
 
-        The current position of this CollisionBox
-        (:class:`Vec2D <spyral.Vec2D>`).
+        The current position of this CollisionBox.
 
-    .. attribute::area
+    .. attribute::area_x, area_y, area_width, area_height
 
         The current offset and size of this CollisionBox.
-        (:class:`Rect <spyral.Rect>`).
 
     .. attribute::rect
 
@@ -180,20 +302,63 @@ class _CollisionBox(object):
         (:class:`Rect <spyral.Rect>`).
 
     """
-    __slots__ = ['position', 'rect', 'area']
+    __slots__ = ['x', 'y', 'area_x', 'area_y', 'area_width', 'area_height',
+                 'rect']
     def __init__(self, position, area):
-        self.position = position
-        self.area = area
+        self.reset(position[0], position[1], area.left, area.top,
+                   area.width, area.height)
+
+    def reset(self, x, y, area_x, area_y, area_width, area_height):
+        """
+        Sets up this box at (x, y), with the given area.
+        """
+        self.x = x
+        self.y = y
+        self.area_x = area_x
+        self.area_y = area_y
+        self.area_width = area_width
+        self.area_height = area_height
         self.rect = None
 
+    def transform(self, scale_x, scale_y, offset_x, offset_y,
+                  crop_width=None, crop_height=None):
+        """
+        Scales and then offsets this box, and crops its area to the given
+        size, in place.
+        """
+        self.x = self.x * scale_x + offset_x
+        self.y = self.y * scale_y + offset_y
+        self.area_x *= scale_x
+        self.area_y *= scale_y
+        self.area_width *= scale_x
+        self.area_height *= scale_y
+        if crop_width is not None:
+            (self.area_x, self.area_y,
+             self.area_width, self.area_height) = _clip(self.area_x,
+                                                        self.area_y,
+                                                        self.area_width,
+                                                        self.area_height,
+                                                        crop_width,
+                                                        crop_height)
+
     def apply_scale(self, scale):
-        self.position = self.position * scale
-        self.area = spyral.Rect(self.area.topleft * scale,
-                                self.area.size * scale)
+        self.transform(scale[0], scale[1], 0, 0)
 
     def clip(self, rect):
-        self.area = self.area.clip(spyral.Rect(rect))
+        rect = spyral.Rect(rect)
+        self.transform(1, 1, 0, 0, rect.width, rect.height)
 
     def finalize(self):
-        self.rect = spyral.Rect(self.position, self.area.size)
-        
\ No newline at end of file
+        self.rect = spyral.Rect(self.x, self.y,
+                                self.area_width, self.area_height)
+
+# The one collision box that is reused, since boxes are finalized as soon as
+# they are made
+_collision_box = _CollisionBox((0, 0), spyral.Rect(0, 0, 0, 0))
+
+def _new_collision_box(x, y, area_x, area_y, area_width, area_height):
+    """
+    Returns the shared collision box, set up with the given position and area.
+    """
+    _collision_box.reset(x, y, area_x, area_y, area_width, area_height)
+    return _collision_box
@@ -1,5 +1,6 @@
 import spyral
 from weakref import ref as _wref
+from blitlist import _StaticBlitList
 
 class View(object):
     """
@@ -8,6 +9,12 @@ class View(object):
     cropped, scaled, offset, hidden, etc. A View can also have a ``mask``, in
     order to treat it as a single collidable object. Like a Sprite, a View cannot
     be moved between Scenes.
+
+    A View can also ``cache`` its children: they are composited into a private
+    image that is only redrawn when one of them changes, and the View hands its
+    parent a single blit for the whole group. This is ideal for HUDs, forms and
+    other groups of many sprites that rarely change. Note that children of a
+    cached View are only drawn within its ``size``.
     
     :param parent: The view or scene that this View belongs in.
     :type parent: :func:`View <spyral.View>` or :func:`Scene <spyral.Scene>`
@@ -26,6 +33,17 @@ class View(object):
         self._layers = []
         self._layer = None
         self._mask = None
+        self._collision_group = None
+        self._category_bits = 1
+        self._mask_bits = ~0
+        self._cache = False
+        self._cache_surface = None
+        self._cache_static = None
+        self._cache_blits = []
+        self._cache_dirty = False
+        self._cache_had_dynamic = False
+        self._chain = None
+        self._blit_chain = None
 
         self._children = set()
         self._child_views = set()
@@ -64,6 +82,7 @@ class View(object):
             child.kill()
         self._children.clear()
         self._child_views.clear()
+        self._parent()._remove_static_blit(self)
         self._scene()._kill_view(self)
 
     def _get_mask(self):
@@ -85,6 +104,39 @@ class View(object):
         self._mask = mask
         self._set_collision_box()
 
+    def _get_collision_group(self):
+        """
+        The name of this View's collision group (a ``str``), or ``None``; see
+        :func:`add_collision_group <spyral.Scene.add_collision_group>`.
+        """
+        return self._collision_group
+
+    def _set_collision_group(self, group):
+        self._collision_group = group
+        self._scene()._set_collision_group(self, group)
+
+    def _get_category_bits(self):
+        """
+        The collision categories that this View belongs to, as bits of an
+        ``int``. See :class:`Sprite <spyral.Sprite>` for how categories work.
+        """
+        return self._category_bits
+
+    def _set_category_bits(self, bits):
+        self._category_bits = bits
+        self._scene()._set_collision_filter(self, bits, self._mask_bits)
+
+    def _get_mask_bits(self):
+        """
+        The collision categories that this View collides with, as bits of
+        an ``int``.
+        """
+        return self._mask_bits
+
+    def _set_mask_bits(self, bits):
+        self._mask_bits = bits
+        self._scene()._set_collision_filter(self, self._category_bits, bits)
+
     def _set_collision_box_tree(self):
         """
         Set this View's collision box, and then also recursively recompute
@@ -101,6 +153,7 @@ class View(object):
         `spyral.internal.view.changed` event.
         """
         self._recalculate_offset()
+        self._invalidate_transform()
         self._set_collision_box_tree()
         # Notify any listeners (probably children) that I have changed
         changed_event = spyral.Event(name="changed", view=self)
@@ -360,6 +413,50 @@ class View(object):
         self._changed()
 
 
+    def _get_cache(self):
+        """
+        A ``bool`` that determines whether this view composites its children
+        into a single cached image, which is only redrawn when one of them
+        changes (default: False).
+        """
+        return self._cache
+
+    def _set_cache(self, cache):
+        if self._cache == cache:
+            return
+        scene = self._scene()
+        self._invalidate_transform()
+        if cache:
+            # Children must drop their blits from the parent chain before
+            # they start drawing into the cache.
+            scene._invalidate_views(self)
+            self._expire_cached_views()
+            self._cache_static = _StaticBlitList()
+            self._cache_blits = []
+            self._cache_dirty = True
+            self._cache = True
+            scene._add_cached_view(self)
+        else:
+            self._cache = False
+            scene._remove_cached_view(self)
+            self._parent()._remove_static_blit(self)
+            self._cache_static = None
+            self._cache_blits = []
+            self._cache_surface = None
+            scene._invalidate_views(self)
+            self._expire_cached_views()
+
+    def _expire_cached_views(self):
+        """
+        Forces any cached Views below this one to remove their image from the
+        transformation chain, and to redraw it before the next frame.
+        """
+        for view in self._child_views:
+            if view._cache:
+                view._parent()._remove_static_blit(view)
+                view._cache_dirty = True
+            view._expire_cached_views()
+
     def _get_parent(self):
         """
         The first parent :class:`View <spyral.View>` or 
@@ -408,6 +505,9 @@ class View(object):
     height = property(_get_height, _set_height)
     size = property(_get_size, _set_size)
     mask = property(_get_mask, _set_mask)
+    collision_group = property(_get_collision_group, _set_collision_group)
+    category_bits = property(_get_category_bits, _set_category_bits)
+    mask_bits = property(_get_mask_bits, _set_mask_bits)
     output_width = property(_get_output_width, _set_output_width)
     output_height = property(_get_output_height, _set_output_height)
     output_size = property(_get_output_size, _set_output_size)
@@ -416,56 +516,192 @@ class View(object):
     crop_size = property(_get_crop_size, _set_crop_size)
     visible = property(_get_visible, _set_visible)
     crop = property(_get_crop, _set_crop)
+    cache = property(_get_cache, _set_cache)
     parent = property(_get_parent)
     scene = property(_get_scene)
     rect = property(_get_rect, _set_rect)
 
     def _blit(self, blit):
         """
-        If this View is visible, applies offseting, scaling, and cropping
-        before passing it up the transformation chain.
+        Applies the offseting, scaling, and cropping of every View up to the
+        nearest cached View (or the Scene) to the blit at once, and hands it
+        over, unless one of those Views is hidden.
         """
-        if self.visible:
-            blit.position += self.pos
-            blit.apply_scale(self.scale)
-            if self.crop:
-                blit.clip(spyral.Rect((0, 0), self.crop_size))
-            self._parent()._blit(blit)
+        (target, sx, sy, ox, oy,
+         crop_width, crop_height, shown) = self._get_blit_chain()
+        if shown:
+            blit.transform(sx, sy, ox, oy, crop_width, crop_height)
+            target()._add_blit(blit)
 
     def _static_blit(self, key, blit):
         """
-        If this View is visible, applies offseting, scaling, and cropping
-        before passing it up the transformation chain.
+        Applies the offseting, scaling, and cropping of every View up to the
+        nearest cached View (or the Scene) to the blit at once, and hands it
+        over as a static blit, unless one of those Views is hidden.
+        """
+        (target, sx, sy, ox, oy,
+         crop_width, crop_height, shown) = self._get_blit_chain()
+        if shown:
+            blit.transform(sx, sy, ox, oy, crop_width, crop_height)
+            target()._add_static_blit(key, blit)
+
+    def _add_blit(self, blit):
+        """
+        Keeps a blit from a child of this cached View for its image.
+        """
+        blit.finalize()
+        self._cache_blits.append(blit)
+
+    def _add_static_blit(self, key, blit):
+        """
+        Keeps a static blit from a child of this cached View for its image.
+        """
+        blit.finalize()
+        self._cache_static[key] = blit
+        self._cache_dirty = True
+
+    def _remove_static_blit(self, key):
+        """
+        Removes the static blit for `key`, either from this View's cached image
+        or from further up the transformation chain.
+        """
+        if self._cache:
+            if key in self._cache_static:
+                self._cache_static.pop(key)
+                self._cache_dirty = True
+        else:
+            self._parent()._remove_static_blit(key)
+
+    def _render_cache(self):
+        """
+        Redraws this View's cached image if any of its children changed, and
+        passes the image up the transformation chain as a single static blit.
+        Called by the Scene before every frame is drawn, for the deepest
+        cached Views first.
         """
-        if self.visible:
-            blit.position += self.pos
-            blit.apply_scale(self.scale)
-            if self.crop:
-                blit.clip(spyral.Rect((0, 0), self.crop_size))
-            self._parent()._static_blit(key, blit)
+        dynamic = self._cache_blits
+        if not (self._cache_dirty or dynamic or self._cache_had_dynamic):
+            return
+        self._cache_blits = []
+        self._cache_dirty = False
+        self._cache_had_dynamic = bool(dynamic)
+        parent = self._parent()
+        parent._remove_static_blit(self)
+        if not self.visible:
+            return
+        blits = self._cache_static.merged(dynamic)
+        if not blits:
+            return
+        size = (int(self._size[0]), int(self._size[1]))
+        surface = self._cache_surface
+        if surface is None or surface.get_size() != size:
+            surface = spyral.image._new_spyral_surface(size)
+            self._cache_surface = surface
+        else:
+            surface.fill((0, 0, 0, 0))
+        for blit in blits:
+            surface.blit(blit.surface, blit.rect)
+        spyral.util.scale_surface.clear(surface)
+        spyral.util._release_blits(dynamic)
+        # The children all live in this View, so they are all on adjacent
+        # layers; the lowest of them places the image correctly.
+        b = spyral.util._Blit(surface, (0, 0), spyral.Rect((0, 0), size),
+                              blits[0].layer, 0, True)
+        (target, sx, sy, ox, oy, crop_width, crop_height,
+         shown) = self._compose_chain(parent._get_blit_chain())
+        if shown:
+            b.transform(sx, sy, ox, oy, crop_width, crop_height)
+            target()._add_static_blit(self, b)
+
+    def _compose_chain(self, chain):
+        """
+        Returns a new chain that applies this View's offset, scale and crop,
+        followed by the given chain of its parent.
+        """
+        target, sx, sy, ox, oy, crop_width, crop_height, shown = chain
+        scale_x, scale_y = self._get_scale()
+        x, y = self._pos
+        if self._crop:
+            # The crop is in this View's output units, which the parent's
+            # chain scales
+            width = self._crop_size[0] * sx
+            height = self._crop_size[1] * sy
+            if crop_width is not None:
+                width = min(width, crop_width)
+                height = min(height, crop_height)
+            crop_width, crop_height = width, height
+        return (target, sx * scale_x, sy * scale_y,
+                ox + x * scale_x * sx, oy + y * scale_y * sy,
+                crop_width, crop_height, shown and self._visible)
+
+    def _get_chain(self):
+        """
+        Returns the composed transform from this View to the Scene, as a
+        (scene, scale_x, scale_y, offset_x, offset_y, crop_width, crop_height,
+        shown) tuple. A position p in this View is at p * scale + offset in
+        the Scene; areas are cropped to crop_width x crop_height (or not at
+        all, if they are ``None``); and `shown` is whether this View and every
+        View above it are visible. The chain is cached until this View or a
+        View above it changes.
+        """
+        if self._chain is None:
+            self._chain = self._compose_chain(self._parent()._get_chain())
+        return self._chain
+
+    def _get_blit_chain(self):
+        """
+        Like :func:`_get_chain`, but the chain ends at the nearest cached
+        View, which is where blits from this View's children are kept. The
+        first item is a weak reference to that View (or the Scene).
+        """
+        if self._blit_chain is None:
+            if self._cache:
+                self._blit_chain = (_wref(self), 1.0, 1.0, 0.0, 0.0,
+                                    None, None, self._visible)
+            else:
+                self._blit_chain = self._compose_chain(
+                    self._parent()._get_blit_chain())
+        return self._blit_chain
+
+    def _get_transform(self):
+        """
+        Returns the ((scale_x, scale_y), (offset_x, offset_y)) pair that takes
+        positions in this View to positions in the scene.
+        """
+        _, sx, sy, ox, oy, _, _, _ = self._get_chain()
+        return (sx, sy), (ox, oy)
+
+    def _invalidate_transform(self):
+        """
+        Forgets the cached chains of this View and every View below it.
+        """
+        self._chain = None
+        self._blit_chain = None
+        for view in self._child_views:
+            view._invalidate_transform()
 
     def _warp_collision_box(self, box):
         """
-        Transforms the given collision box according to this view's scaling,
-        cropping, and offset; then passes the box to this boxes parent.
+        Transforms the given collision box according to the scaling, cropping,
+        and offset of this view and every view above it at once.
         """
-        box.position += self.pos
-        box.apply_scale(self.scale)
-        if self.crop:
-            box.clip(spyral.Rect((0, 0), self.crop_size))
-        return self._parent()._warp_collision_box(box)
+        (scene, sx, sy, ox, oy,
+         crop_width, crop_height, _) = self._get_chain()
+        box.transform(sx, sy, ox, oy, crop_width, crop_height)
+        return scene()._warp_collision_box(box)
 
     def _set_collision_box(self):
         """
         Updates this View's collision box.
         """
         if self._mask is not None:
-            pos = self._mask.topleft - self._offset
-            area = spyral.Rect((0,0), self._mask.size)
+            x, y = self._mask.left, self._mask.top
+            width, height = self._mask.width, self._mask.height
         else:
-            pos = self._pos - self._offset
-            area = spyral.Rect((0,0), self.size)
-        c = spyral.util._CollisionBox(pos, area)
+            (x, y), (width, height) = self._pos, self._size
+        c = spyral.util._new_collision_box(x - self._offset[0],
+                                           y - self._offset[1],
+                                           0, 0, width, height)
         warped_box = self._parent()._warp_collision_box(c)
         self._scene()._set_collision_box(self, warped_box.rect)
 
@@ -482,7 +718,8 @@ class View(object):
                   'output_width', 'output_height', 'output_size',
                   'anchor', 'layer', 'layers', 'visible',
                   'scale', 'scale_x', 'scale_y',
-                  'crop', 'crop_width', 'crop_height', 'crop_size']
+                  'crop', 'crop_width', 'crop_height', 'crop_size',
+                  'cache', 'collision_group', 'category_bits', 'mask_bits']
         for property in simple:
             if property in properties:
                 value = properties.pop(property)
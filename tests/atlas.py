@@ -0,0 +1,93 @@
+try:
+    import _path
+except NameError:
+    pass
+import os
+import shutil
+import tempfile
+import itertools
+import pygame
+import spyral
+
+spyral.director.init((100, 100), headless=True)
+
+directory = tempfile.mkdtemp()
+try:
+    # A few differently-sized, differently-colored images
+    colors = {}
+    for index, size in enumerate([(30, 10), (12, 40), (16, 16), (8, 8),
+                                  (50, 20), (5, 33), (16, 16), (24, 9)]):
+        color = (index * 30, 255 - index * 30, 100, 255)
+        image = spyral.Image(size=size).fill(color)
+        name = "image%d" % index
+        pygame.image.save(image._surf, os.path.join(directory, name + ".png"))
+        colors[name] = (size, color)
+    open(os.path.join(directory, "notes.txt"), "w").close()
+
+    atlas = spyral.Atlas(directory, padding=2, extrude=1)
+    assert len(atlas) == len(colors)
+    assert sorted(atlas.names) == sorted(colors)
+
+    # Every image keeps its size and pixels, and shares the sheet's pixels
+    sheet_rect = pygame.Rect((0, 0), atlas.sheet.size)
+    for name, (size, color) in colors.iteritems():
+        image = atlas[name]
+        assert image is atlas[name]
+        assert tuple(image.size) == size
+        assert image._surf.get_parent() is atlas.sheet._surf
+        assert image._surf.get_at((0, 0)) == color
+        assert image._surf.get_at((size[0] - 1, size[1] - 1)) == color
+        region = atlas.get_region(name)
+        assert sheet_rect.contains(pygame.Rect(region.x - 1, region.y - 1,
+                                               region.w + 2, region.h + 2))
+        # Extrusion repeats the edges (including the corners)
+        assert atlas.sheet._surf.get_at((region.x - 1, region.y - 1)) == color
+        assert atlas.sheet._surf.get_at((region.right, region.bottom)) == color
+
+    # Declaring an atlas image opaque keeps it in the sheet
+    image = atlas["image3"]
+    image.opaque = True
+    assert image.opaque
+    assert image._surf.get_parent() is atlas.sheet._surf
+    image.opaque = None
+
+    # Regions, including extrusion and padding, never overlap
+    for first, second in itertools.combinations(atlas.names, 2):
+        a = atlas.get_region(first)
+        b = atlas.get_region(second)
+        a = pygame.Rect(a.x - 1, a.y - 1, a.w + 4, a.h + 4)
+        b = pygame.Rect(b.x - 1, b.y - 1, b.w + 2, b.h + 2)
+        assert not a.colliderect(b), (first, second)
+
+    # Saving and loading gives back the same atlas
+    atlas.save(os.path.join(directory, "sheet.png"))
+    loaded = spyral.atlas.load(os.path.join(directory, "sheet.json"))
+    assert loaded.names == atlas.names
+    for name, (size, color) in colors.iteritems():
+        assert (tuple(loaded.get_region(name).topleft) ==
+                tuple(atlas.get_region(name).topleft))
+        assert loaded[name]._surf.get_at((1, 1)) == color
+
+    # Atlas images can be drawn by sprites
+    scene = spyral.Scene((100, 100))
+    scene.background = spyral.Image(size=(100, 100)).fill((0, 0, 0))
+    spyral.director.push(scene)
+    sprite = spyral.Sprite(scene)
+    sprite.image = atlas["image2"]
+    sprite.pos = (10, 10)
+    assert sprite.image.opaque
+    scene._handle_event("director.render")
+    scene._draw()
+    assert scene._surface.get_at((15, 15)) == colors["image2"][1]
+
+    # A list of files works too, and a tiny max_size is refused
+    files = [os.path.join(directory, "image%d.png" % i) for i in range(3)]
+    assert spyral.Atlas(files).names == ["image0", "image1", "image2"]
+    try:
+        spyral.Atlas(files, max_size=32)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected the images not to fit"
+finally:
+    shutil.rmtree(directory)
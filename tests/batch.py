@@ -0,0 +1,89 @@
+try:
+    import _path
+except NameError:
+    pass
+import numpy
+import spyral
+
+resolution = (100, 100)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+scene.background = spyral.Image(size=resolution).fill((0, 0, 0))
+scene.layers = ["bottom", "top"]
+spyral.director.push(scene)
+red = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+blue = spyral.Image(size=(10, 10)).fill((0, 0, 255))
+
+def render():
+    scene._handle_event("director.render")
+    scene._draw()
+
+batch = spyral.SpriteBatch(scene, [red, blue], capacity=2)
+assert batch.add((0, 0)) == 0
+assert batch.add((20, 20), velocity=(10, 0), image=1) == 1
+new = batch.add_many([(50, 50), (200, 200), (60, 60)], images=1)
+assert len(batch) == 5 and new == slice(2, 5)
+
+# Sprites are drawn with their own images, except when off screen or hidden
+batch.visible[4] = False
+render()
+assert scene._surface.get_at((5, 5))[:3] == (255, 0, 0)
+assert scene._surface.get_at((25, 25))[:3] == (0, 0, 255)
+assert scene._surface.get_at((55, 55))[:3] == (0, 0, 255)
+assert scene._surface.get_at((65, 65))[:3] == (0, 0, 0)
+assert list(batch.on_screen()) == [True, True, True, False, True]
+
+# Updates move the sprites, and the old positions are cleared
+scene._handle_event("director.update", spyral.Event(delta=1.0))
+assert tuple(batch.positions[1]) == (30, 20)
+render()
+render()
+assert scene._surface.get_at((25, 25))[:3] == (0, 0, 0)
+assert scene._surface.get_at((35, 25))[:3] == (0, 0, 255)
+
+# Layers decide which sprite is on top, for sprites and batches alike
+sprite = spyral.Sprite(scene)
+sprite.image = spyral.Image(size=(10, 10)).fill((0, 255, 0))
+sprite.layer = "bottom"
+sprite.pos = (0, 0)
+batch.set_layer(0, "top")
+render()
+assert scene._surface.get_at((5, 5))[:3] == (255, 0, 0)
+batch.set_layer(0, "bottom")
+sprite.layer = "top"
+render()
+assert scene._surface.get_at((5, 5))[:3] == (0, 255, 0)
+
+# Collision queries return indices
+assert list(batch.collide_point((55, 55))) == [2]
+assert list(batch.collide_rect(spyral.Rect(0, 0, 40, 40))) == [0, 1]
+assert list(batch.collide_sprite(sprite)) == [0]
+others = spyral.SpriteBatch(scene, [red])
+others.add((58, 58))
+mine, theirs = batch.collide_batch(others)
+assert list(mine) == [2, 4] and list(theirs) == [0, 0]
+
+# Removing sprites keeps the order of the rest
+batch.remove(~batch.on_screen())
+assert len(batch) == 4
+batch.remove([0, 2])
+assert numpy.array_equal(batch.positions, [(30, 20), (60, 60)])
+batch.anchor = 'center'
+assert list(batch.collide_point((56, 56))) == [1]
+
+# Batches in Views are offset and scaled with them
+view = spyral.View(scene)
+view.pos = (10, 0)
+view.scale = 2
+inside = spyral.SpriteBatch(view, [blue])
+inside.add((20, 20))
+assert list(inside.collide_point((65, 45))) == [0]
+render()
+assert scene._surface.get_at((65, 45))[:3] == (0, 0, 255)
+
+batch.kill()
+others.kill()
+inside.kill()
+render()
+render()
+assert scene._surface.get_at((65, 45))[:3] == (0, 0, 0)
@@ -0,0 +1,97 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (320, 240)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+scene.background = spyral.Image(size=resolution).fill((0, 0, 255))
+spyral.director.push(scene)
+sprite = spyral.Sprite(scene)
+sprite.image = spyral.Image(size=(20, 20)).fill((255, 0, 0))
+sprite.pos = (100, 100)
+budget = scene.clock.budget
+
+def render():
+    scene._handle_event("director.render")
+    scene._draw()
+
+def settle(cost):
+    # Feed measurements until the budget is allowed to act again
+    for i in range(budget.COOLDOWN + 1):
+        budget.sample(cost)
+
+render()
+assert budget.hooks == ["smoothscale", "offscreen_updates",
+                        "particles", "resolution"]
+
+# Without a target, nothing changes
+settle(1.0)
+assert budget.level == 0
+
+# Over budget, the hooks are applied one at a time
+budget.target = 0.01
+budget.average = 1.0
+settle(1.0)
+assert budget.level == 1
+assert spyral.util._fast_scaling == 1
+settle(1.0)
+assert scene._offscreen_update_interval == budget.OFFSCREEN_UPDATE_INTERVAL
+settle(1.0)
+assert budget.particle_scale == budget.LOW_PARTICLE_SCALE
+settle(1.0)
+assert budget.level == 4
+assert scene._surface.get_size() == (160, 120)
+render()
+assert scene._display.get_at((110, 110))[:3] == (255, 0, 0)
+assert scene._display.get_at((10, 10))[:3] == (0, 0, 255)
+
+# Off-screen sprites are only updated every few ticks
+updates = []
+class Mover(spyral.Sprite):
+    def __init__(self):
+        spyral.Sprite.__init__(self, scene)
+        self.image = spyral.Image(size=(4, 4))
+        spyral.event.register('director.update', self.update, scene=scene)
+    def update(self, delta):
+        updates.append(delta)
+mover = Mover()
+mover.pos = (-100, -100)
+for tick in range(8):
+    scene._handle_event("director.update", spyral.Event(delta=0.5))
+    spyral.director._tick += 1
+assert len(updates) == 2, updates
+assert updates[0] == 0.5 * budget.OFFSCREEN_UPDATE_INTERVAL
+
+# With headroom, the hooks are restored most recent first
+budget.average = 0.0
+settle(0.0)
+assert budget.level == 3
+assert scene._surface is scene._display
+render()
+assert scene._display.get_at((110, 110))[:3] == (255, 0, 0)
+budget.reset()
+assert budget.level == 0
+assert spyral.util._fast_scaling == 0
+assert scene._offscreen_update_interval == 1
+assert budget.particle_scale == 1.0
+
+# A scene that leaves the stack gives back the quality that it lowered, so
+# that the scenes after it aren't stuck with it
+budget.target = 0.01
+budget.average = 1.0
+settle(1.0)
+assert spyral.util._use_fast_scaling()
+top = spyral.Scene(resolution)
+spyral.director.push(top)
+assert not spyral.util._use_fast_scaling()
+assert budget.level == 0
+top.clock.budget.target = 0.01
+top.clock.budget.average = 1.0
+for i in range(top.clock.budget.COOLDOWN + 1):
+    top.clock.budget.sample(1.0)
+assert spyral.util._use_fast_scaling()
+spyral.director.pop()
+assert not spyral.util._use_fast_scaling()
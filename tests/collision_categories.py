@@ -0,0 +1,75 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (640, 480)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+image = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+
+PLAYER, ENEMY, BULLET = 1, 2, 4
+
+def sprite(pos, category=None, mask=None):
+    s = spyral.Sprite(scene)
+    s.image = image
+    s.pos = pos
+    if category is not None:
+        s.category_bits = category
+    if mask is not None:
+        s.mask_bits = mask
+    return s
+
+player = sprite((0, 0), PLAYER)
+enemy = sprite((5, 5), ENEMY)
+bullet = sprite((2, 2), BULLET, ENEMY)
+decoration = sprite((3, 3), 0)
+plain = sprite((4, 4))
+assert plain.category_bits == 1 and plain.mask_bits == ~0
+
+# Both sides have to accept each other
+assert scene.collide_sprites(player, enemy)
+assert scene.collide_sprites(bullet, enemy)
+assert not scene.collide_sprites(bullet, player)
+assert not scene.collide_sprites(player, bullet)
+assert not scene.collide_sprites(decoration, player)
+everyone = [player, enemy, bullet, decoration, plain]
+pairs = set(frozenset(pair) for pair in scene.collision_pairs(everyone))
+assert pairs == set([frozenset([player, enemy]), frozenset([bullet, enemy]),
+                     frozenset([player, plain]), frozenset([enemy, plain])])
+
+# Categories without any members are never searched
+assert set(scene._collision_indexes) == set([PLAYER, ENEMY, BULLET])
+assert set(scene.sprites_at((6, 6))) == set([player, enemy, bullet, plain])
+assert set(scene.sprites_at((6, 6), ENEMY | BULLET)) == set([enemy, bullet])
+assert scene.sprites_in_rect(spyral.Rect(0, 0, 20, 20), ENEMY) == [enemy]
+hits = scene.raycast((0, 8), (1, 0), mask=ENEMY)
+assert [hit[0] for hit in hits] == [enemy]
+assert scene.segment_query((0, 8), (20, 8), mask=0) == []
+
+# By default sprites collide with every category, however high its bit
+BOSS = 1 << 20
+boss = sprite((8, 8), BOSS)
+assert scene.collide_sprites(boss, plain)
+assert boss in scene.sprites_at((9, 9))
+assert not scene.collide_sprites(boss, bullet)
+boss.kill()
+
+# Changing the bits moves sprites between categories
+enemy.category_bits = BULLET
+assert scene.sprites_at((6, 6), ENEMY) == []
+assert not scene.collide_sprites(bullet, enemy)
+assert ENEMY not in scene._collision_indexes
+decoration.category_bits = ENEMY
+assert scene.sprites_at((6, 6), ENEMY) == [decoration]
+assert scene.collide_sprites(bullet, decoration)
+decoration.kill()
+assert scene.sprites_at((6, 6), ENEMY) == []
+assert decoration not in scene._collision_filters
+
+# Swept collisions and collision groups respect the bits too
+scene._handle_event("director.pre_update")
+bullet.x = 300
+assert scene.sweep_sprites(bullet, player) is None
+assert scene.collision_pairs([bullet], [player], swept=True) == []
@@ -0,0 +1,74 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (640, 480)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+image = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+
+def sprite(pos, group):
+    s = spyral.Sprite(scene)
+    s.image = image
+    s.pos = pos
+    s.collision_group = group
+    return s
+
+events = []
+def record(name):
+    def handler(event):
+        events.append((name, event.first, event.second))
+    return handler
+handlers = dict((name, record(name)) for name in ("enter", "stay", "exit"))
+for name, handler in handlers.iteritems():
+    spyral.event.register("collision.bullets.enemies." + name, handler,
+                          scene=scene)
+
+def tick():
+    del events[:]
+    scene._handle_event("director.post_update")
+    return sorted(events)
+
+bullet = sprite((0, 0), 'bullets')
+enemy = sprite((5, 5), 'enemies')
+far = sprite((300, 300), 'enemies')
+decoration = sprite((2, 2), None)
+scene.add_collision_group('bullets', 'enemies')
+
+assert tick() == [("enter", bullet, enemy)]
+assert tick() == [("stay", bullet, enemy)]
+bullet.pos = (295, 295)
+assert sorted(tick()) == sorted([("exit", bullet, enemy),
+                                 ("enter", bullet, far)])
+# Killing a sprite ends its contacts
+far.kill()
+assert tick() == [("exit", bullet, far)]
+assert tick() == []
+
+# Changing groups
+enemy.collision_group = 'bullets'
+bullet.pos = (0, 0)
+assert tick() == []
+enemy.collision_group = 'enemies'
+assert tick() == [("enter", bullet, enemy)]
+
+# Contacts within a single group are only sent once per pair
+within = []
+spyral.event.register("collision.enemies.enemies.enter",
+                      lambda first, second: within.append((first, second)),
+                      scene=scene)
+other = sprite((8, 8), 'enemies')
+scene.add_collision_group('enemies')
+tick()
+assert len(within) == 1 and set(within[0]) == set([enemy, other])
+tick()
+assert len(within) == 1
+
+# Removing a group stops its events
+scene.remove_collision_group('bullets', 'enemies')
+scene.remove_collision_group('enemies')
+bullet.pos = (400, 400)
+assert tick() == []
+assert "director.post_update" not in scene._namespaces
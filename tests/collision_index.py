@@ -0,0 +1,83 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (640, 480)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+image = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+
+def sprite(parent, pos):
+    s = spyral.Sprite(parent)
+    s.image = image
+    s.pos = pos
+    return s
+
+a = sprite(scene, (0, 0))
+b = sprite(scene, (5, 5))
+c = sprite(scene, (10, 0))
+far = sprite(scene, (300, 300))
+
+# Bulk queries agree with the pairwise ones
+assert set(scene.sprites_in_rect(spyral.Rect(0, 0, 6, 6))) == set([a, b])
+assert scene.sprites_in_rect(spyral.Rect(400, 400, 10, 10)) == []
+assert set(scene.sprites_at((7, 7))) == set([a, b])
+assert scene.sprites_at((10, 5)) == []
+everyone = [a, b, c, far]
+for first in everyone:
+    for point in [(7, 7), (10, 5), (12, 3), (305, 305)]:
+        assert ((first in scene.sprites_at(point)) ==
+                scene.collide_point(first, point))
+
+pairs = scene.collision_pairs(everyone)
+assert len(pairs) == 2
+assert set(frozenset(pair) for pair in pairs) == set([frozenset([a, b]),
+                                                      frozenset([b, c])])
+for first in everyone:
+    for second in everyone:
+        if first is not second:
+            assert (((first, second) in scene.collision_pairs([first],
+                                                               [second])) ==
+                    scene.collide_sprites(first, second))
+
+# The index follows sprites as they move, and forgets them when they die
+b.pos = (200, 200)
+assert scene.collision_pairs(everyone) == []
+far.pos = (205, 205)
+assert scene.collision_pairs([b], [far]) == [(b, far)]
+far.kill()
+assert scene.collision_pairs([b], everyone) == []
+assert scene.sprites_at((207, 207)) == [b]
+
+# Views are indexed too
+view = spyral.View(scene)
+view.pos = (100, 100)
+view.crop = True
+view.crop_size = (50, 50)
+inner = sprite(view, (0, 0))
+assert set(scene.sprites_at((105, 105))) == set([view, inner])
+view.kill()
+assert scene.sprites_at((105, 105)) == []
+
+# Points on the edges, and just inside of boxes at negative positions, are
+# treated the same as by collide_point; so are scaled and rotated sprites
+import math
+edge = sprite(scene, (-10, 400))
+wide = sprite(scene, (400, 400))
+wide.scale = 3
+turned = spyral.Sprite(scene)
+turned.image = spyral.Image(size=(40, 4)).fill((0, 255, 0))
+turned.pos = (500, 300)
+turned.angle = math.pi / 2
+for first in [edge, wide, turned]:
+    for point in [(-10, 405), (-9.5, 405), (-0.5, 405), (0, 405),
+                  (400, 405), (425, 405), (430, 405),
+                  (505, 305), (520, 285), (520, 315), (518, 290)]:
+        assert ((first in scene.sprites_at(point)) ==
+                scene.collide_point(first, point)), (first, point)
+assert edge in scene.sprites_at((-0.5, 405))
+assert wide in scene.sprites_at((425, 405))
+assert turned in scene.sprites_at((520, 315))
+assert turned not in scene.sprites_at((505, 305))
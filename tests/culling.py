@@ -0,0 +1,60 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (100, 100)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+scene.background = spyral.Image(size=resolution).fill((0, 0, 0))
+spyral.director.push(scene)
+image = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+
+def render():
+    scene._handle_event("director.render")
+    scene._draw()
+
+def sprite(parent, pos):
+    s = spyral.Sprite(parent)
+    s.image = image
+    s.pos = pos
+    return s
+
+# Sprites off screen are skipped, sprites partly on screen are not
+view = spyral.View(scene)
+inside = sprite(view, (50, 50))
+edge = sprite(view, (-5, 95))
+outside = sprite(view, (150, 50))
+render()
+assert scene.culled == 1
+assert len(scene._blits) == 0
+assert scene._surface.get_at((0, 99))[:3] == (255, 0, 0)
+
+# The View's chain of transforms is cached, and follows changes to it
+assert view._get_chain() is view._get_chain()
+view.pos = (-100, 0)
+assert view._get_transform()[1] == (-100, 0)
+render()
+assert scene.culled == 2
+assert scene._surface.get_at((55, 55))[:3] == (255, 0, 0)
+assert scene._surface.get_at((0, 99))[:3] == (0, 0, 0)
+
+# Scaling a View above also moves the sprites in its children
+inner = spyral.View(view)
+far = sprite(inner, (120, 0))
+render()
+assert scene.culled == 2
+view.scale = 0.5
+render()
+assert inner._get_transform() == ((0.5, 0.5), (-50, 0))
+assert scene.culled == 2
+assert scene._surface.get_at((12, 2))[:3] == (255, 0, 0)
+
+# Hidden Views skip all of their sprites
+view.visible = False
+render()
+assert scene.culled == 4
+view.visible = True
+render()
+assert scene.culled == 2
@@ -0,0 +1,52 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (100, 100)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+calls = []
+
+class Handler(object):
+    def update(self, delta, unused=None):
+        calls.append(('update', delta, unused))
+    def both(self, event, delta):
+        calls.append(('both', event.delta, delta))
+handler = Handler()
+
+def free(pos, button='left'):
+    calls.append(('free', pos, button))
+
+spyral.event.register("test.update", handler.update, scene=scene)
+spyral.event.register("test.update", handler.both, scene=scene)
+spyral.event.register("test.click", free, scene=scene)
+spyral.event.register("test.explicit", free, args=('pos',), scene=scene)
+spyral.event.register("test.keywords", free, kwargs=('pos',), scene=scene)
+
+# Arguments are filled in from the event's attributes, or their defaults
+scene._handle_event("test.update", spyral.Event(delta=2))
+assert ('update', 2, None) in calls and ('both', 2, 2) in calls
+scene._handle_event("test.click", spyral.Event(pos=(1, 2)))
+scene._handle_event("test.explicit", spyral.Event(pos=(3, 4), button='no'))
+scene._handle_event("test.keywords", spyral.Event(pos=(5, 6)))
+assert calls[2:] == [('free', (1, 2), 'left'), ('free', (3, 4), 'left'),
+                     ('free', (5, 6), 'left')]
+
+# A missing argument is an error
+try:
+    scene._handle_event("test.click", spyral.Event())
+except TypeError:
+    pass
+else:
+    assert False, "Missing arguments should raise a TypeError"
+
+# Dynamic handlers are looked up (and bound) when they are called
+del calls[:]
+scene.later = lambda delta: calls.append(('first', delta))
+spyral.event.register_dynamic("test.dynamic", "later", scene=scene)
+scene._handle_event("test.dynamic", spyral.Event(delta=1))
+scene.later = lambda pos: calls.append(('second', pos))
+scene._handle_event("test.dynamic", spyral.Event(delta=1, pos=7))
+assert calls == [('first', 1), ('second', 7)]
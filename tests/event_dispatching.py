@@ -25,4 +25,35 @@ test("input.keyboard.down", "input.keyboard.down.q", "input.keyboard.down",
 test("input.keyboard.down.quoteright", "input.keyboard.down", 
                                        "input.keyboard.down.quoteright")
 test("input.mouse.down", "input.mouse.down", "input.mouse")
-test("animation.Sprite.x.end", "animation.Sprite.x.end")
\ No newline at end of file
+test("animation.Sprite.x.end", "animation.Sprite.x.end")
+
+# Namespaces are compared as strings, so "input.key" hears the keyboard
+my_scene._namespaces = ("input.key", "input", "")
+test("input.keyboard.down", "input.key", "input", "")
+test("", "input.key", "input", "")
+
+# Resolved namespaces are updated when handlers are registered or unregistered
+calls = []
+def keys(): calls.append("keys")
+def down(): calls.append("down")
+spyral.event.register("input.keyboard.*", keys, scene=my_scene)
+my_scene._handle_event("input.keyboard.down")
+spyral.event.register("input.keyboard.down", down, scene=my_scene)
+my_scene._handle_event("input.keyboard.down")
+assert sorted(calls) == ["down", "keys", "keys"]
+my_scene._unregister("input.keyboard.*", keys)
+assert "input.keyboard" not in my_scene._namespaces
+del calls[:]
+my_scene._handle_event("input.keyboard.down")
+assert calls == ["down"]
+
+# A handler registered while an event is being handled still receives it,
+# if its namespace was already being sent the event
+def late(): calls.append("late")
+def early():
+    calls.append("early")
+    spyral.event.register("input.keyboard.down", late, scene=my_scene)
+spyral.event.register("input.keyboard.down", early, scene=my_scene)
+del calls[:]
+my_scene._handle_event("input.keyboard.down")
+assert calls == ["down", "early", "late"]
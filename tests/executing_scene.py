@@ -0,0 +1,74 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (100, 100)
+spyral.director.init(resolution, headless=True)
+seen = []
+
+class Inner(spyral.Scene):
+    def __init__(self):
+        spyral.Scene.__init__(self, resolution)
+        seen.append(("inner", spyral._get_executing_scene()))
+
+class Outer(spyral.Scene):
+    def __init__(self):
+        spyral.Scene.__init__(self, resolution)
+        # Handlers registered without a scene go to the scene being built
+        spyral.event.register("test.ping", self.ping)
+        seen.append(("outer", spyral._get_executing_scene()))
+
+    def ping(self):
+        seen.append(("ping", spyral._get_executing_scene()))
+        self.inner = Inner()
+        seen.append(("after", spyral._get_executing_scene()))
+        spyral.event.queue("test.queued")
+
+outer = Outer()
+assert seen == [("outer", outer)]
+assert "test.ping" in outer._namespaces
+outer._handle_event("test.ping")
+assert seen[1:] == [("ping", outer), ("inner", outer.inner), ("after", outer)]
+assert outer._events == [("test.queued", None)]
+
+# Once nothing is running, the scene stack is empty again
+assert spyral.core._executing_scenes == []
+
+# Outside of any scene, the call stack is searched instead
+def outside():
+    return spyral._get_executing_scene()
+assert outside() is None
+
+# Scenes can be subclassed with another metaclass, and the rest of their
+# __init__ still registers with them, even inside another scene's handler
+import abc
+class Abstract(spyral.Scene):
+    __metaclass__ = abc.ABCMeta
+    def __init__(self):
+        spyral.Scene.__init__(self, resolution)
+        spyral.event.register("test.abstract", self.ping)
+    @abc.abstractmethod
+    def ping(self):
+        pass
+
+class Concrete(Abstract):
+    def ping(self):
+        pass
+
+def build():
+    outer.built = Concrete()
+spyral.event.register("test.build", build, scene=outer)
+outer._handle_event("test.build")
+assert "test.abstract" in outer.built._namespaces
+assert "test.abstract" not in outer._namespaces
+assert spyral.core._executing_scenes == []
+try:
+    Abstract()
+except TypeError:
+    pass
+else:
+    assert False, "Abstract scenes can't be built"
+concrete = Concrete()
+assert "test.abstract" in concrete._namespaces
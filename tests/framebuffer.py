@@ -0,0 +1,78 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (200, 100)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene((100, 50))
+scene.background = spyral.Image(size=(100, 50)).fill((0, 0, 255))
+spyral.director.push(scene)
+image = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+sprite = spyral.Sprite(scene)
+sprite.image = image
+sprite.pos = (20, 10)
+
+def render():
+    scene._handle_event("director.render")
+    scene._draw()
+
+# Without a framebuffer, every blit is scaled up to the window
+render()
+assert scene._surface is scene._display
+assert scene._display.get_at((45, 25))[:3] == (255, 0, 0)
+
+# With one, blits are drawn at the scene's size, and only the framebuffer is
+# scaled up
+scene.framebuffer = True
+assert scene._surface.get_size() == (100, 50)
+assert scene._blit_scale == (1, 1)
+render()
+assert scene._surface.get_at((25, 15))[:3] == (255, 0, 0)
+assert scene._display.get_at((45, 25))[:3] == (255, 0, 0)
+assert scene._display.get_at((35, 25))[:3] == (0, 0, 255)
+
+# Moving the sprite only presents the regions that changed
+sprite.pos = (60, 30)
+render()
+assert scene._display.get_at((45, 25))[:3] == (0, 0, 255)
+assert scene._display.get_at((125, 65))[:3] == (255, 0, 0)
+
+# The render scale applies on top of the framebuffer
+scene._set_render_scale(0.5)
+assert scene._surface.get_size() == (50, 25)
+render()
+assert scene._display.get_at((125, 65))[:3] == (255, 0, 0)
+scene._set_render_scale(1.0)
+
+# And it can be turned off again
+scene.framebuffer = False
+assert scene._surface is scene._display
+render()
+assert scene._display.get_at((125, 65))[:3] == (255, 0, 0)
+
+# When the framebuffer doesn't divide evenly into the window, presenting only
+# the changed regions samples the same pixels as scaling the whole frame
+import pygame
+odd = spyral.Scene((70, 45))
+odd.background = spyral.Image(size=(70, 45)).fill((0, 0, 255))
+odd.framebuffer = True
+spyral.director.replace(odd)
+pattern = spyral.Image(size=(13, 11))
+for x in range(13):
+    for y in range(11):
+        pattern._surf.set_at((x, y), (x * 19, y * 23, (x + y) * 5))
+pattern._version += 1
+striped = spyral.Sprite(odd)
+striped.image = pattern
+striped.pos = (3, 4)
+for pos in [(17, 9), (31, 22), (50, 30)]:
+    odd._handle_event("director.render")
+    odd._draw()
+    striped.pos = pos
+odd._handle_event("director.render")
+odd._draw()
+full = pygame.transform.scale(odd._surface, odd._display.get_size())
+assert (pygame.image.tostring(full, 'RGB') ==
+        pygame.image.tostring(odd._display, 'RGB'))
@@ -0,0 +1,93 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (100, 100)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+calls = []
+
+class Listener(object):
+    def __init__(self, name, priority=0):
+        self.name = name
+        spyral.event.register("test.ping", self.ping, priority=priority,
+                              scene=scene)
+        spyral.event.register("test.other", self.ping, scene=scene)
+    def ping(self):
+        calls.append(self.name)
+
+# Handlers are kept in order of priority, then of registration
+first = Listener("first", 1)
+second = Listener("second")
+third = Listener("third", 1)
+scene._handle_event("test.ping")
+assert calls == ["second", "first", "third"]
+
+# Unregistering one handler leaves the others
+scene._unregister("test.ping", first.ping)
+del calls[:]
+scene._handle_event("test.ping")
+assert calls == ["second", "third"]
+scene._handle_event("test.other")
+assert calls == ["second", "third", "first", "second", "third"]
+
+# Handlers of garbage collected objects are removed on their own
+del third
+del calls[:]
+scene._handle_event("test.ping")
+scene._handle_event("test.other")
+assert calls == ["second", "first", "second"]
+
+# Killing a sprite removes its handlers
+class Bullet(spyral.Sprite):
+    def __init__(self):
+        spyral.Sprite.__init__(self, scene)
+        self.image = spyral.Image(size=(2, 2))
+        spyral.event.register("director.update", self.update, scene=scene)
+        spyral.event.register("test.bullet", self.update, scene=scene)
+    def update(self):
+        calls.append(self)
+bullets = [Bullet() for i in range(5)]
+bullets[2].kill()
+del calls[:]
+scene._handle_event("test.bullet")
+assert calls == bullets[:2] + bullets[3:]
+for bullet in bullets:
+    bullet.kill()
+assert "test.bullet" not in scene._namespaces
+
+# Removing handlers only forgets the namespaces cached for the event types
+# that they were sent, and many owners going at once are swept in one pass
+class Keeper(object):
+    def __init__(self):
+        spyral.event.register("test.keep", self.keep, scene=scene)
+    def keep(self):
+        calls.append("keep")
+keeper = Keeper()
+bullets = [Bullet() for i in range(200)]
+scene._handle_event("test.keep")
+scene._handle_event("test.bullet")
+kept = scene._resolved_namespaces["test.keep"]
+for bullet in bullets[1:]:
+    bullet.kill()
+assert len(scene._handlers["test.bullet"]) == 200
+del calls[:]
+scene._handle_event("test.bullet")
+assert calls == bullets[:1]
+assert len(scene._handlers["test.bullet"]) == 1
+assert scene._resolved_namespaces["test.keep"] is kept
+del bullets[1:]
+bullets[0].kill()
+assert "test.bullet" not in scene._namespaces
+
+# Removing a few sort keys and removing many leave the same handlers
+from spyral.handlerlist import _HandlerList
+for removed in (set([3, 50]), set(range(0, 100, 2))):
+    handlers = _HandlerList()
+    keys = [handlers.add(index, index % 3) for index in range(100)]
+    handlers.remove_keys(set(keys[index] for index in removed))
+    assert list(handlers) == sorted((index for index in range(100)
+                                     if index not in removed),
+                                    key=lambda index: (index % 3, index))
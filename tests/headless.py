@@ -0,0 +1,51 @@
+try:
+    import _path
+except NameError:
+    pass
+import os
+import time
+import spyral
+
+# Headless mode picks SDL's dummy drivers, but keeps drivers chosen already
+os.environ.pop('SDL_VIDEODRIVER', None)
+os.environ['SDL_AUDIODRIVER'] = 'disk'
+resolution = (320, 240)
+spyral.director.init(resolution, max_ups=30, max_fps=30,
+                     headless=True, frame_pacing=False)
+assert spyral.director.is_headless()
+assert os.environ['SDL_VIDEODRIVER'] == 'dummy'
+assert os.environ['SDL_AUDIODRIVER'] == 'disk'
+
+class Counter(spyral.Scene):
+    def __init__(self):
+        spyral.Scene.__init__(self, resolution)
+        self.background = spyral.Image(size=resolution).fill((0, 0, 0))
+        self.sprite = spyral.Sprite(self)
+        self.sprite.image = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+        self.updates = 0
+        self.frames = 0
+        self.deltas = []
+        spyral.event.register('director.update', self.update)
+        spyral.event.register('director.render', self.render)
+
+    def update(self, delta):
+        self.updates += 1
+        self.deltas.append(round(delta, 6))
+        self.sprite.x += 1
+        if self.updates == 300:
+            spyral.director.quit()
+
+    def render(self):
+        self.frames += 1
+
+scene = Counter()
+start = time.time()
+spyral.director.run(scene=scene)
+elapsed = time.time() - start
+
+# Ten seconds of game time are simulated without waiting for them
+assert scene.updates == 300, scene.updates
+assert scene.frames >= 299, scene.frames
+# Every update after the first one is exactly one step of game time
+assert set(scene.deltas[1:]) == set([round(1.0 / 30, 6)]), scene.deltas
+assert elapsed < 5, elapsed
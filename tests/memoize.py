@@ -0,0 +1,75 @@
+try:
+    import _path
+except NameError:
+    pass
+import pygame
+import spyral
+from spyral.memoize import _ImageMemoize
+
+spyral.director.init((100, 100), headless=True)
+calls = []
+def scale(surface, size):
+    calls.append(size)
+    return spyral.util.scale_surface.func(surface, size)
+
+# Each surface is 10 * 10 * 4 = 400 bytes; the cache holds three of them
+cache = _ImageMemoize(scale, max_bytes=1200)
+first = spyral.Image(size=(5, 5))._surf
+second = spyral.Image(size=(5, 5))._surf
+result = cache(first, (10, 10))
+assert cache(first, (10, 10)) is result
+assert (cache.hits, cache.misses) == (1, 1)
+assert cache.bytes == 400
+
+# Results that are the surface itself don't count against the budget
+assert cache(first, (5, 5)) is first
+assert cache.bytes == 400
+
+# Clearing a surface only removes its own results
+cache(second, (10, 10))
+assert cache(second, (10, 10.0)) is cache(second, (10, 10))
+assert len(cache) == 3
+cache.clear(first)
+assert len(cache) == 1 and cache.bytes == 400
+assert first not in cache._by_surface
+assert second in cache._by_surface
+cache(first, (10, 10))
+assert len(calls) == 4
+
+# The least recently used results are evicted to stay in budget
+cache(first, (10, 11))
+assert cache.evictions == 1
+assert second not in cache._by_surface
+cache(first, (11, 10))
+assert cache.evictions == 2
+assert cache.bytes <= cache.max_bytes
+cache.clear()
+assert len(cache) == 0 and cache.bytes == 0 and not cache._by_surface
+
+# Drawing on an image clears its scaled copies
+image = spyral.Image(size=(5, 5))
+scaled = spyral.util.scale_surface(image._surf, (10, 10))
+assert spyral.util.scale_surface(image._surf, (10, 10)) is scaled
+image.fill((255, 0, 0))
+assert spyral.util.scale_surface(image._surf, (10, 10)) is not scaled
+
+# Lowering the scaling quality doesn't reuse (or leave behind) results made
+# at the other quality
+from spyral import util
+image = spyral.Image(size=(5, 5)).fill((255, 0, 0))
+image.draw_rect((0, 0, 255), (0, 0), (2, 5))
+def expected(scaler):
+    size = (13, 13)
+    return scaler(image._surf, size,
+                  spyral.image._new_matching_surface(image._surf, size))
+def same(first, second):
+    return (pygame.image.tostring(first, "RGBA") ==
+            pygame.image.tostring(second, "RGBA"))
+smooth = util.scale_surface(image._surf, (13, 13))
+assert same(smooth, expected(pygame.transform.smoothscale))
+util._lower_scaling_quality()
+fast = util.scale_surface(image._surf, (13, 13))
+assert same(fast, expected(pygame.transform.scale))
+assert not same(fast, smooth)
+util._restore_scaling_quality()
+assert util.scale_surface(image._surf, (13, 13)) is smooth
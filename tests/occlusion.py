@@ -0,0 +1,97 @@
+try:
+    import _path
+except NameError:
+    pass
+import math
+import pygame
+import spyral
+
+resolution = (100, 100)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+scene.background = spyral.Image(size=resolution).fill((0, 0, 255))
+scene.layers = ['bottom', 'top']
+spyral.director.push(scene)
+
+def render():
+    scene._handle_event("director.render")
+    scene._draw()
+
+# Opacity is found by looking at an image's pixels
+image = spyral.Image(size=(10, 10))
+assert not image.opaque
+image.fill((255, 0, 0))
+assert image.opaque
+image.draw_point((0, 0, 0, 128), (5, 5))
+assert not image.opaque
+
+# Declaring an image opaque drops its alpha channel
+panel_image = spyral.Image(size=(60, 60)).fill((0, 255, 0))
+panel_image.opaque = True
+assert not panel_image._surf.get_flags() & pygame.SRCALPHA
+panel_image.opaque = False
+assert panel_image._surf.get_flags() & pygame.SRCALPHA
+panel_image.opaque = True
+
+# Quarter turns keep an image opaque, other angles don't
+turned = spyral.Image(size=(10, 20)).fill((0, 255, 0))
+turned.opaque = True
+turned.rotate(90)
+assert turned.opaque and tuple(turned.size) == (20, 10)
+assert not turned._surf.get_flags() & pygame.SRCALPHA
+turned.rotate(30)
+assert not turned.opaque
+assert turned._surf.get_at((0, 0))[3] == 0
+
+# Rotated sprites aren't opaque, and their corners stay transparent
+spinner = spyral.Sprite(scene)
+spinner.image = panel_image
+spinner.angle = math.pi / 4
+assert not spinner._opaque
+assert spinner._transform_image.get_at((0, 0))[3] == 0
+spinner.kill()
+
+# A sprite underneath an opaque static panel isn't drawn
+sprite = spyral.Sprite(scene)
+sprite.image = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+sprite.layer = 'bottom'
+sprite.pos = (30, 30)
+panel = spyral.Sprite(scene)
+panel.image = panel_image
+panel.layer = 'top'
+panel.pos = (20, 20)
+assert panel._opaque
+for i in range(8):
+    sprite.x += 1
+    render()
+assert panel._static
+assert scene.occluded == 1
+assert scene._display.get_at((35, 35))[:3] == (0, 255, 0)
+assert scene._display.get_at((10, 10))[:3] == (0, 0, 255)
+
+# Partly covered sprites are still drawn
+sprite.pos = (75, 50)
+render()
+assert scene.occluded == 0
+assert scene._display.get_at((82, 55))[:3] == (255, 0, 0)
+
+# Once the panel is gone, the sprite shows again
+sprite.pos = (30, 30)
+render()
+assert scene.occluded == 1
+panel.kill()
+render()
+assert scene._display.get_at((35, 35))[:3] == (255, 0, 0)
+assert scene._display.get_at((50, 50))[:3] == (0, 0, 255)
+
+# A TileMap with no gaps covers what is underneath it too
+tile = spyral.Image(size=(10, 10)).fill((255, 255, 0))
+tiles = spyral.TileMap(scene, [[0] * 10] * 10, [tile])
+tiles.layer = 'top'
+render()
+assert scene.occluded == 1
+assert scene._display.get_at((35, 35))[:3] == (255, 255, 0)
+tiles[3, 3] = tiles.EMPTY
+render()
+assert scene.occluded == 0
+assert scene._display.get_at((35, 35))[:3] == (255, 0, 0)
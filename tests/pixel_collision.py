@@ -0,0 +1,94 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+from spyral.sprite import transform_cache
+
+resolution = (640, 480)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+
+# Only the bottom right quarter of the image has any pixels
+corner = spyral.Image(size=(20, 20)).fill((0, 0, 0, 0))
+corner.draw_rect((255, 0, 0), (10, 10), (10, 10))
+block = spyral.Image(size=(20, 20)).fill((0, 255, 0))
+
+def sprite(image, pos, collision='box'):
+    s = spyral.Sprite(scene)
+    s.image = image
+    s.pos = pos
+    s.collision = collision
+    return s
+
+pixel = sprite(corner, (0, 0), 'pixel')
+box = sprite(block, (-10, -10))
+assert not box.collide_sprite(pixel)
+assert not pixel.collide_sprite(box)
+pixel.collision = 'box'
+assert box.collide_sprite(pixel)
+pixel.collision = 'pixel'
+box.pos = (-8, -8)
+assert box.collide_sprite(pixel)
+
+# Points and rects
+assert not pixel.collide_point((5, 5))
+assert pixel.collide_point((15, 15))
+assert not pixel.collide_rect(spyral.Rect(1, 1, 9, 9))
+assert pixel.collide_rect(spyral.Rect(5, 5, 6, 6))
+assert pixel not in scene.sprites_at((5, 5))
+assert pixel in scene.sprites_at((15, 15))
+assert pixel not in scene.sprites_in_rect(spyral.Rect(1, 1, 9, 9))
+
+# Two pixel-perfect sprites
+other = sprite(corner, (-10, -10), 'pixel')
+assert not other.collide_sprite(pixel)
+other.pos = (-1, -1)
+assert other.collide_sprite(pixel)
+assert (other, pixel) in scene.collision_pairs([other], [pixel])
+other.pos = (-10, -10)
+assert scene.collision_pairs([other], [pixel]) == []
+
+# Flipping, scaling and masks change the bitmask
+pixel.flip_x = True
+assert pixel.collide_point((5, 15))
+assert not pixel.collide_point((15, 15))
+pixel.flip_x = False
+pixel.scale = 2
+assert pixel.collide_point((30, 30))
+assert not pixel.collide_point((15, 15))
+pixel.scale = 1
+# The box is the size of the mask, and holds the pixels inside of it
+pixel.mask = spyral.Rect(5, 5, 10, 10)
+assert pixel.collide_point((7, 7))
+assert not pixel.collide_point((3, 3))
+pixel.mask = None
+
+# Sprites in the same pose share their bitmask
+twin = sprite(corner, (100, 100), 'pixel')
+assert twin._get_bitmask((20, 20)) is pixel._get_bitmask((20, 20))
+assert len(transform_cache.masks) > 0
+
+# Scaled views scale the bitmask too
+view = spyral.View(scene)
+view.scale = 2
+inside = spyral.Sprite(view)
+inside.image = corner
+inside.pos = (100, 100)
+inside.collision = 'pixel'
+assert inside.collide_point((225, 225))
+assert not inside.collide_point((205, 205))
+
+# Faint pixels still count, only fully transparent ones don't
+faint = spyral.Image(size=(20, 20)).fill((0, 0, 0, 0))
+faint.draw_rect((255, 0, 0, 10), (0, 0), (10, 10))
+ghost = sprite(faint, (300, 300), 'pixel')
+assert ghost.collide_point((305, 305))
+assert not ghost.collide_point((315, 315))
+
+try:
+    pixel.collision = 'circle'
+except ValueError:
+    pass
+else:
+    assert False, "Unknown collision modes should be rejected"
@@ -0,0 +1,113 @@
+try:
+    import _path
+except NameError:
+    pass
+import pygame
+from spyral.rectset import _RectSet
+
+screen = pygame.Rect(0, 0, 640, 480)
+
+# Overlapping rects are merged into their union
+rects = _RectSet(screen)
+rects.add(pygame.Rect(10, 10, 20, 20))
+rects.add(pygame.Rect(15, 15, 20, 20))
+assert list(rects) == [pygame.Rect(10, 10, 25, 25)], list(rects)
+
+# Adjacent rects waste nothing, so they are merged
+rects = _RectSet(screen)
+rects.add(pygame.Rect(0, 0, 10, 10))
+rects.add(pygame.Rect(10, 0, 10, 10))
+assert list(rects) == [pygame.Rect(0, 0, 20, 10)], list(rects)
+
+# Distant rects are kept apart
+rects = _RectSet(screen)
+rects.add(pygame.Rect(0, 0, 10, 10))
+rects.add(pygame.Rect(100, 100, 10, 10))
+assert len(rects) == 2
+assert rects.collides(pygame.Rect(105, 105, 2, 2))
+assert not rects.collides(pygame.Rect(50, 50, 2, 2))
+
+# Rects are clipped to the bounds, and empty ones are dropped
+rects = _RectSet(screen)
+rects.add(pygame.Rect(-10, -10, 20, 20))
+rects.add(pygame.Rect(700, 700, 20, 20))
+assert list(rects) == [pygame.Rect(0, 0, 10, 10)], list(rects)
+
+# Covering most of the bounds collapses the set to the bounds
+rects = _RectSet(screen, coverage=0.5)
+rects.add(pygame.Rect(0, 0, 640, 200))
+assert not rects.full
+rects.add(pygame.Rect(0, 300, 640, 180))
+assert rects.full
+assert list(rects) == [screen], list(rects)
+
+# Small overlapping rects are merged too
+rects = _RectSet(screen)
+for i in range(300):
+    rects.add(pygame.Rect(100 + i % 30, 100 + i // 30, 16, 16))
+assert list(rects) == [pygame.Rect(100, 100, 45, 25)], list(rects)
+
+# Duplicate rects are merged into one
+rects = _RectSet(screen)
+for i in range(5):
+    rects.add(pygame.Rect(50, 50, 20, 20))
+assert list(rects) == [pygame.Rect(50, 50, 20, 20)], list(rects)
+
+# Rects that overlap without being merged only count once towards coverage
+rects = _RectSet(screen, coverage=0.35)
+rects.add(pygame.Rect(0, 190, 640, 100))
+rects.add(pygame.Rect(270, 0, 100, 480))
+assert len(rects) == 2
+assert not rects.full
+rects.add(pygame.Rect(0, 0, 100, 100))
+assert rects.full
+
+# Collision tests go through the spatial hash, so rects spanning many cells
+# are found from any of them, and touching edges don't collide
+rects = _RectSet(screen, cell_size=16)
+rects.add(pygame.Rect(20, 20, 100, 50))
+rects.add(pygame.Rect(300, 300, 10, 10))
+assert len(rects._index) == 2
+assert rects.collides(pygame.Rect(110, 60, 4, 4))
+assert rects.collides(pygame.Rect(0, 0, 21, 21))
+assert not rects.collides(pygame.Rect(120, 20, 10, 10))
+assert not rects.collides(pygame.Rect(200, 200, 10, 10))
+
+# Rects added without merging are kept exactly, and never fill the bounds
+rects = _RectSet(pygame.Rect(0, 0, 100, 100))
+rects.add(pygame.Rect(0, 0, 10, 10))
+rects.add(pygame.Rect(5, 0, 10, 12), False)
+assert sorted(rects) == [pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 0, 10, 12)]
+assert not rects.collides(pygame.Rect(0, 10, 5, 2))
+rects.add(pygame.Rect(0, 0, 100, 90), False)
+assert not rects.full
+
+# A Scene redraws translucent static blits only where it cleared them, so a
+# static blit next to a redrawn one isn't drawn over itself
+import spyral
+spyral.director.init((100, 100), headless=True)
+scene = spyral.Scene((100, 100))
+scene.background = spyral.Image(size=(100, 100)).fill((0, 0, 255))
+scene.layers = ['bottom', 'middle', 'top']
+spyral.director.push(scene)
+
+def render():
+    scene._handle_event("director.render")
+    scene._draw()
+
+def sprite(size, pos, layer, color):
+    s = spyral.Sprite(scene)
+    s.image = spyral.Image(size=size).fill(color)
+    s.pos = pos
+    s.layer = layer
+    return s
+
+mover = sprite((10, 10), (0, 0), 'bottom', (0, 255, 0))
+wide = sprite((10, 12), (5, 0), 'middle', (255, 0, 0, 128))
+small = sprite((5, 2), (0, 10), 'top', (255, 0, 0, 128))
+for i in range(8):
+    render()
+color = scene._surface.get_at((1, 11))
+mover.pos = (50, 50)
+render()
+assert scene._surface.get_at((1, 11)) == color
@@ -0,0 +1,46 @@
+try:
+    import _path
+except NameError:
+    pass
+import pygame
+from spyral.spatialhash import _SpatialHash
+
+grid = _SpatialHash(32)
+grid.insert('a', pygame.Rect(0, 0, 10, 10))
+grid.insert('b', pygame.Rect(100, 100, 50, 50))
+grid.insert('c', pygame.Rect(10, 0, 10, 10))
+
+assert grid.query(pygame.Rect(5, 5, 2, 2)) == set(['a'])
+assert grid.query(pygame.Rect(0, 0, 200, 200)) == set(['a', 'b', 'c'])
+# Sharing an edge is not overlapping
+assert grid.query(pygame.Rect(150, 150, 10, 10)) == set()
+assert grid.collides(pygame.Rect(120, 120, 1, 1))
+assert not grid.collides(pygame.Rect(60, 60, 10, 10))
+
+# Moving and removing keys
+grid.insert('a', pygame.Rect(300, 300, 10, 10))
+assert grid.query(pygame.Rect(5, 5, 2, 2)) == set()
+assert grid.query(pygame.Rect(305, 305, 1, 1)) == set(['a'])
+grid.remove('a')
+grid.remove('a')
+assert 'a' not in grid
+assert len(grid) == 2
+assert grid.query(pygame.Rect(305, 305, 1, 1)) == set()
+
+# Negative coordinates land in their own cells
+grid.insert('d', pygame.Rect(-40, -40, 10, 10))
+assert grid.query(pygame.Rect(-35, -35, 1, 1)) == set(['d'])
+assert grid.query(pygame.Rect(-5, -5, 4, 4)) == set()
+
+# Segments only find the keys in the cells that they cross
+line = _SpatialHash(10)
+for i in range(10):
+    line.insert(('diagonal', i), pygame.Rect(i * 10, i * 10, 5, 5))
+    line.insert(('corner', i), pygame.Rect(90 - i * 10, i * 10, 5, 5))
+diagonal = set(('diagonal', i) for i in range(10))
+for found in [line.along(0, 0, 99, 99), line.along(99, 99, 0, 0)]:
+    assert diagonal <= found
+    assert ('corner', 0) not in found and ('corner', 9) not in found
+assert line.along(2, 2, 2, 2) == set([('diagonal', 0)])
+assert line.along(0, 95, 99, 95) == set([('diagonal', 9), ('corner', 9)])
+assert line.along(92, 0, 92, 99) == set([('diagonal', 9), ('corner', 0)])
@@ -0,0 +1,114 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (640, 480)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+image = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+wall_image = spyral.Image(size=(4, 100)).fill((0, 0, 255))
+
+def sprite(image, pos):
+    s = spyral.Sprite(scene)
+    s.image = image
+    s.pos = pos
+    return s
+
+def new_update():
+    scene._handle_event("director.pre_update")
+
+bullet = sprite(image, (0, 50))
+wall = sprite(wall_image, (100, 0))
+new_update()
+
+# A bullet that jumps over a thin wall misses it, unless it is swept
+bullet.x = 200
+assert not bullet.collide_sprite(wall)
+assert scene.collision_pairs([bullet], [wall]) == []
+assert scene.collision_pairs([bullet], [wall], swept=True) == [(bullet, wall)]
+assert abs(scene.sweep_sprites(bullet, wall) - 0.45) < 1e-9
+assert scene.sweep_sprites(wall, bullet) == scene.sweep_sprites(bullet, wall)
+
+# Only the move during the current update counts
+new_update()
+bullet.x = 300
+assert scene.sweep_sprites(bullet, wall) is None
+assert scene.collision_pairs([bullet], [wall], swept=True) == []
+
+# Sprites that both move, within one group
+new_update()
+left = sprite(image, (0, 300))
+right = sprite(image, (100, 300))
+new_update()
+left.x, right.x = 100, 0
+assert scene.sweep_sprites(left, right) is not None
+assert len(scene.collision_pairs([left, right], swept=True)) == 1
+new_update()
+left.y = 400
+assert scene.sweep_sprites(left, right) is None
+
+# Swept pairs are found through the collision indexes, however far apart
+# the sprites end up, and only by their boxes
+new_update()
+far = sprite(image, (0, 450))
+post = sprite(spyral.Image(size=(4, 20)).fill((0, 0, 0, 0)), (320, 440))
+post.collision = 'pixel'
+new_update()
+far.x = 630
+assert scene.collision_pairs([far], [post]) == []
+assert scene.collision_pairs([far], [post], swept=True) == [(far, post)]
+assert scene.collision_pairs([post], [far], swept=True) == [(post, far)]
+far.kill()
+post.kill()
+
+# Swept collision groups
+events = []
+scene.add_collision_group('bullets', 'walls', swept=True)
+spyral.event.register("collision.bullets.walls.enter",
+                      lambda first, second: events.append((first, second)),
+                      scene=scene)
+bullet.collision_group = 'bullets'
+wall.collision_group = 'walls'
+new_update()
+bullet.x = 0
+scene._handle_event("director.post_update")
+assert events == [(bullet, wall)]
+
+# Segments and rays find the boxes that they cross, nearest first
+targets = [sprite(image, (x, 200)) for x in (300, 50, 150)]
+hits = scene.segment_query((0, 205), (400, 205))
+assert [entity for entity, distance, point in hits] == [targets[1],
+                                                        targets[2],
+                                                        targets[0]]
+entity, distance, point = hits[0]
+assert distance == 50 and point == (50, 205)
+assert scene.segment_query((0, 205), (120, 205)) == [hits[0]]
+assert scene.segment_query((20, 55), (400, 55)) == [(wall, 80, (100, 55))]
+# Segments that only touch an edge don't hit
+assert scene.segment_query((0, 200), (400, 200)) == []
+hits = scene.raycast((400, 205), (-1, 0))
+assert hits[0][0] is targets[0] and hits[0][1] == 90
+assert len(scene.raycast((400, 205), (-1, 0), 255)) == 2
+assert scene.raycast((155, 205), (0, 1))[0][:2] == (targets[2], 0)
+
+# Rays hit the collision boxes of scaled and rotated sprites
+import math
+grown = sprite(image, (300, 300))
+grown.scale = 3
+hits = scene.raycast((400, 325), (-1, 0), 100)
+assert hits[0][0] is grown and hits[0][1] == 70
+stick = sprite(spyral.Image(size=(40, 4)).fill((0, 255, 0)), (300, 400))
+stick.angle = math.pi / 2
+hits = scene.raycast((320, 470), (0, -1), 100)
+assert hits[0][0] is stick and hits[0][1] == 48
+
+# Pixel-perfect sprites are hit where they have pixels
+ring = spyral.Image(size=(20, 20)).fill((0, 0, 0, 0))
+ring.draw_rect((255, 0, 0), (10, 0), (10, 20))
+half = sprite(ring, (500, 100))
+half.collision = 'pixel'
+hits = scene.raycast((480, 110), (1, 0), 100)
+assert hits[0][0] is half and abs(hits[0][1] - 30) <= 1
+assert scene.segment_query((505, 90), (505, 130)) == []
@@ -0,0 +1,106 @@
+try:
+    import _path
+except NameError:
+    pass
+import spyral
+
+resolution = (100, 100)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+scene.background = spyral.Image(size=resolution).fill((0, 0, 0))
+spyral.director.push(scene)
+red = spyral.Image(size=(10, 10)).fill((255, 0, 0))
+blue = spyral.Image(size=(10, 10)).fill((0, 0, 255))
+
+def render():
+    scene._handle_event("director.render")
+    scene._draw()
+
+# A 40x30 grid of 10x10 tiles, with a blue column at x = 5
+tiles = [[1 if column == 5 else 0 for column in range(40)]
+         for row in range(30)]
+tiles[0][0] = -1
+level = spyral.TileMap(scene, tiles, [red, blue], chunk_size=8)
+assert (level.columns, level.rows) == (40, 30)
+assert tuple(level.size) == (400, 300)
+render()
+assert scene._surface.get_at((5, 5))[:3] == (0, 0, 0)
+assert scene._surface.get_at((15, 5))[:3] == (255, 0, 0)
+assert scene._surface.get_at((55, 95))[:3] == (0, 0, 255)
+
+# Only the chunks that can be seen are drawn, as one static blit each
+assert level._shown_chunks == set((column, row) for column in range(2)
+                                                for row in range(2))
+assert len(scene._static_blits) == 4
+
+# Changing a tile only draws its chunk again
+level[1, 1] = 1
+first_chunk = level._chunks[(0, 0)]
+render()
+assert level._chunks[(0, 0)] is first_chunk
+assert scene._surface.get_at((15, 15))[:3] == (0, 0, 255)
+
+# Scrolling shows (and draws) other chunks
+level.pos = (-200, 0)
+render()
+assert (3, 0) in level._shown_chunks and (0, 0) not in level._shown_chunks
+assert len(scene._static_blits) == len(level._shown_chunks)
+assert scene._surface.get_at((5, 5))[:3] == (255, 0, 0)
+level.pos = (0, 0)
+render()
+assert scene._surface.get_at((55, 5))[:3] == (0, 0, 255)
+
+# Like sprites, chunks are culled against the scene and not the crop, which
+# only trims the area of each chunk
+level.crop = True
+level.crop_size = (50, 50)
+render()
+assert level._shown_chunks == set((column, row) for column in range(2)
+                                                for row in range(2))
+assert scene._surface.get_at((85, 5))[:3] == (255, 0, 0)
+level.scale = 0.5
+render()
+assert level._shown_chunks == set((column, row) for column in range(3)
+                                                for row in range(3))
+assert scene._surface.get_at((27, 90))[:3] == (0, 0, 255)
+level.scale = 1
+render()
+
+# Collision queries look at the grid
+assert level.tile_at((15, 25)) == (1, 2)
+assert level.tile_at((-5, 5)) is None
+assert not level.collide_point((5, 5))
+assert level.collide_point((15, 5))
+assert not level.collide_rect(spyral.Rect(-20, -20, 20, 20))
+assert level.collide_rect(spyral.Rect(-20, -20, 35, 25))
+level.solid = set([1])
+assert level.collide_point((55, 55))
+assert not level.collide_point((25, 5))
+assert level.tiles_in_rect(spyral.Rect(0, 0, 20, 20)) == [(1, 0), (0, 1),
+                                                          (1, 1)]
+sprite = spyral.Sprite(scene)
+sprite.image = spyral.Image(size=(4, 4))
+sprite.pos = (30, 30)
+assert not level.collide_sprite(sprite)
+sprite.pos = (48, 30)
+assert level.collide_sprite(sprite)
+
+# The map can be moved and scaled like any View
+level.crop = False
+level.pos = (10, 0)
+level.scale = 2
+assert level.tile_at((55, 5)) == (1, 0)
+assert level.collide_point((125, 5))
+
+# The map is a drawable of the scene, not a sprite, and its chunks are placed
+# again when the scene is rendered at a new scale
+assert level not in scene._sprites and level in scene._drawables
+scene._set_render_scale(0.5)
+render()
+assert scene._surface.get_at((7, 2))[:3] == (0, 0, 0)
+assert scene._surface.get_at((20, 2))[:3] == (255, 0, 0)
+scene._set_render_scale(1.0)
+
+level.kill()
+assert len(scene._static_blits) == 0
+assert level not in scene._drawables
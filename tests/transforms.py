@@ -0,0 +1,68 @@
+try:
+    import _path
+except NameError:
+    pass
+import math
+import spyral
+from spyral.memoize import _TransformCache
+
+resolution = (100, 100)
+spyral.director.init(resolution, headless=True)
+scene = spyral.Scene(resolution)
+image = spyral.Image(size=(10, 20)).fill((255, 0, 0))
+
+# Sprites in the same pose share one transformed surface
+first = spyral.Sprite(scene)
+second = spyral.Sprite(scene)
+for sprite in (first, second):
+    sprite.image = image
+    sprite.flip_x = True
+    sprite.scale = 2
+    sprite.angle = math.pi / 4
+assert first._transform_image is second._transform_image
+assert first._transform_offset == second._transform_offset
+
+# Angles are exact by default, so even sub-degree rotations are drawn
+second.angle = math.pi / 4 + 0.001
+assert first._transform_image is not second._transform_image
+tilted = spyral.Sprite(scene)
+tilted.image = image
+tilted.angle = math.radians(0.3)
+assert tilted._transform_image is not image._surf
+
+# With an angle step, nearly equal angles share a surface
+spyral.sprite.transform_cache.angle_step = 1
+second.angle = math.pi / 4 + 0.002
+assert first._transform_image is second._transform_image
+second.angle = math.pi / 2
+assert first._transform_image is not second._transform_image
+spyral.sprite.transform_cache.angle_step = 0
+
+# Changing the image gives new transforms
+image.fill((0, 255, 0))
+third = spyral.Sprite(scene)
+third.image = image
+third.flip_x = True
+third.scale = 2
+third.angle = math.pi / 4
+assert third._transform_image is not first._transform_image
+assert third._transform_image.get_at((20, 20))[:3] == (0, 255, 0)
+
+# Going back to an angle of 0 uses the image itself, with no offset
+third.angle = 0
+third.scale = 1
+third.flip_x = False
+assert third._transform_image is image._surf
+assert third._transform_offset == (0, 0)
+
+# The cache evicts the least recently used transforms to fit its budget
+cache = _TransformCache(max_bytes=3 * 10 * 20 * 4, angle_step=0)
+results = [cache.transform(image, True, False, (1.0, 1.0), 0),
+           cache.transform(image, False, True, (1.0, 1.0), 0),
+           cache.transform(image, True, True, (1.0, 1.0), 0)]
+assert len(cache) == 3 and cache.bytes == cache.max_bytes
+assert cache.transform(image, True, False, (1.0, 1.0), 0) is results[0]
+cache.transform(image, True, False, (1.0, 2.0), 0)
+assert len(cache) == 2
+assert cache.bytes == cache.max_bytes
+assert cache.transform(image, True, False, (1.0, 1.0), 0) is results[0]